@@ -0,0 +1,123 @@
+"""
+Cubo de contagens pré-agregado dos focos de calor
+
+Um único groupby sobre (data, hora, municipio, bioma) gera o cubo; mês e
+dia da semana são derivados da data no próprio cubo. Todos os gráficos
+leem deste cubo, então o custo deles depende do número de grupos e não
+do número de linhas do DataFrame original.
+"""
+import rankingDados
+from importacaoTardia import modulo_tardio
+
+pd = modulo_tardio('pandas')
+
+DIAS_ORDEM = ['Monday', 'Tuesday', 'Wednesday', 'Thursday',
+              'Friday', 'Saturday', 'Sunday']
+
+DIMENSOES = ['data', 'hora', 'municipio', 'bioma']
+
+
+class CuboAgregado:
+    def __init__(self, df):
+        """Agrega o DataFrame de focos em uma única passada"""
+        self.total = len(df)
+        self.data_min = df['data_pas'].min() if self.total else None
+        self.data_max = df['data_pas'].max() if self.total else None
+        # Ordem de aparição (mesma de df['bioma'].unique())
+        self.biomas = list(pd.unique(df['bioma']))
+
+        contagens = df.groupby(DIMENSOES, observed=True, sort=False).size()
+        contagens = contagens[contagens > 0].rename('focos').reset_index()
+
+        datas = pd.to_datetime(contagens['data'])
+        contagens['mes'] = datas.dt.month.astype('int8')
+        contagens['dia_semana'] = pd.Categorical(datas.dt.day_name(), categories=DIAS_ORDEM)
+        self.contagens = contagens
+
+        self._cache = {}
+
+    def adicionar(self, df_novo):
+        """
+        Aplica ao cubo o delta de um lote novo de focos
+        O custo depende do tamanho do lote e do número de grupos, não do total
+        """
+        if len(df_novo) == 0:
+            return self
+        delta = CuboAgregado(df_novo)
+
+        contagens = pd.concat([self.contagens, delta.contagens], ignore_index=True)
+        contagens = contagens.groupby(
+            DIMENSOES + ['mes', 'dia_semana'], observed=True, sort=False
+        )['focos'].sum().reset_index()
+        self.contagens = contagens[self.contagens.columns]
+
+        self.total += delta.total
+        self.data_min = delta.data_min if self.data_min is None else min(self.data_min, delta.data_min)
+        self.data_max = delta.data_max if self.data_max is None else max(self.data_max, delta.data_max)
+        self.biomas += [b for b in delta.biomas if b not in self.biomas]
+        self._cache = {}
+        return self
+
+    def __len__(self):
+        return len(self.contagens)
+
+    def _somar(self, chaves):
+        """Soma os focos por um subconjunto das dimensões (memoizado)"""
+        chaves = tuple(chaves) if isinstance(chaves, (list, tuple)) else (chaves,)
+        if chaves not in self._cache:
+            self._cache[chaves] = self.contagens.groupby(
+                list(chaves), observed=True
+            )['focos'].sum()
+        return self._cache[chaves]
+
+    def municipios_afetados(self):
+        return self.contagens['municipio'].nunique()
+
+    def por_data(self):
+        """Focos por dia (equivale a df.groupby('data').size())"""
+        return self._somar('data')
+
+    def por_hora(self):
+        return self._somar('hora')
+
+    def por_mes(self):
+        return self._somar('mes')
+
+    def por_dia_semana(self):
+        """Focos por dia da semana, na ordem de segunda a domingo"""
+        return self._somar('dia_semana').reindex(DIAS_ORDEM)
+
+    def por_municipio(self):
+        """Focos por município em ordem decrescente (equivale a value_counts())"""
+        return self._somar('municipio').sort_values(ascending=False)
+
+    def maiores(self, dimensao, k):
+        """
+        As k categorias de dimensao com mais focos, da maior para a menor,
+        sem ordenar todas (empates em ordem alfabética)
+        """
+        contagens = self._somar(dimensao).sort_index(key=lambda indice: indice.astype(str))
+        return rankingDados.maiores_contagens(contagens, k)
+
+    def por_bioma(self):
+        return self._somar('bioma').sort_values(ascending=False)
+
+    def hora_por_dia_semana(self):
+        """
+        Tabela hora x dia da semana (equivale ao crosstab), com as 24 horas
+        nas linhas mesmo sem focos: o heatmap rotula as linhas de 0 a 23
+        """
+        return self._somar(('hora', 'dia_semana')).unstack(fill_value=0).reindex(
+            index=range(24), columns=DIAS_ORDEM, fill_value=0
+        )
+
+    def por_data_bioma(self, bioma):
+        """Focos por dia de um bioma (apenas dias com focos)"""
+        serie = self._somar(('bioma', 'data'))
+        if bioma not in serie.index.get_level_values(0):
+            return pd.Series(dtype='int64')
+        return serie.xs(bioma, level='bioma')
+
+    def por_mes_bioma(self):
+        """Focos por (mês, bioma) com colunas mes, bioma, focos"""
+        return self._somar(('mes', 'bioma')).reset_index(name='focos')
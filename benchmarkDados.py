@@ -0,0 +1,503 @@
+"""
+Benchmark do pipeline de focos de calor
+
+Gera CSVs sintéticos no formato do focos_br_sc_ref_2024.csv (várias
+distribuições) e mede cada etapa do pipeline: leitura, ordenação, top-K,
+séries, eventos, figuras e dashboards em lote. Grava um JSON com tempo,
+vazão, pico de memória e curvas de escala, além da partida a frio da linha
+de comando do visualizador.
+
+O gerador escreve em blocos e serve para qualquer tamanho, mas cada caso
+carrega o arquivo inteiro: conte ~2 kB de memória por linha (10^6 linhas
+em ~2 GB; 10^8 linhas não cabem em uma máquina comum).
+"""
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DISTRIBUICOES = ('aleatoria', 'ordenada', 'invertida', 'quase_ordenada', 'duplicadas')
+
+TAMANHOS_PADRAO = (1_000, 10_000, 100_000)
+
+# Linhas geradas por vez ao escrever os datasets sintéticos
+LINHAS_POR_BLOCO_GERACAO = 1_000_000
+
+# Acima disso os construtores de figura não são medidos (a menos que pedido)
+MAX_LINHAS_FIGURAS = 100_000
+
+# Fração de posições trocadas na distribuição quase ordenada
+FRACAO_DESORDEM = 0.01
+
+CABECALHO = 'id_bdq,foco_id,lat,lon,data_pas,pais,estado,municipio,bioma\n'
+
+MUNICIPIOS = [
+    'LAGES', 'SÃO JOAQUIM', 'CAPÃO ALTO', 'ÁGUA DOCE', 'SÃO JOSÉ DO CERRITO',
+    'CAMPO BELO DO SUL', 'CAMPOS NOVOS', 'BOM JARDIM DA SERRA', 'SANTA CECÍLIA',
+    'LEBON RÉGIS', 'CURITIBANOS', 'CERRO NEGRO', 'OTACÍLIO COSTA', 'PAINEL',
+    'PAPANDUVA', 'FRAIBURGO', 'MAFRA', 'CORREIA PINTO', 'URUPEMA', 'ITAIÓPOLIS',
+    'CONCÓRDIA', 'SEARA', 'IBIRAMA', 'CHAPECÓ',
+]
+BIOMAS = ['Mata Atlântica', 'Pampa']
+
+CONSTRUTORES_FIGURAS = (
+    'criar_mapa_interativo',
+    'criar_mapa_densidade',
+    'criar_serie_temporal',
+    'criar_top_municipios',
+    'criar_analise_temporal_completa',
+    'criar_analise_bioma',
+    'criar_eventos_fogo',
+    'criar_dashboard_completo',
+)
+
+# Processos novos por cenário de partida a frio (vale a mediana)
+REPETICOES_PARTIDA = 5
+
+LINHAS_PARTIDA = 1_000
+
+# Roda o script como __main__ e informa, ao sair, quais módulos pesados foram importados
+_SCRIPT_PARTIDA = (
+    "import atexit, json, runpy, sys\n"
+    "sys.path.insert(0, {pasta!r})\n"
+    "import importacaoTardia\n"
+    "atexit.register(lambda: sys.stderr.write("
+    "'\\n@@' + json.dumps(importacaoTardia.pesados_importados()) + '\\n'))\n"
+    "sys.argv = sys.argv[1:]\n"
+    "runpy.run_path(sys.argv[0], run_name='__main__')\n"
+)
+
+INICIO_2024 = np.datetime64('2024-01-01T00:00:00', 's')
+SEGUNDOS_ANO = 366 * 24 * 3600
+PRIMEIRO_ID = 1_666_000_000
+
+
+def _posicoes_bloco(inicio, fim, total, distribuicao, rng):
+    """Posição global (0..total-1) na ordem de data_pas para cada linha do bloco"""
+    posicoes = np.arange(inicio, fim, dtype=np.int64)
+    if distribuicao == 'invertida':
+        return total - 1 - posicoes
+    if distribuicao == 'quase_ordenada':
+        trocas = max(1, int((fim - inicio) * FRACAO_DESORDEM))
+        a = rng.integers(0, fim - inicio, trocas)
+        b = rng.integers(0, fim - inicio, trocas)
+        posicoes[a], posicoes[b] = posicoes[b], posicoes[a].copy()
+        return posicoes
+    if distribuicao == 'aleatoria':
+        return rng.integers(0, total, fim - inicio)
+    return posicoes
+
+
+def _hexadecimal(valores):
+    """Dígitos hexadecimais (matriz n x 16 de bytes) de cada inteiro de 64 bits"""
+    octetos = np.frombuffer(valores.astype('>u8').tobytes(), dtype=np.uint8)
+    digitos = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+    return np.stack([digitos[octetos >> 4], digitos[octetos & 15]], axis=1).reshape(len(valores), 16)
+
+
+def _uuids(n, rng):
+    """UUIDs canônicos (matriz n x 36 de bytes) a partir de dois inteiros aleatórios por linha"""
+    uuids = rng.integers(0, 2 ** 63 - 1, (n, 2))
+    hexa = np.concatenate([_hexadecimal(uuids[:, 0]), _hexadecimal(uuids[:, 1])], axis=1)
+    matriz = np.full((n, 36), ord('-'), dtype=np.uint8)
+    for destino, origem, largura in ((0, 0, 8), (9, 8, 4), (14, 12, 4), (19, 16, 4), (24, 20, 12)):
+        matriz[:, destino:destino + largura] = hexa[:, origem:origem + largura]
+    return matriz
+
+
+def _coordenadas(valores):
+    """Coordenadas (|valor| < 1000) como o '%12.6f' do arquivo do INPE (matriz n x 12 de bytes)"""
+    micros = np.rint(np.abs(valores) * 1e6).astype(np.int64)
+    inteiros, fracoes = micros // 1_000_000, micros % 1_000_000
+    matriz = np.full((len(valores), 12), ord(' '), dtype=np.uint8)
+    for casa in range(6):
+        matriz[:, 11 - casa] = ord('0') + fracoes // 10 ** casa % 10
+    matriz[:, 5] = ord('.')
+    matriz[:, 4] = ord('0') + inteiros % 10
+    matriz[:, 3] = np.where(inteiros >= 10, ord('0') + inteiros // 10 % 10, ord(' '))
+    matriz[:, 2] = np.where(inteiros >= 100, ord('0') + inteiros // 100 % 10, ord(' '))
+    # Sinal logo antes do primeiro dígito
+    negativos = np.flatnonzero((valores < 0) & (micros > 0))
+    digitos = 1 + (inteiros[negativos] >= 10) + (inteiros[negativos] >= 100)
+    matriz[negativos, 4 - digitos] = ord('-')
+    return matriz
+
+
+def _formatar_bloco(inicio, fim, total, distribuicao, rng):
+    """Bytes de um bloco do CSV sintético, montados coluna a coluna"""
+    n = fim - inicio
+    posicoes = _posicoes_bloco(inicio, fim, total, distribuicao, rng)
+
+    if distribuicao == 'duplicadas':
+        # Poucos valores distintos em todas as colunas de ordenação
+        segundos = rng.integers(0, 16, n) * (SEGUNDOS_ANO // 16)
+        lat = np.round(rng.integers(0, 50, n) * 0.1 - 29.5, 6)
+        lon = np.round(rng.integers(0, 50, n) * 0.1 - 53.5, 6)
+        municipios = rng.integers(0, 3, n)
+        ids = PRIMEIRO_ID + rng.integers(0, 1000, n)
+    else:
+        segundos = posicoes * SEGUNDOS_ANO // max(total, 1)
+        lat = np.round(rng.uniform(-29.4, -25.9, n), 6)
+        lon = np.round(rng.uniform(-53.8, -48.3, n), 6)
+        municipios = rng.integers(0, len(MUNICIPIOS), n)
+        ids = PRIMEIRO_ID + posicoes
+
+    datas = np.datetime_as_string(INICIO_2024 + segundos.astype('timedelta64[s]')).astype('S19')
+    biomas = (rng.random(n) < 0.05).astype(np.int64)
+
+    # Do foco_id até a vírgula antes do município, todas as colunas têm largura fixa
+    def separador(texto):
+        return np.broadcast_to(np.frombuffer(texto, dtype=np.uint8), (n, len(texto)))
+
+    fixas = np.concatenate([
+        separador(b' ,'), _uuids(n, rng), separador(b','), _coordenadas(lat), separador(b' ,'),
+        _coordenadas(lon), separador(b' ,'), datas.view(np.uint8).reshape(n, 19),
+        separador(b',Brasil,SANTA CATARINA,'),
+    ], axis=1)
+    fixas[:, 2 + 36 + 1 + 12 + 2 + 12 + 2 + 10] = ord(' ')  # 'T' da data ISO
+    finais = np.array([f'{m},{b}\n'.encode('utf-8') for m in MUNICIPIOS for b in BIOMAS])
+
+    linhas = np.strings.add(b' ', ids.astype('S'))
+    linhas = np.strings.add(linhas, np.ascontiguousarray(fixas).view(f'S{fixas.shape[1]}').ravel())
+    linhas = np.strings.add(linhas, finais[municipios * len(BIOMAS) + biomas])
+    return b''.join(linhas.tolist())
+
+
+def gerar_dataset(caminho, linhas, distribuicao='aleatoria', semente=0):
+    """Grava um CSV sintético com o layout do arquivo do INPE, bloco a bloco"""
+    if distribuicao not in DISTRIBUICOES:
+        raise ValueError(f"Distribuição inválida: {distribuicao!r}")
+    rng = np.random.default_rng(semente)
+    with open(caminho, 'wb') as arquivo:
+        arquivo.write(CABECALHO.encode('utf-8'))
+        for inicio in range(0, linhas, LINHAS_POR_BLOCO_GERACAO):
+            fim = min(linhas, inicio + LINHAS_POR_BLOCO_GERACAO)
+            arquivo.write(_formatar_bloco(inicio, fim, linhas, distribuicao, rng))
+    return caminho
+
+
+def pico_rss_mb():
+    """Pico de memória residente do processo (MB), quando disponível"""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def medir(funcao, *args, preparar=None, **kwargs):
+    """
+    Executa funcao e retorna (resultado, segundos, pico de memória alocada em MB)
+    O tempo e o pico vêm de execuções separadas: o tracemalloc deixa cada
+    alocação mais lenta e distorceria o tempo
+    preparar: chamada antes de cada execução para repor o estado (ex.: caches)
+    """
+    if preparar is not None:
+        preparar()
+    inicio = time.perf_counter()
+    resultado = funcao(*args, **kwargs)
+    tempo = time.perf_counter() - inicio
+    del resultado
+
+    if preparar is not None:
+        preparar()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        resultado = funcao(*args, **kwargs)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return resultado, tempo, pico / (1024 * 1024)
+
+
+def _registro(etapa, linhas, distribuicao, tempo, pico, tamanho_arquivo, **extra):
+    registro = {
+        'etapa': etapa,
+        'linhas': linhas,
+        'distribuicao': distribuicao,
+        'tempo_s': tempo,
+        'linhas_por_s': linhas / tempo if tempo else None,
+        'mb_por_s': tamanho_arquivo / (1024 * 1024) / tempo if tempo else None,
+        'pico_memoria_mb': pico,
+    }
+    registro.update(extra)
+    return registro
+
+
+def executar_caso(caminho, linhas, distribuicao, medir_figuras=True):
+    """Mede leitura, ordenação por campo e construtores de figura de um dataset"""
+    import eventosDados
+    import leituraDados
+    import ordenacaoAdaptativa
+    import ordenacaoChaves
+    import ordenacaoDados
+    import publicacaoDados
+    import rankingDados
+    import registrosDados
+    import temporalDados
+
+    tamanho = os.path.getsize(caminho)
+    resultados = []
+
+    # Leitor antigo (pandas + strip), leitor pyarrow e a tabela compacta de registrosDados
+    motores = ['pandas'] + (['pyarrow'] if leituraDados.pyarrow_disponivel() else []) + ['registros']
+    for motor in motores:
+        df, tempo, pico = medir(leituraDados.carregar_csv, caminho, motor=motor)
+        resultados.append(_registro('leitura', linhas, distribuicao, tempo, pico,
+                                    tamanho, motor=motor))
+        del df
+
+    (_, df_ordenacao), tempo, pico = medir(ordenacaoDados.ler_csv, caminho)
+    resultados.append(_registro('leitura_ordenacao', linhas, distribuicao, tempo, pico, tamanho))
+
+    # Tabela compacta de registrosDados (a que ordenar_csv usa) e seu tamanho por linha
+    tabela, tempo, pico = medir(registrosDados.ler_registros, caminho)
+    memoria = tabela.memoria()
+    resultados.append(_registro('leitura_registros', linhas, distribuicao, tempo, pico, tamanho,
+                                bytes_por_linha=memoria['bytes_por_linha'],
+                                codificacoes=memoria['codificacoes']))
+    del tabela
+
+    for campo in ordenacaoDados.CampoOrdenacao:
+        _, tempo, pico = medir(ordenacaoDados.ordenar_indices, df_ordenacao, campo)
+        resultados.append(_registro('ordenacao', linhas, distribuicao, tempo, pico,
+                                    tamanho, campo=campo.coluna))
+        _, tempo, pico = medir(ordenacaoChaves.ordenar_indices_radix, df_ordenacao, campo)
+        resultados.append(_registro('ordenacao_radix', linhas, distribuicao, tempo, pico,
+                                    tamanho, campo=campo.coluna))
+
+    # Merge natural: tempo e contadores comparáveis aos do mergeSort.c
+    (_, estatisticas), tempo, pico = medir(ordenacaoAdaptativa.ordenar_indices_adaptativo,
+                                          df_ordenacao, 'data_pas')
+    resultados.append(_registro('ordenacao_adaptativa', linhas, distribuicao, tempo, pico,
+                                tamanho, campo='data_pas', **estatisticas.para_dict()))
+    del df_ordenacao
+
+    # Top-K lendo o CSV em blocos: os 10 focos mais recentes e os 15 municípios com mais focos
+    _, tempo, pico = medir(rankingDados.primeiros_csv, caminho, 'data_pas', 10, True)
+    resultados.append(_registro('top_k', linhas, distribuicao, tempo, pico,
+                                tamanho, campo='data_pas', k=10))
+    _, tempo, pico = medir(rankingDados.maiores_contagens_csv, caminho, 'municipio', 15)
+    resultados.append(_registro('top_k_contagem', linhas, distribuicao, tempo, pico,
+                                tamanho, campo='municipio', k=15))
+
+    if medir_figuras:
+        from visualizadorDados import VisualizadorFocosPlotly
+        vis = VisualizadorFocosPlotly(caminho, usar_cache=False)
+        # Séries em calendário contínuo: baldes, zeros e médias móveis de todos os biomas
+        serie, tempo, pico = medir(temporalDados.SerieTemporal.de_focos, vis.df)
+        _, tempo_quadro, _ = medir(serie.quadro, (7, 30))
+        resultados.append(_registro('serie_temporal', linhas, distribuicao, tempo + tempo_quadro, pico,
+                                    tamanho, baldes=len(serie), grupos=len(serie.grupos)))
+        # Eventos de fogo: grade + varredura no tempo, sem pares com todos os focos
+        eventos, tempo, pico = medir(eventosDados.EventosFogo.de_focos, vis.df)
+        resultados.append(_registro('eventos_fogo', linhas, distribuicao, tempo, pico,
+                                    tamanho, eventos=len(eventos)))
+        for nome in CONSTRUTORES_FIGURAS:
+            # As duas execuções partem do mesmo estado: sem figuras nem estruturas
+            # (cubo, série, índice...) guardadas, como na primeira chamada
+            _, tempo, pico = medir(getattr(vis, nome), preparar=vis.limpar_estruturas)
+            resultados.append(_registro('figura', linhas, distribuicao, tempo, pico,
+                                        tamanho, construtor=nome))
+        # Um dashboard por município a partir dos dados já carregados (no próprio processo)
+        pasta_lote = Path(caminho).with_suffix('.lote')
+        especificacoes = publicacaoDados.particionar(vis, 'municipio')
+        _, tempo, pico = medir(publicacaoDados.publicar, vis, especificacoes, str(pasta_lote),
+                               processos=1, forcar=True)
+        resultados.append(_registro('dashboards_lote', linhas, distribuicao, tempo, pico,
+                                    tamanho, dimensoes='municipio', dashboards=len(especificacoes)))
+        shutil.rmtree(pasta_lote, ignore_errors=True)
+
+    return resultados
+
+
+def _executar_partida(argumentos, pasta):
+    """Roda o visualizador em um processo novo; retorna (segundos, módulos pesados importados)"""
+    raiz = str(Path(__file__).resolve().parent)
+    comando = [sys.executable, '-c', _SCRIPT_PARTIDA.format(pasta=raiz),
+               os.path.join(raiz, 'visualizadorDados.py')] + argumentos
+    inicio = time.perf_counter()
+    processo = subprocess.run(comando, cwd=pasta, stdin=subprocess.DEVNULL,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    tempo = time.perf_counter() - inicio
+    marcas = [linha for linha in processo.stderr.splitlines() if linha.startswith('@@')]
+    return tempo, json.loads(marcas[-1][2:]) if marcas else None
+
+
+def medir_partida(pasta='benchmark_dados', repeticoes=REPETICOES_PARTIDA):
+    """
+    Tempo de partida a frio da linha de comando do visualizador; nenhum
+    destes cenários deveria importar pandas ou plotly
+    """
+    pasta = Path(pasta).resolve()
+    pasta.mkdir(parents=True, exist_ok=True)
+    caminho = pasta / 'focos_partida.csv'
+    saida = pasta / 'dashboard_partida'
+    gerar_dataset(caminho, LINHAS_PARTIDA)
+    # Gera o dashboard uma vez; as execuções medidas encontram-no em dia
+    _executar_partida([str(caminho), '-o', str(saida), '--sem-navegador', '--forcar'], pasta)
+
+    cenarios = {
+        'interpretador': None,
+        'ajuda': ['--help'],
+        'arquivo_inexistente': [str(pasta / 'nao_existe.csv')],
+        'dashboard_em_dia': [str(caminho), '-o', str(saida), '--sem-navegador'],
+    }
+    resultados = []
+    try:
+        for cenario, argumentos in cenarios.items():
+            tempos, pesados = [], None
+            for _ in range(repeticoes):
+                if argumentos is None:
+                    # Referência: só subir e encerrar o Python
+                    inicio = time.perf_counter()
+                    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+                    tempo = time.perf_counter() - inicio
+                else:
+                    tempo, pesados = _executar_partida(argumentos, pasta)
+                tempos.append(tempo)
+            resultados.append({
+                'etapa': 'partida',
+                'cenario': cenario,
+                'tempo_s': float(np.median(tempos)),
+                'tempos_s': tempos,
+                'modulos_pesados': pesados,
+            })
+    finally:
+        caminho.unlink()
+        shutil.rmtree(saida, ignore_errors=True)
+    return resultados
+
+
+def curvas_escala(resultados):
+    """
+    Agrupa os tempos por etapa e ajusta o expoente de escala
+    (inclinação em log-log: ~1 linear, ~1.1 n log n)
+    """
+    grupos = {}
+    for r in resultados:
+        detalhe = r.get('campo') or r.get('construtor') or r.get('motor') or ''
+        chave = (r['etapa'], detalhe, r['distribuicao'])
+        grupos.setdefault(chave, []).append((r['linhas'], r['tempo_s']))
+
+    curvas = []
+    for (etapa, detalhe, distribuicao), pontos in sorted(grupos.items()):
+        pontos.sort()
+        expoente = None
+        validos = [(n, t) for n, t in pontos if t > 0]
+        if len(validos) >= 2:
+            x = np.log([n for n, _ in validos])
+            y = np.log([t for _, t in validos])
+            expoente = float(np.polyfit(x, y, 1)[0])
+        curvas.append({
+            'etapa': etapa,
+            'detalhe': detalhe,
+            'distribuicao': distribuicao,
+            'pontos': [{'linhas': n, 'tempo_s': t} for n, t in pontos],
+            'expoente': expoente,
+        })
+    return curvas
+
+
+def executar_benchmark(tamanhos=TAMANHOS_PADRAO, distribuicoes=DISTRIBUICOES,
+                       pasta='benchmark_dados', max_linhas_figuras=MAX_LINHAS_FIGURAS,
+                       manter_arquivos=False, semente=0, repeticoes_partida=REPETICOES_PARTIDA):
+    """Executa todos os casos e retorna o relatório (dicionário serializável)"""
+    pasta = Path(pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+    resultados = []
+
+    partida = []
+    if repeticoes_partida:
+        print("⏱️  Partida a frio da linha de comando...")
+        partida = medir_partida(pasta, repeticoes_partida)
+
+    for linhas in tamanhos:
+        for distribuicao in distribuicoes:
+            caminho = pasta / f'focos_{distribuicao}_{linhas}.csv'
+            print(f"⏱️  {linhas} linhas, distribuição {distribuicao}...")
+            if not caminho.exists():
+                gerar_dataset(caminho, linhas, distribuicao, semente)
+            try:
+                resultados.extend(executar_caso(
+                    str(caminho), linhas, distribuicao,
+                    medir_figuras=linhas <= max_linhas_figuras
+                ))
+            finally:
+                if not manter_arquivos:
+                    caminho.unlink()
+
+    return {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'ambiente': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+            'numpy': np.__version__,
+        },
+        'pico_rss_mb': pico_rss_mb(),
+        'resultados': resultados,
+        'partida': partida,
+        'escalonamento': curvas_escala(resultados),
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark de leitura, ordenação e figuras dos focos de calor',
+        epilog='Exemplo: python benchmarkDados.py --tamanhos 1e3 1e5 1e6 -o benchmark.json'
+    )
+    parser.add_argument('--tamanhos', nargs='+', type=float, default=list(TAMANHOS_PADRAO),
+                        help='Número de linhas dos datasets (ex: 1e3 1e4 1e5); '
+                             'cada caso usa ~2 kB de memória por linha')
+    parser.add_argument('--distribuicoes', nargs='+', choices=DISTRIBUICOES,
+                        default=list(DISTRIBUICOES),
+                        help='Distribuições de data_pas a gerar')
+    parser.add_argument('--pasta', default='benchmark_dados',
+                        help='Pasta dos datasets sintéticos (padrão: benchmark_dados)')
+    parser.add_argument('--max-linhas-figuras', type=float, default=MAX_LINHAS_FIGURAS,
+                        help='Mede os construtores criar_* só até este tamanho')
+    parser.add_argument('--manter', action='store_true',
+                        help='Mantém os CSVs sintéticos gerados')
+    parser.add_argument('--repeticoes-partida', type=int, default=REPETICOES_PARTIDA,
+                        help=f'Processos por cenário de partida a frio; 0 desliga '
+                             f'(padrão: {REPETICOES_PARTIDA})')
+    parser.add_argument('--saida', '-o', default='benchmark.json',
+                        help='Arquivo JSON de saída (padrão: benchmark.json)')
+
+    args = parser.parse_args(argv)
+
+    relatorio = executar_benchmark(
+        tamanhos=[int(t) for t in args.tamanhos],
+        distribuicoes=args.distribuicoes,
+        pasta=args.pasta,
+        max_linhas_figuras=int(args.max_linhas_figuras),
+        manter_arquivos=args.manter,
+        repeticoes_partida=args.repeticoes_partida,
+    )
+
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    print(f"\n📊 {len(relatorio['resultados'])} medições salvas em: {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+# Versão do formato do cache; incrementar quando as colunas derivadas mudarem
+CACHE_VERSAO = 3
+
+# Pasta padrão do cache (criada ao lado do CSV de origem)
+PASTA_CACHE_PADRAO = '.cache_focos'
+
+TAMANHO_BLOCO_HASH = 1024 * 1024
+
+# Lotes guardados em partes separadas antes de o cache ser regravado inteiro
+MAX_PARTES_CACHE = 16
+
+# Coluna das partes com a linha final de cada registro do lote
+COLUNA_POSICAO = '_posicao'
+
+
+def parquet_disponivel():
+    """Verifica se o pyarrow está instalado para usar Parquet"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def calcular_hash(caminho):
+    """Calcula o hash do conteúdo do arquivo lendo em blocos"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(TAMANHO_BLOCO_HASH), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def assinatura_arquivo(caminho, com_hash=True):
+    """Retorna caminho, tamanho, mtime e (opcionalmente) hash do arquivo"""
+    caminho = Path(caminho).resolve()
+    info = caminho.stat()
+    assinatura = {
+        'caminho': str(caminho),
+        'tamanho': info.st_size,
+        'mtime_ns': info.st_mtime_ns,
+        'versao': CACHE_VERSAO,
+    }
+    if com_hash:
+        assinatura['hash'] = calcular_hash(caminho)
+    return assinatura
+
+
+def caminhos_cache(arquivo_csv, pasta_cache=None):
+    """
+    Retorna os caminhos (dados, metadados) do cache de um CSV
+    O nome é derivado do caminho absoluto do arquivo de origem
+    """
+    origem = Path(arquivo_csv).resolve()
+    pasta = Path(pasta_cache) if pasta_cache else origem.parent / PASTA_CACHE_PADRAO
+    chave = hashlib.blake2b(str(origem).encode('utf-8'), digest_size=8).hexdigest()
+    extensao = '.parquet' if parquet_disponivel() else '.pkl'
+    base = pasta / f"{origem.stem}_{chave}"
+    return base.with_suffix(extensao), base.with_suffix('.json')
+
+
+def carregar_cache(arquivo_csv, pasta_cache=None):
+    """
+    Carrega o DataFrame do cache se ele ainda for válido
+    Retorna None quando não há cache ou quando o CSV mudou
+    """
+    caminho_dados, caminho_meta = caminhos_cache(arquivo_csv, pasta_cache)
+    if not caminho_dados.exists() or not caminho_meta.exists():
+        return None
+
+    try:
+        with open(caminho_meta, 'r', encoding='utf-8') as arquivo:
+            meta = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+    atual = assinatura_arquivo(arquivo_csv, com_hash=False)
+    if (meta.get('versao') != CACHE_VERSAO or meta.get('caminho') != atual['caminho']
+            or meta.get('tamanho') != atual['tamanho']):
+        return None
+
+    # Mesmo tamanho mas mtime diferente: confirmar pelo conteúdo
+    # (depois de lotes anexados não há hash, e o cache é refeito)
+    if meta.get('mtime_ns') != atual['mtime_ns']:
+        if meta.get('hash') is None or meta.get('hash') != calcular_hash(arquivo_csv):
+            return None
+        meta['mtime_ns'] = atual['mtime_ns']
+        _escrever_meta(caminho_meta, meta)
+
+    try:
+        df = _ler_dados(caminho_dados)
+        if meta.get('partes'):
+            import leituraDados
+            for nome in meta['partes']:
+                lote = _ler_dados(caminho_dados.with_name(nome))
+                posicoes = lote.pop(COLUNA_POSICAO).to_numpy()
+                df = leituraDados.intercalar_blocos(df, lote, posicoes)
+    except Exception:
+        return None
+
+    return df
+
+
+def salvar_cache(arquivo_csv, df, pasta_cache=None):
+    """Grava o DataFrame já preparado e a assinatura do CSV de origem"""
+    caminho_dados, caminho_meta = caminhos_cache(arquivo_csv, pasta_cache)
+    caminho_dados.parent.mkdir(parents=True, exist_ok=True)
+
+    meta = assinatura_arquivo(arquivo_csv)
+
+    _remover_partes(caminho_dados, caminho_meta)
+    _gravar_dados(caminho_dados, df)
+    _escrever_meta(caminho_meta, meta)
+
+    return caminho_dados
+
+
+def anexar_cache(arquivo_csv, lote, versao_anterior, linhas_anteriores, posicoes=None,
+                 pasta_cache=None, df=None):
+    """
+    Acrescenta ao cache um lote já incorporado ao CSV, gravando só o lote:
+    os dados guardados não são regravados e o CSV não é relido para o hash
+    (a assinatura nova tem só tamanho e mtime)
+    versao_anterior: (caminho, tamanho, mtime_ns) do CSV que o cache guardava
+    posicoes: linha final de cada registro do lote (None: anexados ao fim)
+    df: DataFrame completo, regravado quando as partes passam de MAX_PARTES_CACHE
+    Retorna False (sem gravar nada) se o cache não era o da versão anterior
+    """
+    caminho_dados, caminho_meta = caminhos_cache(arquivo_csv, pasta_cache)
+    meta = _ler_meta(caminho_meta)
+    if (meta is None or not caminho_dados.exists() or meta.get('versao') != CACHE_VERSAO
+            or (meta.get('caminho'), meta.get('tamanho'), meta.get('mtime_ns')) != tuple(versao_anterior)):
+        return False
+
+    partes = list(meta.get('partes', []))
+    nova = assinatura_arquivo(arquivo_csv, com_hash=False)
+    nova['hash'] = None
+    if len(partes) >= MAX_PARTES_CACHE and df is not None:
+        _remover_partes(caminho_dados, caminho_meta)
+        _gravar_dados(caminho_dados, df)
+        partes = []
+    elif len(lote):
+        if posicoes is None:
+            posicoes = np.arange(linhas_anteriores, linhas_anteriores + len(lote))
+        nome = f"{caminho_dados.stem}.{len(partes) + 1}{caminho_dados.suffix}"
+        _gravar_dados(caminho_dados.with_name(nome),
+                      lote.assign(**{COLUNA_POSICAO: np.asarray(posicoes, dtype=np.int64)}))
+        partes.append(nome)
+    nova['partes'] = partes
+    _escrever_meta(caminho_meta, nova)
+    return True
+
+
+def limpar_cache(arquivo_csv, pasta_cache=None):
+    """Remove o cache de um CSV, se existir"""
+    caminho_dados, caminho_meta = caminhos_cache(arquivo_csv, pasta_cache)
+    _remover_partes(caminho_dados, caminho_meta)
+    for caminho in (caminho_dados, caminho_meta):
+        if caminho.exists():
+            caminho.unlink()
+
+
+def _ler_dados(caminho):
+    if caminho.suffix == '.parquet':
+        return pd.read_parquet(caminho)
+    return pd.read_pickle(caminho)
+
+
+def _gravar_dados(caminho, df):
+    # Escrever em arquivo temporário e renomear para não deixar cache parcial
+    temporario = caminho.with_name(caminho.name + '.tmp')
+    if caminho.suffix == '.parquet':
+        df.to_parquet(temporario, index=False)
+    else:
+        df.to_pickle(temporario)
+    os.replace(temporario, caminho)
+
+
+def _ler_meta(caminho_meta):
+    try:
+        with open(caminho_meta, 'r', encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _remover_partes(caminho_dados, caminho_meta):
+    """Apaga as partes de lotes listadas no metadado atual"""
+    meta = _ler_meta(caminho_meta) or {}
+    for nome in meta.get('partes', []):
+        parte = caminho_dados.with_name(nome)
+        if parte.exists():
+            parte.unlink()
+
+
+def _escrever_meta(caminho_meta, meta):
+    temporario = caminho_meta.with_name(caminho_meta.name + '.tmp')
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(meta, arquivo, indent=2)
+    os.replace(temporario, caminho_meta)
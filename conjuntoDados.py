@@ -0,0 +1,235 @@
+"""
+Conjunto de dados com vários arquivos (um por estado e ano)
+
+O INPE publica um CSV por estado e ano (focos_br_<uf>_ref_<ano>.csv). Um
+conjunto é descrito por um glob, um diretório, um manifesto (.txt com um
+caminho por linha ou .json com uma lista) ou uma lista de caminhos. Os
+arquivos fora dos estados/anos pedidos são descartados só pelo nome,
+sem abrir o arquivo, e os restantes são lidos em paralelo em um pool de
+processos. O resultado é um único DataFrame, com as mesmas colunas e
+tipos de leituraDados.carregar_csv.
+
+Nada aqui pergunta ao usuário: caminhos inválidos geram exceções, para
+que o carregamento possa rodar em jobs sem terminal.
+"""
+import glob
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import cacheDados
+import formatoBinario
+import leituraDados
+
+# focos_br_sc_ref_2024.csv -> uf='sc', ano=2024
+PADRAO_ARQUIVO = re.compile(r'focos_(?:[a-z]+_)?(?P<uf>[a-z]{2})_ref_(?P<ano>\d{4})', re.IGNORECASE)
+
+EXTENSOES = ('.csv', formatoBinario.EXTENSAO)
+
+EXTENSOES_MANIFESTO = ('.txt', '.json', '.lst')
+
+
+def particao(caminho):
+    """(uf, ano) extraídos do nome do arquivo, ou (None, None)"""
+    encontrado = PADRAO_ARQUIVO.search(Path(caminho).name)
+    if not encontrado:
+        return None, None
+    return encontrado.group('uf').lower(), int(encontrado.group('ano'))
+
+
+def eh_conjunto(fonte):
+    """Indica se a fonte descreve vários arquivos (e não um único CSV)"""
+    if isinstance(fonte, (list, tuple)):
+        return True
+    fonte = str(fonte)
+    if glob.has_magic(fonte):
+        return True
+    caminho = Path(fonte)
+    return caminho.is_dir() or (caminho.is_file() and caminho.suffix.lower() in EXTENSOES_MANIFESTO)
+
+
+def _ler_manifesto(caminho):
+    """Caminhos listados no manifesto, relativos à pasta do próprio manifesto"""
+    caminho = Path(caminho)
+    texto = caminho.read_text(encoding='utf-8')
+    if caminho.suffix.lower() == '.json':
+        conteudo = json.loads(texto)
+        entradas = conteudo.get('arquivos', []) if isinstance(conteudo, dict) else conteudo
+    else:
+        entradas = [linha.strip() for linha in texto.splitlines()
+                    if linha.strip() and not linha.lstrip().startswith('#')]
+    return [str(Path(e) if Path(e).is_absolute() else caminho.parent / e) for e in entradas]
+
+
+def resolver_arquivos(fonte):
+    """Lista ordenada (e sem repetições) dos arquivos descritos pela fonte"""
+    if isinstance(fonte, (list, tuple)):
+        arquivos = []
+        for item in fonte:
+            arquivos.extend(resolver_arquivos(item) if eh_conjunto(item) else [str(item)])
+    elif glob.has_magic(str(fonte)):
+        arquivos = glob.glob(str(fonte), recursive=True)
+    elif Path(fonte).is_dir():
+        arquivos = [str(p) for p in Path(fonte).iterdir()
+                    if p.is_file() and p.suffix.lower() in EXTENSOES]
+    elif Path(fonte).is_file() and Path(fonte).suffix.lower() in EXTENSOES_MANIFESTO:
+        arquivos = _ler_manifesto(fonte)
+    else:
+        arquivos = [str(fonte)]
+
+    vistos = {}
+    for arquivo in arquivos:
+        vistos.setdefault(str(Path(arquivo).resolve()), None)
+    return sorted(vistos)
+
+
+def _normalizar_ufs(ufs):
+    if ufs is None:
+        return None
+    if isinstance(ufs, str):
+        ufs = ufs.split(',')
+    return {uf.strip().lower() for uf in ufs if uf.strip()}
+
+
+def _normalizar_anos(anos):
+    if anos is None:
+        return None
+    if isinstance(anos, (str, int)):
+        anos = str(anos).split(',')
+    normalizados = set()
+    for ano in anos:
+        ano = str(ano).strip()
+        if '-' in ano:
+            # Intervalo inclusivo: 2020-2024
+            a, b = (int(p) for p in ano.split('-', 1))
+            normalizados.update(range(a, b + 1))
+        elif ano:
+            normalizados.add(int(ano))
+    return normalizados
+
+
+def _carregar_fragmento(caminho, linhas_por_bloco, usar_cache, pasta_cache):
+    """Lê um arquivo do conjunto (executado nos processos do pool)"""
+    if formatoBinario.eh_binario(caminho):
+        # Cópia para memória própria: o mmap não atravessa o processo
+        return formatoBinario.abrir_binario(caminho).copy()
+    if usar_cache:
+        df = cacheDados.carregar_cache(caminho, pasta_cache)
+        if df is not None:
+            return df
+    df = leituraDados.carregar_csv(caminho, linhas_por_bloco)
+    if usar_cache:
+        try:
+            cacheDados.salvar_cache(caminho, df, pasta_cache)
+        except (OSError, ValueError) as e:
+            # Sem cache a leitura continua valendo; só avisa
+            print(f"⚠️  Não foi possível salvar o cache de {caminho}: {e}")
+    return df
+
+
+class ConjuntoDados:
+    def __init__(self, fonte, ufs=None, anos=None):
+        """
+        fonte: glob, diretório, manifesto ou lista de caminhos
+        ufs/anos: poda por partição (ex.: ufs='sc,pr', anos='2023-2024')
+        Arquivos cujo nome não segue o padrão não podem ser podados e entram sempre
+        """
+        self.fonte = fonte
+        self.ufs = _normalizar_ufs(ufs)
+        self.anos = _normalizar_anos(anos)
+        self.arquivos = []
+        self.descartados = []
+        self.resolver()
+
+    def resolver(self):
+        """Relista os arquivos da fonte e aplica a poda por estado/ano"""
+        arquivos, descartados = [], []
+        for caminho in resolver_arquivos(self.fonte):
+            if not Path(caminho).is_file():
+                raise FileNotFoundError(f"Arquivo do conjunto não encontrado: {caminho}")
+            uf, ano = particao(caminho)
+            fora = ((self.ufs is not None and uf is not None and uf not in self.ufs)
+                    or (self.anos is not None and ano is not None and ano not in self.anos))
+            (descartados if fora else arquivos).append(caminho)
+        if not arquivos:
+            raise FileNotFoundError(f"Nenhum arquivo de focos encontrado em: {self.fonte}")
+        self.arquivos, self.descartados = arquivos, descartados
+        return self.arquivos
+
+    def __len__(self):
+        return len(self.arquivos)
+
+    def particoes(self):
+        """{caminho: (uf, ano)} dos arquivos selecionados"""
+        return {caminho: particao(caminho) for caminho in self.arquivos}
+
+    def versao(self):
+        """Impressão digital do conjunto: (caminho, tamanho, mtime) de cada arquivo"""
+        versao = []
+        for caminho in self.arquivos:
+            info = os.stat(caminho)
+            versao.append((caminho, info.st_size, info.st_mtime_ns))
+        return tuple(versao)
+
+    def carregar(self, processos=None, linhas_por_bloco=leituraDados.LINHAS_POR_BLOCO,
+                 usar_cache=True, pasta_cache=None):
+        """
+        Lê todos os arquivos e devolve um único DataFrame
+        processos: tamanho do pool (padrão: um por arquivo, até o número de CPUs)
+        """
+        if processos is None:
+            processos = min(len(self.arquivos), os.cpu_count() or 1)
+        argumentos = [(caminho, linhas_por_bloco, usar_cache, pasta_cache) for caminho in self.arquivos]
+
+        if processos <= 1 or len(self.arquivos) == 1:
+            blocos = [_carregar_fragmento(*args) for args in argumentos]
+        else:
+            # Importado aqui: multiprocessing pesa na partida de quem só resolve os arquivos
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=processos) as pool:
+                blocos = list(pool.map(_carregar_fragmento, *zip(*argumentos)))
+
+        # Categorias diferentes entre arquivos (municípios de cada estado) são unidas
+        return leituraDados.concatenar_blocos(blocos)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description='Lê um conjunto de arquivos de focos (glob, pasta ou manifesto)',
+        epilog="Exemplo: python conjuntoDados.py 'dados/focos_br_*_ref_*.csv' --ufs sc,pr --anos 2023-2024"
+    )
+    parser.add_argument('fonte', nargs='+', help='Glob, pasta, manifesto ou lista de arquivos')
+    parser.add_argument('--ufs', default=None, help='Estados a manter (ex.: sc,pr)')
+    parser.add_argument('--anos', default=None, help='Anos a manter (ex.: 2024 ou 2020-2024)')
+    parser.add_argument('--processos', '-p', type=int, default=None,
+                        help='Processos de leitura (padrão: um por arquivo, até o número de CPUs)')
+    parser.add_argument('--sem-cache', action='store_true', help='Ignora o cache em disco')
+
+    args = parser.parse_args(argv)
+    fonte = args.fonte[0] if len(args.fonte) == 1 else args.fonte
+
+    try:
+        conjunto = ConjuntoDados(fonte, args.ufs, args.anos)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    for caminho, (uf, ano) in conjunto.particoes().items():
+        print(f"   {uf or '?'} {ano or '?'}  {caminho}")
+    if conjunto.descartados:
+        print(f"{len(conjunto.descartados)} arquivo(s) descartado(s) pela partição")
+
+    inicio = time.perf_counter()
+    df = conjunto.carregar(args.processos, usar_cache=not args.sem_cache)
+    print(f"{len(df)} registros de {len(conjunto)} arquivo(s) em "
+          f"{time.perf_counter() - inicio:.3f} segundos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+"""
+Consultas indexadas (por data, município/bioma e grade de lat/lon) sobre o DataFrame de focos
+
+Expressões de filtro (texto, separado por ';'):
+    bioma=Mata Atlântica; mes=3; hora=12-18; bbox=-50,-28,-48,-26
+    inicio=2024-03-01; fim=2024-03-31; municipio=LAGES|CURITIBANOS
+    raio=-27.8,-50.3,25   (lat, lon, km)
+"""
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+# Tamanho da célula do índice espacial, em graus
+TAMANHO_CELULA = 0.1
+
+RAIO_TERRA_KM = 6371.0088
+
+# Colunas categóricas com índice invertido
+COLUNAS_INVERTIDAS = ('municipio', 'bioma')
+
+
+def _intervalo_inteiro(valor, nome, minimo, maximo):
+    """'3' -> (3, 3); '12-18' -> (12, 18); (12, 18) -> (12, 18)"""
+    if isinstance(valor, str):
+        partes = [p.strip() for p in valor.split('-')]
+        if len(partes) > 2 or not all(partes):
+            raise ValueError(f"Intervalo inválido para {nome}: {valor!r} (use N ou N-M)")
+        valor = partes
+    elif not isinstance(valor, (list, tuple)):
+        valor = (valor,)
+    try:
+        a, b = int(valor[0]), int(valor[-1])
+    except (TypeError, ValueError):
+        raise ValueError(f"Intervalo inválido para {nome}: {valor!r}") from None
+    if not (minimo <= a <= b <= maximo):
+        raise ValueError(f"{nome} deve estar entre {minimo} e {maximo}: {a}-{b}")
+    return a, b
+
+
+def _numeros(valor, nome, quantidade):
+    if isinstance(valor, str):
+        valor = valor.split(',')
+    try:
+        numeros = tuple(float(v) for v in valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"{nome} inválido: {valor!r}") from None
+    if len(numeros) != quantidade:
+        raise ValueError(f"{nome} precisa de {quantidade} números separados por vírgula")
+    return numeros
+
+
+def _data(valor):
+    if valor is None:
+        return None
+    try:
+        return pd.Timestamp(valor)
+    except ValueError:
+        raise ValueError(f"Data inválida: {valor!r}") from None
+
+
+def _textos(valor):
+    if isinstance(valor, str):
+        valor = valor.split('|')
+    return tuple(sorted({str(v).strip() for v in valor if str(v).strip()}))
+
+
+class Filtro:
+    """
+    Critérios de uma consulta (todos opcionais, combinados com E)
+    inicio/fim: datas inclusivas ('2024-03-31' inclui o dia inteiro)
+    bioma/municipio: um valor ou vários (lista ou separados por '|')
+    mes/hora: valor ou intervalo inclusivo ('12-18')
+    bbox: (lon_min, lat_min, lon_max, lat_max)
+    raio: (lat, lon, km)
+    """
+    CAMPOS = ('inicio', 'fim', 'bioma', 'municipio', 'mes', 'hora', 'bbox', 'raio')
+
+    def __init__(self, inicio=None, fim=None, bioma=None, municipio=None,
+                 mes=None, hora=None, bbox=None, raio=None):
+        self.inicio = _data(inicio)
+        self.fim = _data(fim)
+        # Fim exclusivo: com só a data, vai até o fim do dia
+        self.fim_exclusivo = self.fim
+        if self.fim is not None and isinstance(fim, str) and len(fim.strip()) <= 10:
+            self.fim_exclusivo = self.fim + pd.Timedelta(days=1)
+        elif self.fim is not None:
+            self.fim_exclusivo = self.fim + pd.Timedelta(1, 'ns')
+
+        self.bioma = None if bioma is None else _textos(bioma)
+        self.municipio = None if municipio is None else _textos(municipio)
+        self.mes = None if mes is None else _intervalo_inteiro(mes, 'mes', 1, 12)
+        self.hora = None if hora is None else _intervalo_inteiro(hora, 'hora', 0, 23)
+
+        self.bbox = None if bbox is None else _numeros(bbox, 'bbox', 4)
+        if self.bbox is not None and (self.bbox[0] > self.bbox[2] or self.bbox[1] > self.bbox[3]):
+            raise ValueError("bbox deve ser lon_min,lat_min,lon_max,lat_max")
+        self.raio = None if raio is None else _numeros(raio, 'raio', 3)
+
+    @classmethod
+    def de_parametros(cls, parametros):
+        """Cria o filtro a partir de um dicionário (ex.: query string); valores vazios são ignorados"""
+        desconhecidos = set(parametros) - set(cls.CAMPOS)
+        if desconhecidos:
+            raise ValueError(f"Critério inválido: {', '.join(sorted(desconhecidos))} "
+                             f"(use {', '.join(cls.CAMPOS)})")
+        return cls(**{nome: valor for nome, valor in parametros.items()
+                      if valor is not None and str(valor).strip() != ''})
+
+    @classmethod
+    def de_texto(cls, texto):
+        """Cria o filtro a partir de 'campo=valor; campo=valor'"""
+        parametros = {}
+        for parte in texto.split(';'):
+            if not parte.strip():
+                continue
+            nome, sep, valor = parte.partition('=')
+            if not sep:
+                raise ValueError(f"Critério sem '=': {parte.strip()!r}")
+            parametros[nome.strip()] = valor.strip()
+        return cls.de_parametros(parametros)
+
+    @classmethod
+    def criar(cls, filtro=None, **criterios):
+        """Aceita Filtro, texto, dicionário ou critérios nomeados"""
+        if isinstance(filtro, cls) and not criterios:
+            return filtro
+        if isinstance(filtro, str):
+            filtro = cls.de_texto(filtro)
+        elif isinstance(filtro, dict):
+            filtro = cls.de_parametros(filtro)
+        elif filtro is not None and not isinstance(filtro, cls):
+            raise TypeError(f"Filtro inválido: {filtro!r}")
+        if not criterios:
+            return filtro if filtro is not None else cls()
+        base = {} if filtro is None else filtro.parametros()
+        base.update(criterios)
+        return cls.de_parametros(base)
+
+    def parametros(self):
+        """Critérios definidos, no formato aceito por de_parametros"""
+        valores = {
+            'inicio': self.inicio,
+            # Último instante incluído (evita estender de novo até o fim do dia)
+            'fim': None if self.fim is None else self.fim_exclusivo - pd.Timedelta(1, 'ns'),
+            'bioma': self.bioma, 'municipio': self.municipio,
+            'mes': self.mes, 'hora': self.hora,
+            'bbox': self.bbox, 'raio': self.raio,
+        }
+        return {nome: valor for nome, valor in valores.items() if valor is not None}
+
+    def chave(self):
+        """Tupla hashable que identifica o filtro (usada em caches e ETags)"""
+        return (self.inicio, self.fim_exclusivo, self.bioma, self.municipio,
+                self.mes, self.hora, self.bbox, self.raio)
+
+    @property
+    def vazio(self):
+        return all(valor is None for valor in self.chave())
+
+    def __eq__(self, outro):
+        return isinstance(outro, Filtro) and self.chave() == outro.chave()
+
+    def __hash__(self):
+        return hash(self.chave())
+
+    def __repr__(self):
+        criterios = ', '.join(f'{nome}={valor!r}' for nome, valor in self.parametros().items())
+        return f'Filtro({criterios})'
+
+
+def caixa_do_raio(lat, lon, km):
+    """bbox (lon_min, lat_min, lon_max, lat_max) que contém o círculo"""
+    dlat = np.degrees(km / RAIO_TERRA_KM)
+    cos_lat = max(np.cos(np.radians(min(abs(lat) + dlat, 90.0))), 1e-12)
+    dlon = min(np.degrees(km / (RAIO_TERRA_KM * cos_lat)), 180.0)
+    return lon - dlon, lat - dlat, lon + dlon, lat + dlat
+
+
+def distancia_km(lat, lon, lat0, lon0):
+    """Distância haversine de cada ponto até (lat0, lon0)"""
+    lat, lon = np.radians(lat), np.radians(lon)
+    lat0, lon0 = np.radians(lat0), np.radians(lon0)
+    a = (np.sin((lat - lat0) / 2) ** 2
+         + np.cos(lat) * np.cos(lat0) * np.sin((lon - lon0) / 2) ** 2)
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class IndiceFocos:
+    def __init__(self, df, tamanho_celula=TAMANHO_CELULA):
+        """Monta os índices temporal, invertidos e espacial do DataFrame"""
+        self.total = len(df)
+
+        # Temporal: aproveita a ordem do arquivo quando já está por data_pas
+        datas = df['data_pas'].to_numpy().astype('datetime64[ns]', copy=False).view(np.int64)
+        self.datas = datas
+        if self.total == 0 or bool(np.all(datas[1:] >= datas[:-1])):
+            self.ordem_temporal = None
+            self.datas_ordenadas = datas
+        else:
+            self.ordem_temporal = np.argsort(datas, kind='stable')
+            self.datas_ordenadas = datas[self.ordem_temporal]
+
+        # Invertidos: posições agrupadas por código da categoria
+        self.categorias = {}
+        self.codigos = {}
+        self.postagens = {}
+        for coluna in COLUNAS_INVERTIDAS:
+            serie = df[coluna]
+            codigos = serie.cat.codes.to_numpy()
+            ordem = np.argsort(codigos, kind='stable')
+            contagens = np.bincount(codigos[codigos >= 0], minlength=len(serie.cat.categories))
+            inicios = np.concatenate(([0], np.cumsum(contagens)))
+            # Códigos -1 (valores nulos) ficam no começo da ordem
+            inicios += int(np.count_nonzero(codigos < 0))
+            self.categorias[coluna] = serie.cat.categories
+            self.codigos[coluna] = codigos
+            self.postagens[coluna] = (ordem, inicios)
+
+        # Espacial: linhas ordenadas pela célula (coluna x, linha y) da grade
+        self.tamanho_celula = tamanho_celula
+        self.lat = df['lat'].to_numpy()
+        self.lon = df['lon'].to_numpy()
+        self.linhas_grade = int(np.ceil(180.0 / tamanho_celula)) + 1
+        celulas = self._celula(self.lon, self.lat)
+        self.ordem_espacial = np.argsort(celulas, kind='stable')
+        self.celulas_ordenadas = celulas[self.ordem_espacial]
+
+        self.mes = df['mes'].to_numpy() if 'mes' in df else df['data_pas'].dt.month.to_numpy()
+        self.hora = df['hora'].to_numpy() if 'hora' in df else df['data_pas'].dt.hour.to_numpy()
+
+    def __len__(self):
+        return self.total
+
+    def _coluna_linha(self, lon, lat):
+        x = np.floor((np.asarray(lon, dtype=np.float64) + 180.0) / self.tamanho_celula).astype(np.int64)
+        y = np.floor((np.asarray(lat, dtype=np.float64) + 90.0) / self.tamanho_celula).astype(np.int64)
+        return x, np.clip(y, 0, self.linhas_grade - 1)
+
+    def _celula(self, lon, lat):
+        x, y = self._coluna_linha(lon, lat)
+        return x * self.linhas_grade + y
+
+    def intervalo_datas(self, inicio=None, fim_exclusivo=None):
+        """Posições com inicio <= data_pas < fim_exclusivo (busca binária)"""
+        a = 0 if inicio is None else int(np.searchsorted(self.datas_ordenadas, inicio.value, 'left'))
+        b = self.total if fim_exclusivo is None else int(
+            np.searchsorted(self.datas_ordenadas, fim_exclusivo.value, 'left'))
+        b = max(a, b)
+        if self.ordem_temporal is None:
+            return np.arange(a, b)
+        return np.sort(self.ordem_temporal[a:b])
+
+    def _codigos_validos(self, coluna, valores):
+        categorias = self.categorias[coluna]
+        return np.array([categorias.get_loc(v) for v in valores if v in categorias], dtype=np.int64)
+
+    def posicoes_categoria(self, coluna, valores):
+        """Posições das linhas cujo valor da coluna está em valores (índice invertido)"""
+        ordem, inicios = self.postagens[coluna]
+        partes = [ordem[inicios[c]:inicios[c + 1]] for c in self._codigos_validos(coluna, valores)]
+        if not partes:
+            return np.arange(0)
+        if len(partes) == 1:
+            return partes[0]
+        return np.sort(np.concatenate(partes))
+
+    def _tamanho_categoria(self, coluna, valores):
+        _, inicios = self.postagens[coluna]
+        return sum(int(inicios[c + 1] - inicios[c]) for c in self._codigos_validos(coluna, valores))
+
+    def posicoes_bbox(self, lon_min, lat_min, lon_max, lat_max):
+        """Candidatos das células que tocam o bbox (ainda sem o teste exato)"""
+        x0, y0 = self._coluna_linha(lon_min, lat_min)
+        x1, y1 = self._coluna_linha(lon_max, lat_max)
+        partes = []
+        for x in range(int(x0), int(x1) + 1):
+            # Em cada coluna da grade as células y0..y1 são contíguas na ordem
+            a = np.searchsorted(self.celulas_ordenadas, x * self.linhas_grade + int(y0), 'left')
+            b = np.searchsorted(self.celulas_ordenadas, x * self.linhas_grade + int(y1), 'right')
+            if b > a:
+                partes.append(self.ordem_espacial[a:b])
+        if not partes:
+            return np.arange(0)
+        return np.sort(np.concatenate(partes))
+
+    def selecionar(self, filtro):
+        """
+        Posições (em ordem crescente) das linhas que atendem ao filtro
+        Os candidatos vêm do índice mais seletivo; os demais critérios só são testados neles
+        """
+        filtro = Filtro.criar(filtro)
+        if filtro.vazio:
+            return np.arange(self.total)
+
+        # Candidatos do índice mais seletivo
+        opcoes = []
+        if filtro.inicio is not None or filtro.fim_exclusivo is not None:
+            a = 0 if filtro.inicio is None else np.searchsorted(self.datas_ordenadas, filtro.inicio.value)
+            b = self.total if filtro.fim_exclusivo is None else np.searchsorted(
+                self.datas_ordenadas, filtro.fim_exclusivo.value)
+            opcoes.append((max(0, int(b - a)), 'datas'))
+        for coluna in COLUNAS_INVERTIDAS:
+            valores = getattr(filtro, coluna)
+            if valores is not None:
+                opcoes.append((self._tamanho_categoria(coluna, valores), coluna))
+        caixa = filtro.bbox
+        if filtro.raio is not None:
+            caixa_raio = caixa_do_raio(*filtro.raio)
+            caixa = caixa_raio if caixa is None else (
+                max(caixa[0], caixa_raio[0]), max(caixa[1], caixa_raio[1]),
+                min(caixa[2], caixa_raio[2]), min(caixa[3], caixa_raio[3]))
+            if caixa[0] > caixa[2] or caixa[1] > caixa[3]:
+                return np.arange(0)
+
+        if opcoes:
+            _, melhor = min(opcoes)
+            if melhor == 'datas':
+                posicoes = self.intervalo_datas(filtro.inicio, filtro.fim_exclusivo)
+            else:
+                posicoes = self.posicoes_categoria(melhor, getattr(filtro, melhor))
+        else:
+            melhor = None
+            posicoes = np.arange(self.total)
+        if caixa is not None and (melhor is None or len(posicoes) > self.total // 4):
+            espaciais = self.posicoes_bbox(*caixa)
+            if len(espaciais) < len(posicoes):
+                posicoes, melhor = espaciais, 'espacial'
+
+        # Demais critérios verificados só nos candidatos
+        if melhor != 'datas':
+            if filtro.inicio is not None:
+                posicoes = posicoes[self.datas[posicoes] >= filtro.inicio.value]
+            if filtro.fim_exclusivo is not None:
+                posicoes = posicoes[self.datas[posicoes] < filtro.fim_exclusivo.value]
+        for coluna in COLUNAS_INVERTIDAS:
+            valores = getattr(filtro, coluna)
+            if valores is not None and melhor != coluna:
+                codigos = self._codigos_validos(coluna, valores)
+                posicoes = posicoes[np.isin(self.codigos[coluna][posicoes], codigos)]
+        if filtro.mes is not None:
+            mes = self.mes[posicoes]
+            posicoes = posicoes[(mes >= filtro.mes[0]) & (mes <= filtro.mes[1])]
+        if filtro.hora is not None:
+            hora = self.hora[posicoes]
+            posicoes = posicoes[(hora >= filtro.hora[0]) & (hora <= filtro.hora[1])]
+        if filtro.bbox is not None:
+            lon_min, lat_min, lon_max, lat_max = filtro.bbox
+            lat, lon = self.lat[posicoes], self.lon[posicoes]
+            posicoes = posicoes[(lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max)]
+        if filtro.raio is not None:
+            lat0, lon0, km = filtro.raio
+            posicoes = posicoes[distancia_km(self.lat[posicoes], self.lon[posicoes], lat0, lon0) <= km]
+        return posicoes
+
+    def contar(self, filtro):
+        return len(self.selecionar(filtro))
@@ -0,0 +1,123 @@
+"""
+Agregação espacial dos focos para os mapas (nível de detalhe)
+
+Os pontos são agrupados em células da grade Web Mercator (a mesma dos
+tiles do mapa) em vários níveis de zoom. O nível mais fino é calculado
+uma vez a partir dos pontos; cada nível mais grosso é obtido juntando
+as células do nível anterior (quadtree), sem voltar aos pontos.
+Abaixo do limite configurado os mapas continuam usando os pontos brutos.
+"""
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+# Acima deste número de pontos os mapas passam a usar células agregadas
+LIMITE_PONTOS_MAPA = 50_000
+
+# Níveis de zoom da pirâmide (do mais fino ao mais grosso)
+ZOOM_MAXIMO = 14
+ZOOM_MINIMO = 2
+
+# Tamanho da célula em pixels de tela no zoom correspondente
+PIXELS_CELULA = 8
+
+LATITUDE_MAXIMA_MERCATOR = 85.05112878
+
+
+def celulas_mercator(lat, lon, zoom, pixels_celula=PIXELS_CELULA):
+    """Coordenadas inteiras (x, y) da célula de cada ponto no zoom dado"""
+    escala = 256.0 * (2 ** zoom) / pixels_celula
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -LATITUDE_MAXIMA_MERCATOR, LATITUDE_MAXIMA_MERCATOR)
+    lon = np.asarray(lon, dtype=np.float64)
+    lat_rad = np.radians(lat)
+    x = np.floor((lon + 180.0) / 360.0 * escala).astype(np.int64)
+    y = np.floor((1.0 - np.log(np.tan(lat_rad) + 1.0 / np.cos(lat_rad)) / np.pi) / 2.0 * escala).astype(np.int64)
+    return x, y
+
+
+def _agrupar(x, y, grupo, focos, soma_lat, soma_lon):
+    """Junta entradas com a mesma (x, y, grupo) somando focos e coordenadas"""
+    if len(x) == 0:
+        return x, y, grupo, focos.astype(np.int64), soma_lat, soma_lon
+    # (x, y, grupo) empacotados em uma única chave int64
+    largura = int(y.max()) + 1
+    n_grupos = int(grupo.max()) + 1
+    chave = (x * largura + y) * n_grupos + grupo
+    unicos, inversos = np.unique(chave, return_inverse=True)
+    tamanho = len(unicos)
+    celula, g = np.divmod(unicos, n_grupos)
+    return (celula // largura, celula % largura, g,
+            np.bincount(inversos, weights=focos, minlength=tamanho).astype(np.int64),
+            np.bincount(inversos, weights=soma_lat, minlength=tamanho),
+            np.bincount(inversos, weights=soma_lon, minlength=tamanho))
+
+
+def piramide_espacial(lat, lon, grupos=None, zoom_maximo=ZOOM_MAXIMO, zoom_minimo=ZOOM_MINIMO,
+                      pixels_celula=PIXELS_CELULA):
+    """
+    Agrega os pontos em todos os níveis de zoom
+    grupos: códigos inteiros opcionais (ex.: bioma) mantidos separados em cada célula;
+    pontos sem lat/lon ou com grupo negativo são ignorados
+    Retorna {zoom: DataFrame(lat, lon, focos, grupo)} com o centróide de cada célula
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    grupos = np.zeros(len(lat), dtype=np.int64) if grupos is None else np.asarray(grupos, dtype=np.int64)
+    # Sem coordenada ou sem grupo (código -1 do factorize) o foco fica fora do mapa
+    validos = np.isfinite(lat) & np.isfinite(lon) & (grupos >= 0)
+    if not validos.all():
+        lat, lon, grupos = lat[validos], lon[validos], grupos[validos]
+
+    x, y = celulas_mercator(lat, lon, zoom_maximo, pixels_celula)
+    atual = _agrupar(x, y, grupos, np.ones(len(lat)), lat, lon)
+
+    niveis = {}
+    for zoom in range(zoom_maximo, zoom_minimo - 1, -1):
+        if zoom < zoom_maximo:
+            # Cada célula do nível acima é 2x2 células do nível atual
+            x, y, g, focos, soma_lat, soma_lon = atual
+            atual = _agrupar(x // 2, y // 2, g, focos, soma_lat, soma_lon)
+        _, _, g, focos, soma_lat, soma_lon = atual
+        niveis[zoom] = pd.DataFrame({
+            'lat': soma_lat / focos,
+            'lon': soma_lon / focos,
+            'focos': focos,
+            'grupo': g,
+        })
+    return niveis
+
+
+def reduzir_pontos(df, limite=LIMITE_PONTOS_MAPA, coluna_grupo=None,
+                   zoom_maximo=ZOOM_MAXIMO, zoom_minimo=ZOOM_MINIMO):
+    """
+    Escolhe o nível de zoom mais detalhado cujo número de células cabe no limite
+    Retorna (DataFrame agregado, zoom); com coluna_grupo, o valor do grupo
+    volta na coluna de mesmo nome
+    """
+    grupos, categorias = None, None
+    if coluna_grupo is not None:
+        grupos, categorias = pd.factorize(df[coluna_grupo])
+
+    niveis = piramide_espacial(df['lat'].to_numpy(), df['lon'].to_numpy(), grupos,
+                               zoom_maximo, zoom_minimo)
+
+    zoom = zoom_minimo
+    for z in range(zoom_maximo, zoom_minimo - 1, -1):
+        if len(niveis[z]) <= limite:
+            zoom = z
+            break
+
+    pontos = niveis[zoom]
+    if coluna_grupo is not None:
+        pontos[coluna_grupo] = np.asarray(categorias)[pontos['grupo'].to_numpy()]
+    return pontos.drop(columns='grupo'), zoom
+
+
+def tamanho_marcador(focos, minimo=4, maximo=30):
+    """Tamanho do marcador proporcional à raiz do número de focos da célula"""
+    focos = np.asarray(focos, dtype=np.float64)
+    if len(focos) == 0:
+        return focos
+    escala = np.sqrt(focos / focos.max())
+    return minimo + (maximo - minimo) * escala
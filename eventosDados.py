@@ -0,0 +1,292 @@
+"""
+Eventos de fogo: componentes conexas dos focos a até distancia_km e horas um do
+outro, por grade de células e varredura no tempo (sem comparar todos os pares)
+"""
+import math
+import sys
+
+import consultaDados
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+# Dois focos do mesmo evento: até 2 km e até 48 h (o satélite de referência passa uma vez por dia)
+DISTANCIA_PADRAO_KM = 2.0
+HORAS_PADRAO = 48
+
+# Pares candidatos avaliados por vez (limita a memória em áreas muito densas)
+PARES_POR_LOTE = 2_000_000
+
+# Folga das células: diagonal um pouco menor que distancia_km
+_FOLGA = 0.999
+
+_KM_POR_GRAU = math.pi * consultaDados.RAIO_TERRA_KM / 180.0
+
+
+def _unir(rotulo, a, b):
+    """
+    Junta os componentes das arestas (a, b)
+    rotulo: raiz de cada nó (o menor índice do componente), atualizado no lugar
+    """
+    while len(a):
+        raiz_a, raiz_b = rotulo[a], rotulo[b]
+        diferentes = raiz_a != raiz_b
+        if not diferentes.any():
+            break
+        a, b = a[diferentes], b[diferentes]
+        raiz_a, raiz_b = raiz_a[diferentes], raiz_b[diferentes]
+        # A raiz maior passa a apontar para a menor
+        np.minimum.at(rotulo, np.maximum(raiz_a, raiz_b), np.minimum(raiz_a, raiz_b))
+        while True:
+            proximo = rotulo[rotulo]
+            if np.array_equal(proximo, rotulo):
+                break
+            rotulo[:] = proximo
+
+
+def _lotes(quantidades, limite):
+    """Fatias [inicio, fim) consecutivas cuja soma de quantidades fica perto de limite"""
+    acumulado = np.cumsum(quantidades)
+    inicio = 0
+    while inicio < len(quantidades):
+        base = acumulado[inicio - 1] if inicio else 0
+        fim = max(int(np.searchsorted(acumulado, base + limite, 'right')), inicio + 1)
+        yield inicio, fim
+        inicio = fim
+
+
+def _grade(lat, lon, distancia_km):
+    """
+    Células (x, y) da grade e alcance da vizinhança em cada direção
+    As células têm diagonal menor que distancia_km em qualquer latitude dos dados
+    """
+    lado_km = distancia_km / np.sqrt(2.0) * _FOLGA
+    cos_max = np.cos(np.radians(min(float(np.abs(lat).min()), 89.0)))
+    cos_min = np.cos(np.radians(min(float(np.abs(lat).max()), 89.0)))
+    passo_lat = lado_km / _KM_POR_GRAU
+    passo_lon = lado_km / (_KM_POR_GRAU * cos_max)
+    x = np.floor(lon / passo_lon).astype(np.int64)
+    y = np.floor(lat / passo_lat).astype(np.int64)
+    # Focos a k colunas de distância estão a mais de (k - 1) larguras de célula
+    largura_min_km = passo_lon * _KM_POR_GRAU * cos_min
+    alcance_x = int(np.floor(distancia_km / largura_min_km)) + 1
+    alcance_y = int(np.floor(distancia_km / lado_km)) + 1
+    return x, y, alcance_x, alcance_y, largura_min_km, lado_km
+
+
+def rotular_eventos(lat, lon, datas, distancia_km=DISTANCIA_PADRAO_KM, horas=HORAS_PADRAO,
+                    pares_por_lote=PARES_POR_LOTE):
+    """
+    Evento de cada foco: 0, 1, ... na ordem do primeiro foco de cada evento
+    datas: datetime64 (ou segundos desde 1970)
+    Focos sem data ou sem coordenada ficam com -1
+    """
+    if not distancia_km > 0:
+        raise ValueError("A distância do evento deve ser positiva")
+    if horas < 0:
+        raise ValueError("A janela do evento não pode ser negativa")
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    datas = np.asarray(datas)
+    if datas.dtype.kind == 'M':
+        validas = ~np.isnat(datas)
+        segundos = datas.astype('datetime64[s]').view(np.int64)
+    else:
+        segundos = datas.astype(np.int64)
+        validas = np.ones(len(segundos), dtype=bool)
+    eventos = np.full(len(lat), -1, dtype=np.int64)
+    posicoes = np.flatnonzero(validas & np.isfinite(lat) & np.isfinite(lon))
+    n = len(posicoes)
+    if n == 0:
+        return eventos
+
+    # Ordem temporal: aproveita a ordem do arquivo quando já está por data_pas
+    tempo = segundos[posicoes]
+    if not bool(np.all(tempo[1:] >= tempo[:-1])):
+        ordem = np.argsort(tempo, kind='stable')
+        posicoes, tempo = posicoes[ordem], tempo[ordem]
+    lat, lon = lat[posicoes], lon[posicoes]
+
+    x, y, alcance_x, alcance_y, largura_min_km, lado_km = _grade(lat, lon, distancia_km)
+    # Margem de alcance_* em volta: as células vizinhas nunca dão a volta na numeração
+    x -= x.min() - alcance_x
+    y -= y.min() - alcance_y
+    altura = int(y.max()) + 1 + alcance_y
+    celula = x * altura + y
+    celulas, codigo = np.unique(celula, return_inverse=True)
+    # Chave (célula, posição no tempo): cada célula vira um trecho em ordem de tempo
+    chave = codigo.astype(np.int64) * n + np.arange(n)
+    ordem_celula = np.argsort(chave)
+    chave = chave[ordem_celula]
+    janela = int(round(horas * 3600))
+    # Até onde vai a janela de cada foco (posição exclusiva na ordem temporal)
+    limite = np.searchsorted(tempo, tempo + janela, 'right')
+
+    rotulo = np.arange(n)
+    # Mesma célula: basta ligar cada foco ao seguinte da célula
+    mesma = (codigo[ordem_celula[1:]] == codigo[ordem_celula[:-1]]) & (
+        tempo[ordem_celula[1:]] - tempo[ordem_celula[:-1]] <= janela)
+    _unir(rotulo, ordem_celula[:-1][mesma], ordem_celula[1:][mesma])
+
+    # Consultas na ordem das células: as buscas binárias recebem chaves crescentes
+    codigo = codigo[ordem_celula]
+    for dx in range(-alcance_x, alcance_x + 1):
+        for dy in range(-alcance_y, alcance_y + 1):
+            vao_x = max(abs(dx) - 1, 0) * largura_min_km
+            vao_y = max(abs(dy) - 1, 0) * lado_km
+            if (dx, dy) == (0, 0) or vao_x ** 2 + vao_y ** 2 > distancia_km ** 2:
+                continue
+            # Vizinha de cada célula ocupada (uma busca por célula, não por foco)
+            vizinha = celulas + dx * altura + dy
+            indice = np.minimum(np.searchsorted(celulas, vizinha), len(celulas) - 1)
+            ocupada = celulas[indice] == vizinha
+            if not ocupada.any():
+                continue
+            presentes = np.flatnonzero(ocupada[codigo])
+            origem = ordem_celula[presentes]
+            base = indice[codigo[presentes]].astype(np.int64) * n
+            # Só os focos seguintes (na ordem temporal) dentro da janela: cada par uma vez
+            inicio = np.searchsorted(chave, base + origem, 'right')
+            fim = np.searchsorted(chave, base + limite[origem], 'left')
+            quantidades = fim - inicio
+            com_pares = quantidades > 0
+            origem, inicio, quantidades = origem[com_pares], inicio[com_pares], quantidades[com_pares]
+            for a, b in _lotes(quantidades, pares_por_lote):
+                repeticoes = quantidades[a:b]
+                deslocamento = np.arange(int(repeticoes.sum())) - np.repeat(np.cumsum(repeticoes) - repeticoes,
+                                                                           repeticoes)
+                focos_a = np.repeat(origem[a:b], repeticoes)
+                focos_b = ordem_celula[np.repeat(inicio[a:b], repeticoes) + deslocamento]
+                novos = rotulo[focos_a] != rotulo[focos_b]
+                focos_a, focos_b = focos_a[novos], focos_b[novos]
+                perto = consultaDados.distancia_km(lat[focos_a], lon[focos_a],
+                                                   lat[focos_b], lon[focos_b]) <= distancia_km
+                _unir(rotulo, focos_a[perto], focos_b[perto])
+
+    # A raiz é o foco mais antigo do evento: numeração na ordem do primeiro foco
+    _, numeros = np.unique(rotulo, return_inverse=True)
+    eventos[posicoes] = numeros
+    return eventos
+
+
+class EventosFogo:
+    def __init__(self, eventos, lat, lon, datas, municipios=None, biomas=None,
+                 distancia_km=DISTANCIA_PADRAO_KM, horas=HORAS_PADRAO):
+        """
+        eventos: evento de cada foco (rotular_eventos)
+        municipios, biomas: opcionais, do primeiro foco de cada evento
+        """
+        self.distancia_km = distancia_km
+        self.horas = horas
+        self.rotulos = np.asarray(eventos)
+        focos = pd.DataFrame({
+            'evento': self.rotulos,
+            'lat': np.asarray(lat, dtype=np.float64),
+            'lon': np.asarray(lon, dtype=np.float64),
+            'data': pd.to_datetime(pd.Series(datas, copy=False)).to_numpy(),
+        })
+        for nome, valores in (('municipio', municipios), ('bioma', biomas)):
+            if valores is not None:
+                focos[nome] = np.asarray(valores)
+        focos = focos[focos['evento'] >= 0]
+
+        grupos = focos.groupby('evento', sort=True)
+        tabela = grupos.agg(
+            focos=('lat', 'size'),
+            inicio=('data', 'min'), fim=('data', 'max'),
+            lat_min=('lat', 'min'), lat_max=('lat', 'max'),
+            lon_min=('lon', 'min'), lon_max=('lon', 'max'),
+            lat=('lat', 'mean'), lon=('lon', 'mean'),
+        )
+        tabela['duracao_horas'] = (tabela['fim'] - tabela['inicio']).dt.total_seconds() / 3600
+        # Extensão: diagonal da caixa que contém os focos do evento
+        tabela['extensao_km'] = consultaDados.distancia_km(
+            tabela['lat_min'].to_numpy(), tabela['lon_min'].to_numpy(),
+            tabela['lat_max'].to_numpy(), tabela['lon_max'].to_numpy())
+        if 'municipio' in focos:
+            # O evento começa no seu foco mais antigo (primeira linha do grupo na ordem de data_pas)
+            primeiros = focos.sort_values('data', kind='stable').groupby('evento', sort=True).head(1)
+            primeiros = primeiros.set_index('evento')
+            for nome in ('municipio', 'bioma'):
+                if nome in primeiros:
+                    tabela[nome] = primeiros[nome].reindex(tabela.index)
+        self.tabela = tabela
+
+    @classmethod
+    def de_focos(cls, df, distancia_km=DISTANCIA_PADRAO_KM, horas=HORAS_PADRAO):
+        """Eventos de um DataFrame de focos (de preferência já em ordem de data_pas)"""
+        datas = pd.to_datetime(df['data_pas']).to_numpy()
+        eventos = rotular_eventos(df['lat'].to_numpy(), df['lon'].to_numpy(), datas, distancia_km, horas)
+        return cls(eventos, df['lat'].to_numpy(), df['lon'].to_numpy(), datas,
+                   df['municipio'].to_numpy() if 'municipio' in df else None,
+                   df['bioma'].to_numpy() if 'bioma' in df else None,
+                   distancia_km, horas)
+
+    def __len__(self):
+        return len(self.tabela)
+
+    def maiores(self, k):
+        """Os k eventos com mais focos (empates: o que começou antes)"""
+        import rankingDados
+        return self.tabela.loc[rankingDados.maiores_contagens(self.tabela['focos'], k).index]
+
+    def resumo(self):
+        """Número de eventos, focos isolados e o maior evento"""
+        focos = self.tabela['focos']
+        return {
+            'eventos': len(self),
+            'isolados': int((focos == 1).sum()),
+            'maior_evento_focos': int(focos.max()) if len(self) else 0,
+            'maior_duracao_horas': float(self.tabela['duracao_horas'].max()) if len(self) else 0.0,
+        }
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    import leituraDados
+
+    parser = argparse.ArgumentParser(
+        description='Agrupa os focos em eventos de fogo (perto no espaço e no tempo)',
+        epilog='Exemplo: python eventosDados.py output/dados_ordenados.csv --km 2 --horas 48 -o eventos.csv'
+    )
+    parser.add_argument('arquivo', help='CSV de focos (de preferência já ordenado por data_pas)')
+    parser.add_argument('--km', type=float, default=DISTANCIA_PADRAO_KM,
+                        help=f'Distância máxima entre focos do mesmo evento (padrão: {DISTANCIA_PADRAO_KM})')
+    parser.add_argument('--horas', type=float, default=HORAS_PADRAO,
+                        help=f'Intervalo máximo entre focos do mesmo evento (padrão: {HORAS_PADRAO})')
+    parser.add_argument('--saida', '-o', default=None, help='Grava a tabela de eventos em CSV')
+    parser.add_argument('--focos', default=None, help='Grava foco_id e evento de cada foco em CSV')
+
+    args = parser.parse_args(argv)
+
+    try:
+        df = leituraDados.carregar_csv(args.arquivo)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    inicio = time.perf_counter()
+    try:
+        eventos = EventosFogo.de_focos(df, args.km, args.horas)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    resumo = eventos.resumo()
+    print(f"🔥 {resumo['eventos']} eventos em {len(df)} focos ({resumo['isolados']} focos isolados) "
+          f"em {time.perf_counter() - inicio:.3f} segundos")
+    print(eventos.maiores(10)[['focos', 'inicio', 'duracao_horas', 'extensao_km']
+                               + [c for c in ('municipio',) if c in eventos.tabela]].to_string())
+    if args.saida:
+        eventos.tabela.to_csv(args.saida)
+        print(f"Eventos salvos em: {args.saida}")
+    if args.focos:
+        pd.DataFrame({'foco_id': df['foco_id'], 'evento': eventos.rotulos}).to_csv(args.focos, index=False)
+        print(f"Evento de cada foco salvo em: {args.focos}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
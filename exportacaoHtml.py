@@ -0,0 +1,192 @@
+"""
+Exportação compacta das figuras em HTML
+
+- a figura é serializada uma única vez
+- o plotly.js é gravado uma vez como arquivo compartilhado na pasta de saída
+- arrays numéricos grandes (lat, lon, contagens) vão como buffers binários
+  em base64 ({dtype, bdata}), formato aceito pelo plotly.js >= 2.28
+- opcionalmente grava versões pré-comprimidas (.gz / .br) e cria
+  index.html como link para o dashboard em vez de duplicar o arquivo
+"""
+import base64
+import gzip
+import os
+import shutil
+from pathlib import Path
+
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pio = modulo_tardio('plotly.io')
+plotly_offline = modulo_tardio('plotly.offline')
+
+# Arrays menores que isso continuam como JSON (não compensa o base64)
+TAMANHO_MINIMO_BINARIO = 64
+
+# Primeira versão do plotly.js que lê arrays {dtype, bdata}
+VERSAO_MINIMA_BINARIO = (2, 28)
+
+COMPRESSOES = ('gzip', 'brotli')
+
+# Tipos aceitos pelo plotly.js para arrays binários
+_TIPOS_BINARIOS = {
+    'int8': 'i1', 'uint8': 'u1',
+    'int16': 'i2', 'uint16': 'u2',
+    'int32': 'i4', 'uint32': 'u4',
+    'float32': 'f4', 'float64': 'f8',
+}
+
+
+def versao_plotlyjs():
+    return plotly_offline.get_plotlyjs_version()
+
+
+def suporta_binario():
+    """Verifica se o plotly.js embutido aceita arrays binários"""
+    partes = versao_plotlyjs().split('.')
+    return tuple(int(p) for p in partes[:2]) >= VERSAO_MINIMA_BINARIO
+
+
+def _codificar(valor):
+    """Converte um array numérico em {dtype, bdata}; outros valores voltam iguais"""
+    if isinstance(valor, (list, tuple)):
+        if len(valor) < TAMANHO_MINIMO_BINARIO or not all(
+                isinstance(v, (int, float)) and not isinstance(v, bool) for v in valor):
+            return valor
+        valor = np.asarray(valor)
+    if not isinstance(valor, np.ndarray) or valor.ndim != 1 or len(valor) < TAMANHO_MINIMO_BINARIO:
+        return valor
+    if valor.dtype.kind not in 'iuf':
+        return valor
+
+    if valor.dtype.kind in 'iu' and valor.dtype.itemsize == 8:
+        # int64 não existe no plotly.js: usa int32 se couber, senão float64
+        if valor.min() >= np.iinfo(np.int32).min and valor.max() <= np.iinfo(np.int32).max:
+            valor = valor.astype(np.int32)
+        else:
+            valor = valor.astype(np.float64)
+    elif valor.dtype.name not in _TIPOS_BINARIOS:
+        valor = valor.astype(np.float64)
+
+    dados = np.ascontiguousarray(valor, dtype=valor.dtype.newbyteorder('<'))
+    return {
+        'dtype': _TIPOS_BINARIOS[valor.dtype.name],
+        'bdata': base64.b64encode(dados.tobytes()).decode('ascii'),
+    }
+
+
+def _percorrer(objeto):
+    if isinstance(objeto, dict):
+        return {chave: _percorrer(valor) for chave, valor in objeto.items()}
+    if isinstance(objeto, (list, tuple)) and objeto and isinstance(objeto[0], dict):
+        return [_percorrer(item) for item in objeto]
+    return _codificar(objeto)
+
+
+def codificar_arrays(fig_dict):
+    """Troca os arrays numéricos dos traces por buffers binários em base64"""
+    fig_dict['data'] = [_percorrer(trace) for trace in fig_dict.get('data', [])]
+    return fig_dict
+
+
+def preparar_figura(fig, binario=True):
+    """Dicionário da figura pronto para serializar (arrays binários se suportado)"""
+    fig_dict = fig.to_plotly_json() if hasattr(fig, 'to_plotly_json') else dict(fig)
+    if binario and suporta_binario():
+        fig_dict = codificar_arrays(fig_dict)
+    return fig_dict
+
+
+def figura_json(fig, binario=True):
+    """Serializa a figura em JSON (formato aceito por Plotly.react)"""
+    return pio.to_json(preparar_figura(fig, binario), validate=False)
+
+
+def escrever_plotlyjs(pasta):
+    """Grava o plotly.js na pasta (uma vez por versão) e retorna o nome do arquivo"""
+    nome = f'plotly-{versao_plotlyjs()}.min.js'
+    caminho = Path(pasta) / nome
+    if not caminho.exists():
+        temporario = caminho.with_name(nome + '.tmp')
+        temporario.write_text(plotly_offline.get_plotlyjs(), encoding='utf-8')
+        os.replace(temporario, caminho)
+    return nome
+
+
+def comprimir(caminho, compressao):
+    """Grava ao lado do arquivo uma cópia comprimida (.gz ou .br)"""
+    dados = Path(caminho).read_bytes()
+    if compressao == 'gzip':
+        destino = Path(str(caminho) + '.gz')
+        destino.write_bytes(gzip.compress(dados, compresslevel=6, mtime=0))
+    elif compressao == 'brotli':
+        try:
+            import brotli
+        except ImportError:
+            raise ValueError("Compressão brotli requer o pacote 'brotli' (pip install brotli)") from None
+        destino = Path(str(caminho) + '.br')
+        destino.write_bytes(brotli.compress(dados))
+    else:
+        raise ValueError(f"Compressão inválida: {compressao!r} (use {', '.join(COMPRESSOES)})")
+    return destino
+
+
+def criar_alias(origem, alias):
+    """Cria alias -> origem como link simbólico (ou hard link / cópia no Windows)"""
+    origem, alias = Path(origem), Path(alias)
+    if alias.is_symlink() or alias.exists():
+        alias.unlink()
+    try:
+        os.symlink(os.path.relpath(origem, alias.parent), alias)
+        return 'symlink'
+    except (OSError, NotImplementedError):
+        pass
+    try:
+        os.link(origem, alias)
+        return 'hardlink'
+    except OSError:
+        shutil.copyfile(origem, alias)
+        return 'copia'
+
+
+def exportar_html(fig, caminho, aliases=(), compressao=None, binario=True,
+                  plotlyjs_compartilhado=True):
+    """
+    Serializa a figura uma vez e grava o HTML
+    aliases: caminhos extras (ex.: index.html) apontando para o mesmo arquivo
+    compressao: None, 'gzip' ou 'brotli'
+    Retorna um dicionário com os arquivos gerados e o tamanho do HTML
+    """
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+
+    fig_dict = preparar_figura(fig, binario)
+
+    arquivos = {'html': str(caminho)}
+    if plotlyjs_compartilhado:
+        nome_js = escrever_plotlyjs(caminho.parent)
+        incluir_js = nome_js
+        arquivos['plotlyjs'] = str(caminho.parent / nome_js)
+    else:
+        incluir_js = True
+
+    html = pio.to_html(fig_dict, validate=False, include_plotlyjs=incluir_js, full_html=True)
+    caminho.write_text(html, encoding='utf-8')
+
+    if compressao:
+        arquivos['comprimido'] = str(comprimir(caminho, compressao))
+        if plotlyjs_compartilhado:
+            js = Path(arquivos['plotlyjs'])
+            sufixo = '.gz' if compressao == 'gzip' else '.br'
+            if not Path(str(js) + sufixo).exists():
+                comprimir(js, compressao)
+
+    arquivos['aliases'] = {}
+    for alias in aliases:
+        arquivos['aliases'][str(alias)] = criar_alias(caminho, alias)
+        if compressao:
+            sufixo = '.gz' if compressao == 'gzip' else '.br'
+            criar_alias(str(caminho) + sufixo, str(alias) + sufixo)
+
+    arquivos['bytes_html'] = caminho.stat().st_size
+    return arquivos
@@ -0,0 +1,227 @@
+"""
+Formato binário colunar dos focos (.focos)
+
+Alternativa ao CSV de saída da ordenação: em vez de formatar cada linha
+como texto e reparseá-la no visualizador, as colunas são gravadas já
+tipadas e o arquivo é aberto com mmap, sem cópia.
+
+Layout (little-endian):
+
+    0   8 bytes   mágica b'FOCOSBN1'
+    8   uint32    tamanho H do descritor JSON
+    12  H bytes   descritor JSON (UTF-8), completado com espaços até
+                  que os dados comecem em um múltiplo de 64
+    ... blocos de colunas, cada um começando em um múltiplo de 64
+
+Descritor:
+
+    {"versao": 1, "linhas": N, "ordem": ["data_pas"], "decrescente": false,
+     "colunas": [
+        {"nome": "lat", "tipo": "<f4", "deslocamento": 128},
+        {"nome": "data_pas", "tipo": "<i8", "deslocamento": ..., "unidade": "datetime64[ns]"},
+        {"nome": "municipio", "tipo": "|i2", "deslocamento": ..., "dicionario": ["ABELARDO LUZ", ...]},
+        {"nome": "foco_id", "tipo": "|S36", "deslocamento": ...},
+        ...]}
+
+- "tipo" é a string de dtype do NumPy; o bloco tem N * itemsize bytes
+- colunas com "dicionario" guardam códigos inteiros (-1 = nulo) para a
+  lista de valores; viram pd.Categorical sem cópia
+- colunas com "unidade" são inteiros interpretados como datetime64
+- texto sem dicionário (foco_id) é gravado com largura fixa em UTF-8;
+  com "nulos", o texto vazio volta como NaN (o nulo do read_csv)
+
+Além das colunas do CSV o arquivo traz as derivadas do visualizador
+(mes, mes_nome, dia_semana, hora, data), então nada é recalculado ao abrir.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+
+import leituraDados
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+MAGICA = b'FOCOSBN1'
+VERSAO = 1
+ALINHAMENTO = 64
+EXTENSAO = '.focos'
+
+# Texto sem dicionário (um valor por linha): decodificá-lo seria a única
+# cópia na abertura e os gráficos não o usam
+COLUNAS_TEXTO = ('foco_id',)
+
+
+def _alinhar(posicao):
+    return -(-posicao // ALINHAMENTO) * ALINHAMENTO
+
+
+def eh_binario(caminho):
+    """Verifica pela mágica se o arquivo está no formato binário"""
+    try:
+        with open(caminho, 'rb') as arquivo:
+            return arquivo.read(len(MAGICA)) == MAGICA
+    except OSError:
+        return False
+
+
+def tipar(df):
+    """
+    Converte o DataFrame da ordenação (texto + lat/lon float64) para os
+    tipos do visualizador, com as colunas derivadas
+    """
+    tipos = {col: leituraDados.TIPOS_COLUNAS[col] for col in df.columns
+             if col in leituraDados.TIPOS_COLUNAS and col != 'data_pas'}
+    return leituraDados.preparar_bloco(df.astype(tipos))
+
+
+def _bloco_coluna(serie, indices):
+    """Retorna (array a gravar, campos extras do descritor)"""
+    extras = {}
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        valores = serie.cat.codes.to_numpy()
+        extras['dicionario'] = [str(c) for c in serie.cat.categories]
+    elif pd.api.types.is_datetime64_dtype(serie.dtype):
+        valores = serie.to_numpy().astype('datetime64[ns]', copy=False).view(np.int64)
+        extras['unidade'] = 'datetime64[ns]'
+    elif serie.dtype == object:
+        nulos = serie.isna()
+        # Nulo gravado como texto vazio (e não como 'None' ou 'nan')
+        texto = serie.where(~nulos, '').astype(str).str.encode('utf-8')
+        if nulos.any():
+            extras['nulos'] = True
+        largura = max(1, int(texto.str.len().max())) if len(texto) else 1
+        valores = texto.to_numpy().astype(f'S{largura}')
+    else:
+        valores = serie.to_numpy()
+    if indices is not None:
+        valores = valores[indices]
+    return np.ascontiguousarray(valores, dtype=valores.dtype.newbyteorder('<')), extras
+
+
+def escrever_binario(caminho, df, indices=None, ordem=None, decrescente=False):
+    """
+    Grava o DataFrame no formato binário (na ordem de indices, se dada)
+    ordem: nomes das colunas de ordenação, registrados no descritor
+    """
+    blocos = []
+    colunas = []
+    for nome in df.columns:
+        valores, extras = _bloco_coluna(df[nome], indices)
+        blocos.append(valores)
+        colunas.append(dict({'nome': nome, 'tipo': valores.dtype.str}, **extras))
+    linhas = len(df) if indices is None else len(indices)
+
+    # O tamanho do descritor depende dos deslocamentos: recalcula até estabilizar
+    deslocamentos = [0] * len(blocos)
+    while True:
+        for coluna, deslocamento in zip(colunas, deslocamentos):
+            coluna['deslocamento'] = deslocamento
+        descritor = json.dumps({
+            'versao': VERSAO, 'linhas': linhas,
+            'ordem': list(ordem or []),
+            'decrescente': decrescente if isinstance(decrescente, bool) else [bool(d) for d in decrescente],
+            'colunas': colunas,
+        }, ensure_ascii=False).encode('utf-8')
+        posicao = _alinhar(len(MAGICA) + 4 + len(descritor))
+        novos = []
+        for valores in blocos:
+            novos.append(posicao)
+            posicao = _alinhar(posicao + valores.nbytes)
+        if novos == deslocamentos:
+            break
+        deslocamentos = novos
+
+    inicio_dados = deslocamentos[0] if deslocamentos else _alinhar(len(MAGICA) + 4 + len(descritor))
+    descritor += b' ' * (inicio_dados - len(MAGICA) - 4 - len(descritor))
+
+    temporario = f'{caminho}.tmp'
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(MAGICA)
+        arquivo.write(struct.pack('<I', len(descritor)))
+        arquivo.write(descritor)
+        for valores, deslocamento in zip(blocos, deslocamentos):
+            arquivo.write(b'\0' * (deslocamento - arquivo.tell()))
+            valores.tofile(arquivo)
+    os.replace(temporario, caminho)
+    return {'linhas': linhas, 'bytes': os.path.getsize(caminho)}
+
+
+def ler_descritor(caminho):
+    with open(caminho, 'rb') as arquivo:
+        if arquivo.read(len(MAGICA)) != MAGICA:
+            raise ValueError(f"{caminho} não está no formato binário de focos")
+        tamanho, = struct.unpack('<I', arquivo.read(4))
+        descritor = json.loads(arquivo.read(tamanho).decode('utf-8'))
+    if descritor.get('versao') != VERSAO:
+        raise ValueError(f"Versão do formato não suportada: {descritor.get('versao')}")
+    return descritor
+
+
+def abrir_binario(caminho, colunas=None):
+    """
+    Abre o arquivo com mmap e devolve um DataFrame cujas colunas numéricas,
+    datas e códigos das categorias apontam para o próprio arquivo (somente
+    leitura). Texto sem dicionário é decodificado (única cópia)
+    colunas: subconjunto a carregar (padrão: todas)
+    """
+    descritor = ler_descritor(caminho)
+    linhas = descritor['linhas']
+    with open(caminho, 'rb') as arquivo:
+        # Arquivo vazio (sem linhas e sem colunas) não pode ser mapeado
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) if linhas else b''
+
+    dados = {}
+    for coluna in descritor['colunas']:
+        nome = coluna['nome']
+        if colunas is not None and nome not in colunas:
+            continue
+        valores = np.frombuffer(mapa, dtype=np.dtype(coluna['tipo']), count=linhas,
+                                offset=coluna['deslocamento'] if linhas else 0)
+        if 'dicionario' in coluna:
+            valores = pd.Categorical.from_codes(valores, categories=coluna['dicionario'],
+                                                validate=False)
+        elif 'unidade' in coluna:
+            valores = valores.view(coluna['unidade'])
+        elif valores.dtype.kind == 'S':
+            vazios = valores == b'' if coluna.get('nulos') else None
+            valores = np.char.decode(valores, 'utf-8').astype(object)
+            if vazios is not None:
+                valores[vazios] = np.nan
+        dados[nome] = valores
+    # copy=False: cada coluna vira um bloco próprio sobre o buffer do mmap
+    return pd.DataFrame(dados, copy=False)
+
+
+def converter_csv(entrada, saida, linhas_por_bloco=leituraDados.LINHAS_POR_BLOCO):
+    """Converte um CSV de focos (na ordem em que está) para o formato binário"""
+    df = leituraDados.carregar_csv(entrada, linhas_por_bloco)
+    return escrever_binario(saida, df)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description='Converte um CSV de focos para o formato binário colunar (.focos)',
+        epilog='Exemplo: python formatoBinario.py output/dados_ordenados.csv output/dados_ordenados.focos'
+    )
+    parser.add_argument('entrada', help='CSV de focos')
+    parser.add_argument('saida', nargs='?', help='Arquivo binário (padrão: entrada com extensão .focos)')
+
+    args = parser.parse_args(argv)
+    saida = args.saida or os.path.splitext(args.entrada)[0] + EXTENSAO
+
+    inicio = time.perf_counter()
+    resultado = converter_csv(args.entrada, saida)
+    print(f"{resultado['linhas']} registros gravados em {saida} "
+          f"({resultado['bytes'] / 1024:.0f} KB) em {time.perf_counter() - inicio:.3f} segundos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Importação tardia de módulos pesados (pandas, numpy, plotly)
+
+Importar pandas e plotly leva perto de um segundo. Os módulos do projeto
+os referenciam por meio de modulo_tardio, que só importa de verdade no
+primeiro acesso a um atributo: --help, a busca pelo arquivo e o caminho
+em que o dashboard já está em dia não pagam essas importações.
+"""
+import importlib
+import sys
+
+# Módulos cuja importação queremos evitar nos caminhos leves da linha de comando
+MODULOS_PESADOS = ('pandas', 'numpy', 'plotly', 'pyarrow')
+
+
+class ModuloTardio:
+    """Substituto do módulo que o importa no primeiro acesso a um atributo"""
+
+    def __init__(self, nome):
+        self.__dict__['_nome'] = nome
+        self.__dict__['_modulo'] = None
+
+    def _carregar(self):
+        modulo = self._modulo
+        if modulo is None:
+            modulo = importlib.import_module(self._nome)
+            self.__dict__['_modulo'] = modulo
+        return modulo
+
+    def __getattr__(self, atributo):
+        return getattr(self._carregar(), atributo)
+
+    def __setattr__(self, atributo, valor):
+        setattr(self._carregar(), atributo, valor)
+
+    def __dir__(self):
+        return dir(self._carregar())
+
+    def __repr__(self):
+        estado = 'carregado' if self._modulo is not None else 'não carregado'
+        return f"<módulo tardio {self._nome!r} ({estado})>"
+
+
+def modulo_tardio(nome):
+    """O próprio módulo se já foi importado; senão, um ModuloTardio"""
+    modulo = sys.modules.get(nome)
+    return modulo if modulo is not None else ModuloTardio(nome)
+
+
+def pesados_importados():
+    """Quais dos MODULOS_PESADOS já foram importados neste processo"""
+    return [nome for nome in MODULOS_PESADOS if nome in sys.modules]
@@ -0,0 +1,164 @@
+"""
+Modo incremental: anexa um lote diário de focos ao CSV já ordenado
+
+Só o lote novo é ordenado. Se todas as suas chaves vierem depois da
+última linha do arquivo (caso comum com data_pas), as linhas são apenas
+anexadas ao fim; caso contrário é feito um único merge linear com o
+arquivo existente. Empates ficam depois das linhas antigas, como se o
+lote tivesse sido anexado à entrada e tudo reordenado (ordenação estável).
+"""
+import heapq
+import os
+import sys
+import tempfile
+import time
+
+import ordenacaoDados
+import ordenacaoExterna
+
+# Bytes lidos do fim do arquivo para encontrar a última linha
+BYTES_FIM_ARQUIVO = 64 * 1024
+
+BUFFER_MERGE = 1024 * 1024
+
+
+def ultima_linha(caminho):
+    """Lê apenas o final do arquivo e devolve a última linha não vazia"""
+    with open(caminho, 'rb') as arquivo:
+        arquivo.seek(0, os.SEEK_END)
+        tamanho = arquivo.tell()
+        arquivo.seek(max(0, tamanho - BYTES_FIM_ARQUIVO))
+        fim = arquivo.read()
+    linhas = [l for l in fim.splitlines() if l.strip()]
+    if not linhas:
+        return None, fim.endswith(b'\n') or tamanho == 0
+    return linhas[-1].decode('utf-8', errors='surrogateescape') + '\n', fim.endswith(b'\n')
+
+
+def _preparar_ordem(campos, decrescente):
+    campos = ordenacaoDados.resolver_campos(campos)
+    if isinstance(decrescente, bool):
+        decrescente = [decrescente] * len(campos)
+    decrescente = list(decrescente)
+    mistas = len(set(decrescente)) > 1
+    inverter = decrescente[0] and not mistas
+    return campos, decrescente, inverter
+
+
+def anexar_lote_ordenado(arquivo_ordenado, arquivo_lote, campos=ordenacaoDados.CampoOrdenacao.DATA_PAS,
+                         decrescente=False, detalhar=False):
+    """
+    Ordena o lote e o incorpora ao arquivo ordenado existente
+    Retorna um dicionário com o modo usado ('anexado' ou 'intercalado')
+    detalhar: inclui 'linhas' (as linhas gravadas do lote, em ordem) e
+    'posicoes' (a linha de dados de cada uma no arquivo final; None quando
+    foram anexadas ao fim), para quem espelha o arquivo em memória
+    """
+    inicio = time.perf_counter()
+    campos, decrescente, inverter = _preparar_ordem(campos, decrescente)
+
+    _, lote = ordenacaoDados.ler_csv(arquivo_lote)
+    indices = ordenacaoDados.ordenar_indices(lote, campos, decrescente)
+    linhas_lote = ''.join(ordenacaoDados.formatar_linhas(lote, indices)).splitlines(keepends=True)
+
+    resultado = {'linhas_lote': len(linhas_lote), 'modo': 'anexado'}
+    if detalhar:
+        resultado['linhas'] = linhas_lote
+        resultado['posicoes'] = None
+    if not linhas_lote:
+        resultado['tempo_execucao'] = time.perf_counter() - inicio
+        return resultado
+
+    chave = ordenacaoExterna.criar_extrator_chave(campos, decrescente)
+    ultima, termina_com_quebra = ultima_linha(arquivo_ordenado)
+
+    # A última linha pode ser o cabeçalho (arquivo sem dados)
+    cabecalho = ordenacaoDados.ler_cabecalho(arquivo_ordenado)
+    sem_dados = ultima is None or ultima.strip() == cabecalho.strip()
+
+    if sem_dados:
+        cabe_no_fim = True
+    else:
+        a, b = chave(ultima), chave(linhas_lote[0])
+        cabe_no_fim = not (a < b) if inverter else not (b < a)
+
+    if cabe_no_fim:
+        with open(arquivo_ordenado, 'a', encoding='utf-8', errors='surrogateescape', newline='') as arquivo:
+            if not termina_com_quebra:
+                arquivo.write('\n')
+            arquivo.writelines(linhas_lote)
+    else:
+        resultado['modo'] = 'intercalado'
+        posicoes = _intercalar_com_arquivo(arquivo_ordenado, linhas_lote, chave, inverter)
+        if detalhar:
+            resultado['posicoes'] = posicoes
+
+    resultado['tempo_execucao'] = time.perf_counter() - inicio
+    return resultado
+
+
+def _intercalar_com_arquivo(arquivo_ordenado, linhas_lote, chave, inverter):
+    """
+    Merge linear do arquivo existente com as linhas do lote (grava e substitui)
+    Retorna a linha de dados em que cada linha do lote ficou
+    """
+    pasta = os.path.dirname(os.path.abspath(arquivo_ordenado))
+    posicoes = []
+    descritor, temporario = tempfile.mkstemp(prefix='.anexar_', suffix='.csv', dir=pasta)
+    try:
+        with open(arquivo_ordenado, 'r', encoding='utf-8', errors='surrogateescape',
+                  newline='', buffering=BUFFER_MERGE) as existente, \
+                os.fdopen(descritor, 'w', encoding='utf-8', errors='surrogateescape',
+                          newline='', buffering=BUFFER_MERGE) as saida:
+            saida.write(existente.readline())
+            linhas_existentes = ((l if l.endswith('\n') else l + '\n', False) for l in existente if l.strip())
+            # heapq.merge é estável: linhas antigas vêm antes do lote nos empates
+            intercaladas = heapq.merge(linhas_existentes, ((l, True) for l in linhas_lote),
+                                       key=lambda item: chave(item[0]), reverse=inverter)
+            saida.writelines(_anotar_posicoes(intercaladas, posicoes))
+        os.replace(temporario, arquivo_ordenado)
+        return posicoes
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def _anotar_posicoes(intercaladas, posicoes):
+    """Repassa as linhas do merge, guardando a posição das que vieram do lote"""
+    for posicao, (linha, do_lote) in enumerate(intercaladas):
+        if do_lote:
+            posicoes.append(posicao)
+        yield linha
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Anexa lotes novos de focos ao CSV já ordenado',
+        epilog='Exemplo: python incrementalDados.py focos_2024-12-31.csv --ordenado output/dados_ordenados.csv'
+    )
+    parser.add_argument('lotes', nargs='+', help='CSV(s) do lote novo, no layout do INPE')
+    parser.add_argument('--ordenado', default='dados_ordenados.csv',
+                        help='CSV ordenado existente (padrão: dados_ordenados.csv)')
+    parser.add_argument('--campo', '-c', action='append',
+                        help='Campo de ordenação usado no arquivo (padrão: data_pas)')
+    parser.add_argument('--decrescente', '-d', action='store_true',
+                        help='O arquivo está em ordem decrescente')
+
+    args = parser.parse_args(argv)
+
+    try:
+        campos = ordenacaoDados.resolver_campos(args.campo or ['data_pas'])
+    except ValueError as e:
+        parser.error(str(e))
+
+    for lote in args.lotes:
+        r = anexar_lote_ordenado(args.ordenado, lote, campos, args.decrescente)
+        print(f"{lote}: {r['linhas_lote']} linhas ({r['modo']}) em {r['tempo_execucao']:.6f} segundos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
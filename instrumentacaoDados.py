@@ -0,0 +1,270 @@
+"""
+Instrumentação do pipeline carregar -> agregar -> renderizar
+
+Cada etapa medida registra tempo de parede, tempo de CPU, memória
+(pico e saldo alocado, via tracemalloc), linhas processadas e bytes
+lidos ou gravados. Etapas podem ser aninhadas: o pico de uma etapa externa inclui
+o das internas. Opcionalmente cada etapa de nível mais alto roda sob
+cProfile (ou pyinstrument, se instalado) e grava o perfil em disco.
+
+Os registros saem em JSON ou no formato texto do Prometheus.
+"""
+import functools
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PERFIS = ('cprofile', 'pyinstrument')
+
+PREFIXO_METRICAS = 'focos'
+
+
+class Medida:
+    """Resultado de uma etapa; linhas e bytes podem ser preenchidos dentro do bloco"""
+
+    def __init__(self, etapa, rotulos, nivel):
+        self.etapa = etapa
+        self.rotulos = rotulos
+        self.nivel = nivel
+        self.linhas = None
+        self.bytes = None
+        self.tempo_s = None
+        self.cpu_s = None
+        self.pico_memoria_bytes = None
+        self.memoria_alocada_bytes = None
+        self.perfil = None
+        self.erro = None
+        self._memoria_inicio = 0
+        self._pico = 0
+
+    def para_dict(self):
+        registro = {
+            'etapa': self.etapa,
+            'nivel': self.nivel,
+            'tempo_s': self.tempo_s,
+            'cpu_s': self.cpu_s,
+            'pico_memoria_bytes': self.pico_memoria_bytes,
+            'memoria_alocada_bytes': self.memoria_alocada_bytes,
+            'linhas': self.linhas,
+            'bytes': self.bytes,
+        }
+        registro.update(self.rotulos)
+        if self.perfil:
+            registro['perfil'] = self.perfil
+        if self.erro:
+            registro['erro'] = self.erro
+        return registro
+
+
+class Instrumentacao:
+    def __init__(self, memoria=True, perfil=None, pasta_perfil='perfis'):
+        """
+        memoria: mede pico/saldo com tracemalloc (custo extra nas alocações)
+        perfil: None, 'cprofile' ou 'pyinstrument' (nas etapas de nível 0)
+        """
+        if perfil is not None and perfil not in PERFIS:
+            raise ValueError(f"Perfil inválido: {perfil!r} (use {', '.join(PERFIS)})")
+        self.memoria = memoria
+        self.perfil = perfil
+        self.pasta_perfil = pasta_perfil
+        self.registros = []
+        self._trava = threading.Lock()
+        self._local = threading.local()
+        self._iniciou_tracemalloc = False
+        self.inicio = datetime.now().isoformat(timespec='seconds')
+
+    def _pilha(self):
+        if not hasattr(self._local, 'pilha'):
+            self._local.pilha = []
+        return self._local.pilha
+
+    def _propagar_pico(self, pilha):
+        """Leva o pico atual do tracemalloc para as etapas abertas e zera o pico"""
+        _, pico = tracemalloc.get_traced_memory()
+        for aberta in pilha:
+            aberta._pico = max(aberta._pico, pico)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def etapa(self, nome, **rotulos):
+        """Mede o bloco; use 'as medida' para informar medida.linhas / medida.bytes"""
+        pilha = self._pilha()
+        medida = Medida(nome, rotulos, len(pilha))
+
+        if self.memoria:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._iniciou_tracemalloc = True
+            self._propagar_pico(pilha)
+            medida._memoria_inicio = tracemalloc.get_traced_memory()[0]
+            medida._pico = medida._memoria_inicio
+
+        perfilador = self._iniciar_perfil() if self.perfil and not pilha else None
+        pilha.append(medida)
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield medida
+        except BaseException as e:
+            medida.erro = f'{type(e).__name__}: {e}'
+            raise
+        finally:
+            medida.tempo_s = time.perf_counter() - inicio
+            medida.cpu_s = time.process_time() - inicio_cpu
+            pilha.pop()
+            if perfilador is not None:
+                medida.perfil = self._encerrar_perfil(perfilador, nome)
+            if self.memoria:
+                atual, _ = tracemalloc.get_traced_memory()
+                self._propagar_pico(pilha + [medida])
+                medida.pico_memoria_bytes = medida._pico - medida._memoria_inicio
+                medida.memoria_alocada_bytes = atual - medida._memoria_inicio
+            with self._trava:
+                self.registros.append(medida)
+
+    def _iniciar_perfil(self):
+        if self.perfil == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                raise ValueError("Perfil pyinstrument requer o pacote 'pyinstrument'") from None
+            perfilador = Profiler()
+            perfilador.start()
+        else:
+            import cProfile
+            perfilador = cProfile.Profile()
+            perfilador.enable()
+        return perfilador
+
+    def _encerrar_perfil(self, perfilador, nome):
+        pasta = Path(self.pasta_perfil)
+        pasta.mkdir(parents=True, exist_ok=True)
+        base = re.sub(r'[^\w.-]+', '_', nome)
+        numero = sum(1 for r in self.registros if r.etapa == nome)
+        if self.perfil == 'pyinstrument':
+            perfilador.stop()
+            caminho = pasta / f'{base}_{numero}.html'
+            caminho.write_text(perfilador.output_html(), encoding='utf-8')
+        else:
+            perfilador.disable()
+            caminho = pasta / f'{base}_{numero}.prof'
+            perfilador.dump_stats(str(caminho))
+        return str(caminho)
+
+    def encerrar(self):
+        """Para o tracemalloc se foi esta instância que o iniciou"""
+        if self._iniciou_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._iniciou_tracemalloc = False
+
+    def para_dict(self):
+        with self._trava:
+            registros = [m.para_dict() for m in self.registros]
+        return {'inicio': self.inicio, 'pid': os.getpid(), 'etapas': registros}
+
+    def para_json(self):
+        return json.dumps(self.para_dict(), indent=2, ensure_ascii=False)
+
+    def para_prometheus(self):
+        """Métricas agregadas por etapa (e rótulos) no formato texto do Prometheus"""
+        grupos = {}
+        with self._trava:
+            for m in self.registros:
+                chave = (m.etapa,) + tuple(sorted((k, str(v)) for k, v in m.rotulos.items()))
+                grupos.setdefault(chave, []).append(m)
+
+        metricas = [
+            ('execucoes_total', 'counter', 'Execuções da etapa', lambda ms: len(ms)),
+            ('tempo_segundos_total', 'counter', 'Tempo de parede acumulado',
+             lambda ms: sum(m.tempo_s for m in ms)),
+            ('cpu_segundos_total', 'counter', 'Tempo de CPU acumulado',
+             lambda ms: sum(m.cpu_s for m in ms)),
+            ('ultimo_tempo_segundos', 'gauge', 'Tempo de parede da última execução',
+             lambda ms: ms[-1].tempo_s),
+            ('pico_memoria_bytes', 'gauge', 'Maior pico de memória alocada na etapa',
+             lambda ms: _maximo(m.pico_memoria_bytes for m in ms)),
+            ('linhas_total', 'counter', 'Linhas processadas',
+             lambda ms: _soma(m.linhas for m in ms)),
+            ('bytes_total', 'counter', 'Bytes lidos ou gravados',
+             lambda ms: _soma(m.bytes for m in ms)),
+            ('erros_total', 'counter', 'Execuções que terminaram em erro',
+             lambda ms: sum(1 for m in ms if m.erro)),
+        ]
+        linhas = []
+        for sufixo, tipo, ajuda, calcular in metricas:
+            nome = f'{PREFIXO_METRICAS}_etapa_{sufixo}'
+            amostras = []
+            for chave, medidas in sorted(grupos.items()):
+                valor = calcular(medidas)
+                if valor is None:
+                    continue
+                rotulos = ','.join(f'{k}="{_escapar(v)}"' for k, v in (('etapa', chave[0]),) + chave[1:])
+                amostras.append(f'{nome}{{{rotulos}}} {valor:.9g}')
+            if amostras:
+                linhas.append(f'# HELP {nome} {ajuda}')
+                linhas.append(f'# TYPE {nome} {tipo}')
+                linhas.extend(amostras)
+        return '\n'.join(linhas) + '\n'
+
+    def salvar(self, caminho):
+        """Grava em Prometheus (.prom/.txt) ou JSON (demais extensões)"""
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        if caminho.suffix in ('.prom', '.txt'):
+            caminho.write_text(self.para_prometheus(), encoding='utf-8')
+        else:
+            caminho.write_text(self.para_json(), encoding='utf-8')
+        return str(caminho)
+
+    def resumo(self):
+        """Linhas de texto com o tempo das etapas de nível 0"""
+        with self._trava:
+            medidas = [m for m in self.registros if m.nivel == 0]
+        linhas = []
+        for m in medidas:
+            memoria = '' if m.pico_memoria_bytes is None else f', pico {m.pico_memoria_bytes / 2**20:.1f} MB'
+            linhas.append(f'   {m.etapa}: {m.tempo_s * 1000:.1f} ms (CPU {m.cpu_s * 1000:.1f} ms{memoria})')
+        return linhas
+
+
+def _soma(valores):
+    valores = [v for v in valores if v is not None]
+    return sum(valores) if valores else None
+
+
+def _maximo(valores):
+    valores = [v for v in valores if v is not None]
+    return max(valores) if valores else None
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def instrumentado(nome=None, medir=None):
+    """
+    Decorador para métodos de objetos com atributo instrumentacao
+    Sem instrumentação (None) o método roda sem custo extra
+    medir(self, resultado, *args, **kwargs) -> (linhas, bytes) preenche a
+    medida ao final; recebe os mesmos argumentos do método
+    """
+    def decorador(metodo):
+        etapa = nome or metodo.__name__
+
+        @functools.wraps(metodo)
+        def envoltorio(self, *args, **kwargs):
+            instrumentacao = getattr(self, 'instrumentacao', None)
+            if instrumentacao is None:
+                return metodo(self, *args, **kwargs)
+            with instrumentacao.etapa(etapa) as medida:
+                resultado = metodo(self, *args, **kwargs)
+                if medir is not None:
+                    medida.linhas, medida.bytes = medir(self, resultado, *args, **kwargs)
+            return resultado
+        return envoltorio
+    return decorador
@@ -0,0 +1,335 @@
+import calendar
+import io
+
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+# Colunas do CSV gerado pelo INPE / MergeSort
+COLUNAS = ['id_bdq', 'foco_id', 'lat', 'lon', 'data_pas',
+           'pais', 'estado', 'municipio', 'bioma']
+
+# Strings repetidas em todas as linhas: guardadas como categorias
+COLUNAS_CATEGORICAS = ['pais', 'estado', 'municipio', 'bioma']
+
+# Tipos explícitos usados na leitura (data_pas é convertida depois com formato fixo)
+TIPOS_COLUNAS = {
+    'id_bdq': 'int64',
+    'foco_id': 'object',
+    'lat': 'float32',
+    'lon': 'float32',
+    'data_pas': 'object',
+    'pais': 'category',
+    'estado': 'category',
+    'municipio': 'category',
+    'bioma': 'category',
+}
+
+FORMATO_DATA_PAS = '%Y-%m-%d %H:%M:%S'
+
+# Linhas por bloco: limita a memória de pico da leitura
+LINHAS_POR_BLOCO = 250_000
+
+# Motores de leitura: pyarrow converte os números com espaços e a data de
+# formato fixo durante a tokenização; pandas é o caminho sem dependências
+MOTORES_BLOCOS = ('auto', 'pyarrow', 'pandas')
+# 'registros' passa pela tabela compacta de registrosDados: menos memória de pico
+MOTORES = MOTORES_BLOCOS + ('registros',)
+
+# Tamanho médio de uma linha do CSV do INPE, para converter linhas em bytes
+BYTES_POR_LINHA = 160
+
+# Nomes iguais aos de strftime('%B') e day_name() no locale padrão
+NOMES_MESES = list(calendar.month_name)[1:]
+NOMES_DIAS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday',
+              'Friday', 'Saturday', 'Sunday']
+
+
+def ler_cabecalho(caminho):
+    """Lê o cabeçalho do CSV e remove espaços dos nomes das colunas"""
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        cabecalho = arquivo.readline()
+    return [nome.strip() for nome in cabecalho.rstrip('\r\n').split(',')]
+
+
+def limpar_categorias(serie):
+    """Remove espaços apenas das categorias, sem percorrer todas as linhas"""
+    categorias = serie.cat.categories
+    limpas = categorias.str.strip()
+    if limpas.equals(categorias):
+        return serie
+    if limpas.is_unique:
+        return serie.cat.rename_categories(limpas)
+    # Espaços diferentes geraram categorias duplicadas: recategorizar
+    return serie.astype(str).str.strip().astype('category')
+
+
+def adicionar_colunas_derivadas(df):
+    """Cria as colunas auxiliares (mes, mes_nome, dia_semana, hora, data)"""
+    datas = df['data_pas']
+    df['mes'] = datas.dt.month.astype('int8')
+    df['mes_nome'] = pd.Categorical.from_codes(
+        df['mes'].to_numpy() - 1, categories=NOMES_MESES
+    )
+    df['dia_semana'] = pd.Categorical.from_codes(
+        datas.dt.dayofweek.to_numpy(), categories=NOMES_DIAS
+    )
+    df['hora'] = datas.dt.hour.astype('int8')
+    df['data'] = datas.dt.normalize()
+    return df
+
+
+def preparar_bloco(bloco):
+    """Limpa, converte e deriva colunas de um único bloco"""
+    for col in bloco.columns:
+        if isinstance(bloco[col].dtype, pd.CategoricalDtype):
+            bloco[col] = limpar_categorias(bloco[col])
+        elif bloco[col].dtype == object:
+            bloco[col] = bloco[col].str.strip()
+
+    bloco['data_pas'] = pd.to_datetime(bloco['data_pas'], format=FORMATO_DATA_PAS)
+    return adicionar_colunas_derivadas(bloco)
+
+
+def ler_csv_em_blocos(caminho, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Lê o CSV em blocos de tamanho limitado com tipos explícitos
+    Cada bloco já sai limpo e com as colunas derivadas
+    """
+    nomes = ler_cabecalho(caminho)
+    tipos = {nome: TIPOS_COLUNAS[nome] for nome in nomes if nome in TIPOS_COLUNAS}
+
+    leitor = pd.read_csv(
+        caminho,
+        header=0,
+        names=nomes,
+        dtype=tipos,
+        skipinitialspace=True,
+        chunksize=linhas_por_bloco,
+        encoding='utf-8'
+    )
+    with leitor:
+        for bloco in leitor:
+            yield preparar_bloco(bloco)
+
+
+def carregar_csv_a_partir(caminho, deslocamento, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Lê apenas as linhas gravadas a partir de deslocamento (em bytes)
+    Usado para incorporar linhas anexadas ao fim do arquivo sem relê-lo
+    """
+    nomes = ler_cabecalho(caminho)
+    tipos = {nome: TIPOS_COLUNAS[nome] for nome in nomes if nome in TIPOS_COLUNAS}
+
+    with open(caminho, 'rb') as arquivo:
+        arquivo.seek(deslocamento)
+        if not arquivo.read(1):
+            return concatenar_blocos([])
+        arquivo.seek(deslocamento)
+        leitor = pd.read_csv(
+            arquivo,
+            header=None,
+            names=nomes,
+            dtype=tipos,
+            skipinitialspace=True,
+            chunksize=linhas_por_bloco,
+            encoding='utf-8'
+        )
+        with leitor:
+            return concatenar_blocos(preparar_bloco(bloco) for bloco in leitor)
+
+
+def carregar_linhas(caminho, linhas, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Lê linhas de dados já em memória com o cabeçalho de caminho
+    (ex.: as linhas de um lote que incrementalDados gravou no arquivo)
+    """
+    nomes = ler_cabecalho(caminho)
+    tipos = {nome: TIPOS_COLUNAS[nome] for nome in nomes if nome in TIPOS_COLUNAS}
+    if not linhas:
+        return concatenar_blocos([])
+    leitor = pd.read_csv(
+        io.StringIO(''.join(linhas)),
+        header=None,
+        names=nomes,
+        dtype=tipos,
+        skipinitialspace=True,
+        chunksize=linhas_por_bloco
+    )
+    with leitor:
+        return concatenar_blocos(preparar_bloco(bloco) for bloco in leitor)
+
+
+def pyarrow_disponivel():
+    """Verifica se o pyarrow está instalado para o leitor rápido"""
+    try:
+        import pyarrow.csv  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _tipos_arrow(nomes):
+    import pyarrow as pa
+
+    tipos = {
+        'id_bdq': pa.int64(),
+        'foco_id': pa.string(),
+        'lat': pa.float32(),
+        'lon': pa.float32(),
+        'data_pas': pa.timestamp('ns'),
+    }
+    for nome in COLUNAS_CATEGORICAS:
+        tipos[nome] = pa.dictionary(pa.int32(), pa.string())
+    return {nome: tipos[nome] for nome in nomes if nome in tipos}
+
+
+def _bloco_arrow(lote):
+    """Converte um RecordBatch em DataFrame com categorias ordenadas e sem espaços"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    colunas = []
+    for coluna in lote.columns:
+        # Texto solto (foco_id): espaços removidos ainda no Arrow
+        if pa.types.is_string(coluna.type):
+            coluna = pc.utf8_trim_whitespace(coluna)
+        colunas.append(coluna)
+    bloco = pa.RecordBatch.from_arrays(colunas, names=lote.schema.names).to_pandas()
+
+    for col in COLUNAS_CATEGORICAS:
+        if col in bloco.columns:
+            serie = limpar_categorias(bloco[col])
+            # Mesma ordem de categorias do read_csv (valores ordenados)
+            bloco[col] = serie.cat.reorder_categories(sorted(serie.cat.categories))
+    return adicionar_colunas_derivadas(bloco)
+
+
+def ler_csv_pyarrow_em_blocos(caminho, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """
+    Leitor rápido com pyarrow: números com espaços (' 1666547556 ',
+    '  -27.257810 ') são convertidos direto na tokenização, data_pas usa o
+    formato fixo e as colunas repetidas já saem codificadas em dicionário
+    """
+    import pyarrow.csv as csv
+
+    nomes = ler_cabecalho(caminho)
+    opcoes_leitura = csv.ReadOptions(
+        column_names=nomes, skip_rows=1,
+        block_size=max(1 << 20, linhas_por_bloco * BYTES_POR_LINHA)
+    )
+    opcoes_conversao = csv.ConvertOptions(
+        column_types=_tipos_arrow(nomes),
+        timestamp_parsers=[FORMATO_DATA_PAS],
+        strings_can_be_null=False
+    )
+    with csv.open_csv(caminho, read_options=opcoes_leitura,
+                      convert_options=opcoes_conversao) as leitor:
+        for lote in leitor:
+            if lote.num_rows:
+                yield _bloco_arrow(lote)
+
+
+def _juntar_categorias(partes, ordem=None):
+    """
+    Categorical único a partir de (códigos, categorias) de cada bloco
+    As categorias saem ordenadas (ou na ordem dada), as mesmas qualquer que
+    seja a divisão do arquivo em blocos
+    """
+    if ordem is not None:
+        categorias = pd.Index(ordem)
+    else:
+        categorias = partes[0][1]
+        for _, outras in partes[1:]:
+            if not outras.equals(categorias):
+                categorias = categorias.union(outras)
+        if not categorias.is_monotonic_increasing:
+            categorias = categorias.sort_values()
+
+    convertidos = []
+    for codigos, outras in partes:
+        if not outras.equals(categorias):
+            # O -1 (nulo) do fim da tabela continua -1
+            mapa = np.append(categorias.get_indexer(outras), -1).astype(np.int32)
+            codigos = mapa[codigos]
+        convertidos.append(codigos)
+    codigos = convertidos[0] if len(convertidos) == 1 else np.concatenate(convertidos)
+    return pd.Categorical.from_codes(codigos, dtype=pd.CategoricalDtype(categorias))
+
+
+def concatenar_blocos(blocos):
+    """
+    Junta os blocos mantendo as colunas categóricas
+    (pd.concat converteria categorias diferentes em object)
+    Cada bloco vira arrays por coluna assim que chega, e cada coluna é
+    concatenada e liberada antes da seguinte: o pico é o dos dados mais uma
+    coluna, e não o dobro
+    """
+    nomes = None
+    partes = {}
+    for bloco in blocos:
+        if nomes is None:
+            nomes = list(bloco.columns)
+            partes = {col: [] for col in nomes}
+        for col in nomes:
+            serie = bloco[col]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                partes[col].append((serie.cat.codes.to_numpy(), serie.cat.categories))
+            else:
+                partes[col].append(serie.to_numpy())
+        del bloco, serie
+    if nomes is None:
+        return pd.DataFrame(columns=COLUNAS)
+
+    ordens = {'mes_nome': NOMES_MESES, 'dia_semana': NOMES_DIAS}
+    colunas = {}
+    for col in nomes:
+        pedacos = partes.pop(col)
+        if isinstance(pedacos[0], tuple):
+            # mes_nome e dia_semana mantêm a ordem natural de meses e dias
+            colunas[col] = _juntar_categorias(pedacos, ordens.get(col))
+        else:
+            colunas[col] = pedacos[0] if len(pedacos) == 1 else np.concatenate(pedacos)
+        del pedacos
+    return pd.DataFrame(colunas, copy=False)
+
+
+def intercalar_blocos(df, lote, posicoes=None):
+    """
+    DataFrame com as linhas do lote nas posições finais indicadas (crescentes,
+    uma por linha do lote) e as de df, na ordem, nas demais
+    Sem posições, ou com elas todas no fim, o lote é só anexado
+    """
+    if posicoes is None or len(lote) == 0:
+        return concatenar_blocos([df, lote])
+    posicoes = np.asarray(posicoes, dtype=np.int64)
+    total = len(df) + len(lote)
+    if len(posicoes) != len(lote) or (len(posicoes) and (posicoes[0] < 0 or posicoes[-1] >= total)):
+        raise ValueError("Posições do lote não cabem no DataFrame intercalado")
+    juntos = concatenar_blocos([df, lote])
+    if posicoes[0] == len(df):
+        return juntos
+    do_lote = np.zeros(total, dtype=bool)
+    do_lote[posicoes] = True
+    ordem = np.empty(total, dtype=np.int64)
+    ordem[~do_lote] = np.arange(len(df))
+    ordem[do_lote] = np.arange(len(df), total)
+    return juntos.take(ordem).reset_index(drop=True)
+
+
+def carregar_csv(caminho, linhas_por_bloco=LINHAS_POR_BLOCO, motor='auto'):
+    """
+    Lê o CSV inteiro em blocos e devolve um único DataFrame tipado
+    motor: 'pyarrow', 'pandas', 'registros' ou 'auto' (pyarrow quando instalado)
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor inválido: {motor!r} (use {', '.join(MOTORES)})")
+    if motor == 'registros':
+        import registrosDados
+        return registrosDados.ler_registros(caminho, linhas_por_bloco).para_dataframe()
+    if motor == 'auto':
+        motor = 'pyarrow' if pyarrow_disponivel() else 'pandas'
+    if motor == 'pyarrow':
+        return concatenar_blocos(ler_csv_pyarrow_em_blocos(caminho, linhas_por_bloco))
+    return concatenar_blocos(ler_csv_em_blocos(caminho, linhas_por_bloco))
@@ -0,0 +1,309 @@
+"""
+Ordenação adaptativa (natural merge sort) de um índice de permutação, com os
+mesmos contadores do mergeSort.c; a permutação é a de ordenacaoDados.ordenar_indices
+"""
+import sys
+import time
+
+import ordenacaoDados
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+
+# Corridas naturais menores que o mínimo são estendidas com inserção binária
+CORTE_INSERCAO = 64
+
+
+class EstatisticasOrdenacao:
+    """
+    Mesmos contadores da struct de estatísticas do mergeSort.c: uma comparação é
+    uma chamada a comparar_registros, uma movimentação é a escrita de um elemento
+    """
+
+    def __init__(self):
+        self.comparacoes = 0
+        self.movimentacoes = 0
+        self.corridas = 0
+        self.intercalacoes = 0
+
+    def para_dict(self):
+        return {
+            'comparacoes': self.comparacoes,
+            'movimentacoes': self.movimentacoes,
+            'corridas': self.corridas,
+            'intercalacoes': self.intercalacoes,
+        }
+
+
+def tamanho_minimo_corrida(n, corte=CORTE_INSERCAO):
+    """minrun do TimSort: entre corte/2 e corte, com n/minrun perto de uma potência de 2"""
+    resto = 0
+    while n >= corte:
+        resto |= n & 1
+        n >>= 1
+    return n + resto
+
+
+def _insercao_binaria(chaves, indices, inicio, ordenados, fim):
+    """Insere indices[ordenados:fim] na parte já ordenada indices[inicio:ordenados]"""
+    comparacoes = movimentacoes = 0
+    for i in range(ordenados, fim):
+        item = indices[i]
+        chave = chaves[item]
+        esquerda, direita = inicio, i
+        while esquerda < direita:
+            meio = (esquerda + direita) // 2
+            comparacoes += 1
+            # Empate vai para a direita: mantém a ordem original (estável)
+            if chave < chaves[indices[meio]]:
+                direita = meio
+            else:
+                esquerda = meio + 1
+        if esquerda < i:
+            indices[esquerda + 1:i + 1] = indices[esquerda:i]
+            indices[esquerda] = item
+            movimentacoes += i - esquerda + 1
+    return comparacoes, movimentacoes
+
+
+def _intercalar(chaves, origem, destino, inicio, meio, fim):
+    """Intercala origem[inicio:meio] e origem[meio:fim] em destino[inicio:fim]"""
+    i, j, k = inicio, meio, inicio
+    chave_i, chave_j = chaves[origem[i]], chaves[origem[j]]
+    comparacoes = 0
+    while True:
+        comparacoes += 1
+        if chave_j < chave_i:
+            destino[k] = origem[j]
+            k += 1
+            j += 1
+            if j == fim:
+                destino[k:fim] = origem[i:meio]
+                break
+            chave_j = chaves[origem[j]]
+        else:
+            destino[k] = origem[i]
+            k += 1
+            i += 1
+            if i == meio:
+                destino[k:fim] = origem[j:fim]
+                break
+            chave_i = chaves[origem[i]]
+    return comparacoes, fim - inicio
+
+
+def _corridas(chaves, indices, minimo, estatisticas):
+    """Detecta (e completa até o mínimo) as corridas; retorna [(inicio, fim), ...]"""
+    n = len(chaves)
+    corridas = []
+    comparacoes = movimentacoes = 0
+    inicio = 0
+    while inicio < n:
+        # indices[inicio:] ainda é a identidade: as chaves são lidas direto
+        fim = inicio + 1
+        if fim < n:
+            comparacoes += 1
+            decrescente = chaves[fim] < chaves[inicio]
+            fim += 1
+            while fim < n:
+                comparacoes += 1
+                if (chaves[fim] < chaves[fim - 1]) != decrescente:
+                    break
+                fim += 1
+            if decrescente:
+                # Estritamente decrescente: inverter não troca a ordem de iguais
+                indices[inicio:fim] = indices[inicio:fim][::-1]
+                movimentacoes += (fim - inicio) // 2 * 2
+        estatisticas.corridas += 1
+
+        limite = min(n, inicio + minimo)
+        if fim < limite:
+            c, m = _insercao_binaria(chaves, indices, inicio, fim, limite)
+            comparacoes += c
+            movimentacoes += m
+            fim = limite
+        corridas.append((inicio, fim))
+        inicio = fim
+
+    estatisticas.comparacoes += comparacoes
+    estatisticas.movimentacoes += movimentacoes
+    return corridas
+
+
+def ordenar_chaves(chaves, corte=CORTE_INSERCAO):
+    """
+    Permutação estável que ordena a sequência chaves (valores comparáveis com <)
+    Retorna (indices, EstatisticasOrdenacao)
+    """
+    estatisticas = EstatisticasOrdenacao()
+    n = len(chaves)
+    indices = list(range(n))
+    if n < 2:
+        return indices, estatisticas
+
+    # Corridas já em ordem (as decrescentes invertidas), completadas até o minrun
+    corridas = _corridas(chaves, indices, tamanho_minimo_corrida(n, corte), estatisticas)
+
+    # Um único buffer auxiliar, reaproveitado em todas as passadas
+    origem, destino = indices, [0] * n
+    while len(corridas) > 1:
+        novas = []
+        for p in range(0, len(corridas) - 1, 2):
+            inicio, meio = corridas[p]
+            fim = corridas[p + 1][1]
+            estatisticas.comparacoes += 1
+            if chaves[origem[meio]] < chaves[origem[meio - 1]]:
+                c, m = _intercalar(chaves, origem, destino, inicio, meio, fim)
+                estatisticas.comparacoes += c
+                estatisticas.movimentacoes += m
+                estatisticas.intercalacoes += 1
+            else:
+                # Par já em ordem: só passa para o outro buffer
+                destino[inicio:fim] = origem[inicio:fim]
+                estatisticas.movimentacoes += fim - inicio
+            novas.append((inicio, fim))
+        if len(corridas) % 2:
+            inicio, fim = corridas[-1]
+            destino[inicio:fim] = origem[inicio:fim]
+            estatisticas.movimentacoes += fim - inicio
+            novas.append((inicio, fim))
+        origem, destino = destino, origem
+        corridas = novas
+
+    return origem, estatisticas
+
+
+def contar_mergesort_c(chaves):
+    """
+    Reproduz o mergeSort.c (divisão até um elemento, L e R copiados a cada
+    merge) sobre os índices, só para obter os contadores equivalentes
+    Retorna (indices, EstatisticasOrdenacao)
+    """
+    estatisticas = EstatisticasOrdenacao()
+    indices = list(range(len(chaves)))
+
+    def merge(esquerda, meio, direita):
+        L = indices[esquerda:meio + 1]
+        R = indices[meio + 1:direita + 1]
+        estatisticas.movimentacoes += len(L) + len(R)
+        i = j = 0
+        k = esquerda
+        while i < len(L) and j < len(R):
+            estatisticas.comparacoes += 1
+            if chaves[L[i]] <= chaves[R[j]]:
+                indices[k] = L[i]
+                i += 1
+            else:
+                indices[k] = R[j]
+                j += 1
+            k += 1
+        resto = L[i:] + R[j:]
+        indices[k:direita + 1] = resto
+        estatisticas.movimentacoes += (k - esquerda) + len(resto)
+        estatisticas.intercalacoes += 1
+
+    def merge_sort(esquerda, direita):
+        if esquerda < direita:
+            meio = esquerda + (direita - esquerda) // 2
+            merge_sort(esquerda, meio)
+            merge_sort(meio + 1, direita)
+            merge(esquerda, meio, direita)
+
+    merge_sort(0, len(chaves) - 1)
+    return indices, estatisticas
+
+
+def montar_chaves(df, campos, decrescente=False):
+    """
+    Lista de chaves Python (uma por registro) com a ordem do comparar_registros;
+    com vários campos, tuplas
+    """
+    campos = ordenacaoDados.resolver_campos(campos)
+    decrescente = ordenacaoDados.resolver_decrescente(campos, decrescente)
+    colunas = []
+    for campo, desc in zip(campos, decrescente):
+        chave = ordenacaoDados.chave_campo(df, campo.coluna)
+        colunas.append((-chave if desc else chave).tolist())
+    return colunas[0] if len(colunas) == 1 else list(zip(*colunas))
+
+
+def ordenar_indices_adaptativo(df, campos, decrescente=False, corte=CORTE_INSERCAO):
+    """
+    Versão adaptativa de ordenacaoDados.ordenar_indices
+    Retorna (indices, EstatisticasOrdenacao)
+    """
+    indices, estatisticas = ordenar_chaves(montar_chaves(df, campos, decrescente), corte)
+    return np.asarray(indices, dtype=np.int64), estatisticas
+
+
+def ordenar_csv_adaptativo(entrada, saida, campos=ordenacaoDados.CampoOrdenacao.DATA_PAS,
+                           decrescente=False, arquivo_estatisticas=None, corte=CORTE_INSERCAO):
+    """Lê, ordena com o merge natural e grava o CSV; retorna as métricas"""
+    cabecalho, df = ordenacaoDados.ler_csv(entrada)
+
+    inicio = time.perf_counter()
+    indices, estatisticas = ordenar_indices_adaptativo(df, campos, decrescente, corte)
+    tempo = time.perf_counter() - inicio
+
+    ordenacaoDados.escrever_csv_ordenado(saida, df, cabecalho, indices)
+
+    if arquivo_estatisticas:
+        ordenacaoDados.salvar_estatisticas(arquivo_estatisticas, campos, len(df), tempo,
+                                           estatisticas.comparacoes, estatisticas.movimentacoes,
+                                           arquivo_processado=str(entrada))
+
+    resultado = {'total_registros': len(df), 'tempo_execucao': tempo}
+    resultado.update(estatisticas.para_dict())
+    return resultado
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Ordenação adaptativa (merge natural) do CSV de focos de calor',
+        epilog='Exemplo: python ordenacaoAdaptativa.py focos.csv -c data_pas --comparar'
+    )
+    parser.add_argument('entrada', help='CSV de entrada')
+    parser.add_argument('--saida', '-o', default='dados_ordenados.csv',
+                        help='CSV ordenado (padrão: dados_ordenados.csv)')
+    parser.add_argument('--campo', '-c', action='append',
+                        help='Campo de ordenação (nome ou número 1-9); repita para várias chaves')
+    parser.add_argument('--decrescente', '-d', action='store_true',
+                        help='Ordena em ordem decrescente')
+    parser.add_argument('--corte', type=int, default=CORTE_INSERCAO,
+                        help=f'Corridas abaixo de ~corte elementos usam inserção binária '
+                             f'(padrão: {CORTE_INSERCAO})')
+    parser.add_argument('--estatisticas', '-e', default='estatisticas_execucao.txt',
+                        help='Arquivo de estatísticas (padrão: estatisticas_execucao.txt)')
+    parser.add_argument('--comparar', action='store_true',
+                        help='Mostra também os contadores que o mergeSort.c teria nesta entrada')
+
+    args = parser.parse_args(argv)
+
+    try:
+        campos = ordenacaoDados.resolver_campos(args.campo or ['data_pas'])
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("Ordenando com merge natural...")
+    resultado = ordenar_csv_adaptativo(args.entrada, args.saida, campos, args.decrescente,
+                                       args.estatisticas, args.corte)
+    print(f"Total de registros: {resultado['total_registros']}")
+    print(f"Ordenação concluída em {resultado['tempo_execucao']:.6f} segundos")
+    print(f"Corridas naturais: {resultado['corridas']} | intercalações: {resultado['intercalacoes']}")
+    print(f"Comparações: {resultado['comparacoes']}")
+    print(f"Movimentações: {resultado['movimentacoes']}")
+
+    if args.comparar:
+        _, df = ordenacaoDados.ler_csv(args.entrada)
+        _, c = contar_mergesort_c(montar_chaves(df, campos, args.decrescente))
+        print(f"mergeSort.c: {c.comparacoes} comparações, {c.movimentacoes} movimentações")
+
+    print(f"Arquivo ordenado: {args.saida}")
+    print(f"Estatísticas: {args.estatisticas}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
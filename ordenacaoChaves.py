@@ -0,0 +1,217 @@
+"""
+Ordenação por chaves normalizadas: cada campo vira uma ou mais chaves uint64 com
+a ordem do strcmp do mergeSort.c, ordenadas por radix sort (mesmo resultado de
+ordenacaoDados.ordenar_indices)
+"""
+import ordenacaoDados
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+BITS_DIGITO = 16
+
+# Posições fixas de 'AAAA-MM-DD HH:MM:SS'
+LARGURA_DATA = 19
+SEPARADORES_DATA = {4: b'-', 7: b'-', 10: b' ', 13: b':', 16: b':'}
+
+# UUID canônico: 8-4-4-4-12 dígitos hexadecimais
+LARGURA_UUID = 36
+HIFENS_UUID = (8, 13, 18, 23)
+
+# Maior largura de id_bdq que cabe em uint64 (10^19 < 2^64)
+LARGURA_MAXIMA_ID = 19
+
+_SINAL = 1 << 63
+
+
+def _bytes_fixos(valores, largura=None):
+    """
+    Matriz (n, largura) de bytes ASCII de uma coluna de texto, ou None se algum
+    valor não for ASCII ou (com largura) não tiver exatamente essa largura
+    """
+    texto = np.asarray(valores)
+    if texto.dtype.kind != 'S':
+        try:
+            texto = texto.astype(object).astype('S')
+        except (UnicodeEncodeError, TypeError, ValueError):
+            return None
+    if len(texto) == 0 or (largura is not None and texto.dtype.itemsize != largura):
+        return None
+    # Valores mais curtos ficam completados com \0, que nenhum validador aceita
+    return texto.view(np.uint8).reshape(len(texto), texto.dtype.itemsize)
+
+
+def codificar_data_pas(valores):
+    """Segundos desde 1970 (int64) ou None se algum valor fugir de 'AAAA-MM-DD HH:MM:SS'"""
+    matriz = _bytes_fixos(valores, LARGURA_DATA)
+    if matriz is None:
+        return None
+    digitos = np.ones(LARGURA_DATA, dtype=bool)
+    for posicao, separador in SEPARADORES_DATA.items():
+        if not (matriz[:, posicao] == ord(separador)).all():
+            return None
+        digitos[posicao] = False
+    if not ((matriz[:, digitos] - ord('0')) <= 9).all():
+        return None
+    try:
+        # Mesma largura e dígitos nas mesmas posições: ordem cronológica == strcmp
+        datas = matriz.view(f'S{LARGURA_DATA}').ravel().astype('datetime64[s]')
+    except ValueError:
+        return None  # mês 13, dia 30 de fevereiro...
+    return datas.view(np.int64)
+
+
+def codificar_digitos(valores):
+    """Inteiro (uint64) de textos só com dígitos e mesma largura, ou None"""
+    matriz = _bytes_fixos(valores)
+    if matriz is None or matriz.shape[1] > LARGURA_MAXIMA_ID:
+        return None
+    if not ((matriz - np.uint8(ord('0'))) <= 9).all():
+        return None
+    # Uma coluna de dígitos por vez: só um uint64 por valor em memória
+    valores = np.zeros(len(matriz), dtype=np.uint64)
+    for posicao in range(matriz.shape[1]):
+        valores *= np.uint64(10)
+        valores += matriz[:, posicao] - np.uint8(ord('0'))
+    return valores
+
+
+def _tabela_hexadecimal(maiusculas):
+    tabela = np.full(256, 255, dtype=np.uint8)
+    tabela[np.frombuffer(b'0123456789', dtype=np.uint8)] = np.arange(10)
+    letras = b'ABCDEF' if maiusculas else b'abcdef'
+    tabela[np.frombuffer(letras, dtype=np.uint8)] = np.arange(10, 16)
+    return tabela
+
+
+def codificar_uuid(valores):
+    """
+    (alto, baixo) uint64 de UUIDs canônicos, ou None
+    Só minúsculas ou só maiúsculas: com as duas, o strcmp põe 'F' antes de 'a'
+    """
+    matriz = _bytes_fixos(valores, LARGURA_UUID)
+    if matriz is None or not (matriz[:, list(HIFENS_UUID)] == ord('-')).all():
+        return None
+    hexa = np.delete(matriz, HIFENS_UUID, axis=1)
+    for maiusculas in (False, True):
+        nibbles = _tabela_hexadecimal(maiusculas)[hexa]
+        if (nibbles < 16).all():
+            break
+    else:
+        return None
+    # Pares de dígitos viram bytes; 8 bytes big-endian são um uint64 na ordem do texto
+    octetos = np.ascontiguousarray((nibbles[:, 0::2] << 4) | nibbles[:, 1::2])
+    metades = octetos.view('>u8').astype(np.uint64)
+    return np.ascontiguousarray(metades[:, 0]), np.ascontiguousarray(metades[:, 1])
+
+
+def para_uint64(chave):
+    """Leva uma chave numérica para uint64 preservando a ordem"""
+    chave = np.asarray(chave)
+    if chave.dtype.kind == 'u':
+        return chave.astype(np.uint64, copy=False)
+    if chave.dtype.kind == 'f':
+        # + 0.0 junta -0.0 e 0.0 (iguais na comparação do C)
+        valores = chave.astype(np.float64) + 0.0
+        nulos = np.isnan(valores)
+        if nulos.any():
+            # NaN de qualquer sinal vira o NaN positivo: fica no fim, como no np.lexsort
+            valores[nulos] = np.nan
+        bits = valores.view(np.uint64)
+        negativos = (bits >> np.uint64(63)).astype(bool)
+        return np.where(negativos, ~bits, bits | np.uint64(_SINAL))
+    if chave.dtype.kind in 'iMm':
+        return chave.astype(np.int64, copy=False).view(np.uint64) ^ np.uint64(_SINAL)
+    raise TypeError(f"Chave sem codificação numérica: {chave.dtype}")
+
+
+def _codificadores(amostra):
+    """Codificadores que podem servir, pelo primeiro valor (evita converter a coluna à toa)"""
+    if not isinstance(amostra, str):
+        return []
+    if len(amostra) == LARGURA_DATA and amostra[4:5] == '-':
+        return [codificar_data_pas]
+    if len(amostra) == LARGURA_UUID and amostra[8:9] == '-':
+        return [codificar_uuid]
+    if amostra.isdigit():
+        return [codificar_digitos]
+    return []
+
+
+def codificar_texto(texto, decrescente=False):
+    """
+    (codificador, chaves uint64) de um array de textos pelo valor de cada um,
+    sem dicionário (serve para um trecho da coluna), ou None
+    """
+    if not len(texto):
+        return None
+    for codificar in _codificadores(texto[0]):
+        chave = codificar(texto)
+        if chave is not None:
+            chaves = [para_uint64(c) for c in (chave if isinstance(chave, tuple) else [chave])]
+            # ~ inverte a ordem de um uint64 sem overflow
+            return codificar, [~c for c in chaves] if decrescente else chaves
+    return None
+
+
+def codificar_coluna(valores, decrescente=False):
+    """
+    Chaves uint64 (a mais significativa primeiro) com a ordem do comparar_registros
+    decrescente: inverte a ordem, como a chave negada de ordenacaoDados.ordenar_indices
+    """
+    serie = valores if isinstance(valores, pd.Series) else pd.Series(valores)
+    if serie.dtype == object:
+        codificado = codificar_texto(serie.to_numpy(), decrescente)
+        if codificado is not None:
+            return codificado[1]
+
+    # Fora dos formatos esperados: dicionário ordenado (reproduz o strcmp em
+    # qualquer texto), datas e números
+    chave = ordenacaoDados.chave_coluna(serie)
+    if decrescente:
+        # Negação antes da conversão: -0.0 e NaN tratados como no np.lexsort
+        return [~para_uint64(chave) if chave.dtype.kind in 'iuMm' else para_uint64(-chave)]
+    return [para_uint64(chave)]
+
+
+def chaves_normalizadas(df, campos, decrescente=False):
+    """Lista de chaves uint64 de todos os campos, da mais significativa para a menos"""
+    campos = ordenacaoDados.resolver_campos(campos)
+    decrescente = ordenacaoDados.resolver_decrescente(campos, decrescente)
+    chaves = []
+    for campo, desc in zip(campos, decrescente):
+        if hasattr(df, 'chaves_uint64'):
+            # registrosDados.TabelaRegistros: as colunas já estão codificadas
+            chaves.extend(df.chaves_uint64(campo.coluna, desc))
+        else:
+            chaves.extend(codificar_coluna(df[campo.coluna], desc))
+    return chaves
+
+
+def ordenar_radix(chaves):
+    """
+    Permutação estável que ordena pelas chaves uint64 (a primeira é a principal)
+    Radix LSD com dígitos de BITS_DIGITO bits; cada chave é deslocada pelo seu
+    mínimo e só as passadas que cobrem a amplitude restante são feitas
+    """
+    n = len(chaves[0]) if chaves else 0
+    indices = np.arange(n, dtype=np.int64)
+    if n < 2:
+        return indices
+    mascara = np.uint64((1 << BITS_DIGITO) - 1)
+    for chave in reversed(chaves):
+        chave = chave - chave.min()
+        bits = int(chave.max()).bit_length()
+        for deslocamento in range(0, bits, BITS_DIGITO):
+            # np.argsort estável em uint16 é um radix sort
+            digito = ((chave[indices] >> np.uint64(deslocamento)) & mascara).astype(np.uint16)
+            indices = indices[np.argsort(digito, kind='stable')]
+    return indices
+
+
+def ordenar_indices_radix(df, campos, decrescente=False):
+    """Versão com chaves normalizadas e radix sort de ordenacaoDados.ordenar_indices"""
+    if len(df) == 0:
+        return np.arange(0)
+    return ordenar_radix(chaves_normalizadas(df, campos, decrescente))
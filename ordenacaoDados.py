@@ -0,0 +1,339 @@
+"""
+Ordenação do CSV de focos em Python/NumPy
+
+Espelha o mergeSort.c (mesmos campos de CampoOrdenacao, mesma comparação
+de comparar_registros e mesma saída de escrever_csv_ordenado), mas ordena
+um índice de permutação com np.lexsort estável em vez de mover registros.
+"""
+import sys
+import time
+from enum import IntEnum
+
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+# Formato de linha usado por escrever_csv_ordenado no mergeSort.c
+FORMATO_LINHA = '%s,%s,%12.6f,%12.6f,%s,%s,%s,%s,%s\n'
+
+# Linhas formatadas por escrita ao gerar o CSV ordenado
+LINHAS_POR_ESCRITA = 100_000
+
+
+class CampoOrdenacao(IntEnum):
+    """Campos de ordenação (mesma numeração do enum em mergeSort.c)"""
+    ID_BDQ = 1
+    FOCO_ID = 2
+    LAT = 3
+    LON = 4
+    DATA_PAS = 5
+    PAIS = 6
+    ESTADO = 7
+    MUNICIPIO = 8
+    BIOMA = 9
+
+    @property
+    def coluna(self):
+        return self.name.lower()
+
+
+COLUNAS = [campo.coluna for campo in CampoOrdenacao]
+COLUNAS_NUMERICAS = ('lat', 'lon')
+
+FORMATOS_SAIDA = ('csv', 'binario')
+
+# lexsort: np.lexsort (rápido, sem contadores); adaptativo: merge natural de
+# ordenacaoAdaptativa, com comparações e movimentações como no mergeSort.c;
+# radix: chaves inteiras de largura fixa (ordenacaoChaves), para entradas grandes
+ALGORITMOS = ('lexsort', 'adaptativo', 'radix')
+
+
+def resolver_campo(campo):
+    """Aceita CampoOrdenacao, número do menu (1-9) ou nome da coluna"""
+    if isinstance(campo, CampoOrdenacao):
+        return campo
+    if isinstance(campo, str):
+        nome = campo.strip()
+        if nome.isdigit():
+            return CampoOrdenacao(int(nome))
+        try:
+            return CampoOrdenacao[nome.upper()]
+        except KeyError:
+            raise ValueError(f"Campo de ordenação inválido: {campo!r}") from None
+    return CampoOrdenacao(campo)
+
+
+def resolver_campos(campos):
+    """Normaliza um campo ou uma lista de campos"""
+    if isinstance(campos, (str, int)):
+        campos = [campos]
+    return [resolver_campo(c) for c in campos]
+
+
+def resolver_decrescente(campos, decrescente):
+    """Um bool por campo (campos já resolvidos); um único bool vale para todos"""
+    if isinstance(decrescente, bool):
+        return [decrescente] * len(campos)
+    decrescente = list(decrescente)
+    if len(decrescente) != len(campos):
+        raise ValueError("decrescente deve ter um valor por campo de ordenação")
+    return decrescente
+
+
+def parsear_linha(linha):
+    """
+    Separa uma linha como o parsear_linha do C: strtok por vírgula
+    (campos vazios são ignorados), trim em cada campo e atof em lat/lon
+    """
+    tokens = [t.strip() for t in linha.rstrip('\n').split(',') if t != ''][:9]
+    tokens += [''] * (9 - len(tokens))
+    return (tokens[0], tokens[1], _atof(tokens[2]), _atof(tokens[3]),
+            tokens[4], tokens[5], tokens[6], tokens[7], tokens[8])
+
+
+def _atof(texto):
+    try:
+        return float(texto)
+    except ValueError:
+        return 0.0
+
+
+def ler_cabecalho(caminho):
+    """Lê o cabeçalho exatamente como está no arquivo (com a quebra de linha)"""
+    with open(caminho, 'r', encoding='utf-8', errors='surrogateescape', newline='') as arquivo:
+        return arquivo.readline()
+
+
+def _ler(caminho, **opcoes):
+    return pd.read_csv(
+        caminho,
+        header=None,
+        skiprows=1,
+        names=COLUNAS,
+        dtype={col: (np.float64 if col in COLUNAS_NUMERICAS else object) for col in COLUNAS},
+        na_filter=False,
+        skipinitialspace=True,
+        float_precision='round_trip',
+        encoding='utf-8',
+        encoding_errors='surrogateescape',
+        **opcoes
+    )
+
+
+def _limpar(df):
+    # Mesmo trim do C (espaços e \r no fim dos campos)
+    for col in COLUNAS:
+        if col not in COLUNAS_NUMERICAS:
+            df[col] = df[col].str.strip()
+    return df
+
+
+def ler_csv(caminho):
+    """
+    Lê o CSV de focos para ordenação
+    Retorna (cabecalho, df); o cabeçalho é mantido exatamente como no arquivo
+    """
+    return ler_cabecalho(caminho), _limpar(_ler(caminho))
+
+
+def ler_csv_em_blocos(caminho, linhas_por_bloco):
+    """Lê o CSV de focos em blocos de até linhas_por_bloco registros"""
+    with _ler(caminho, chunksize=linhas_por_bloco) as leitor:
+        for bloco in leitor:
+            yield _limpar(bloco.reset_index(drop=True))
+
+
+def chave_coluna(valores):
+    """
+    Converte uma coluna em uma chave numérica com a mesma ordem do C:
+    números comparados por valor, strings por strcmp (ordem dos code points)
+    """
+    serie = valores if isinstance(valores, pd.Series) else pd.Series(valores)
+
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Ranking das categorias em ordem lexicográfica, aplicado aos códigos
+        categorias = np.asarray(serie.cat.categories, dtype=object)
+        posicao = np.empty(len(categorias), dtype=np.int64)
+        posicao[np.argsort(categorias, kind='stable')] = np.arange(len(categorias))
+        codigos = serie.cat.codes.to_numpy()
+        return np.where(codigos >= 0, posicao[codigos], -1)
+
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return serie.to_numpy().view(np.int64)
+
+    if pd.api.types.is_numeric_dtype(serie.dtype):
+        return serie.to_numpy()
+
+    codigos, _ = pd.factorize(serie, sort=True)
+    return codigos
+
+
+def chave_campo(dados, coluna):
+    """Chave de uma coluna de um DataFrame ou de uma registrosDados.TabelaRegistros"""
+    chave = getattr(dados, 'chave_coluna', None)
+    return chave(coluna) if chave is not None else chave_coluna(dados[coluna])
+
+
+def chaves_ordenacao(df, campos, decrescente=False):
+    """
+    Chaves numéricas dos campos (a principal primeiro); nos campos
+    decrescentes a chave é negada
+    """
+    campos = resolver_campos(campos)
+    decrescente = resolver_decrescente(campos, decrescente)
+
+    chaves = []
+    for campo, desc in zip(campos, decrescente):
+        chave = chave_campo(df, campo.coluna)
+        chaves.append(-chave if desc else chave)
+    return chaves
+
+
+def ordenar_indices(df, campos, decrescente=False):
+    """
+    Retorna a permutação estável que ordena df pelos campos dados
+    campos: um campo ou lista (o primeiro é a chave principal)
+    decrescente: bool para todos os campos ou lista com um bool por campo
+    """
+    chaves = chaves_ordenacao(df, campos, decrescente)
+    if not chaves or len(df) == 0:
+        return np.arange(len(df))
+
+    # np.lexsort usa a última chave como principal
+    return np.lexsort(chaves[::-1])
+
+
+def formatar_linhas(df, indices=None):
+    """Gera as linhas do CSV ordenado no formato do escrever_csv_ordenado"""
+    if indices is None:
+        indices = np.arange(len(df))
+
+    colunas = [df[col].to_numpy() for col in COLUNAS]
+    for inicio in range(0, len(indices), LINHAS_POR_ESCRITA):
+        bloco = indices[inicio:inicio + LINHAS_POR_ESCRITA]
+        yield ''.join(
+            FORMATO_LINHA % registro
+            for registro in zip(*(coluna[bloco] for coluna in colunas))
+        )
+
+
+def escrever_csv_ordenado(caminho, df, cabecalho, indices=None):
+    """Escreve o CSV ordenado com o mesmo layout do mergeSort.c"""
+    with open(caminho, 'w', encoding='utf-8', errors='surrogateescape', newline='') as arquivo:
+        arquivo.write(cabecalho)
+        for trecho in formatar_linhas(df, indices):
+            arquivo.write(trecho)
+
+
+def salvar_estatisticas(caminho, campos, total_registros, tempo_execucao,
+                        comparacoes=0, movimentacoes=0,
+                        arquivo_processado='focos_br_sc_ref_2024.csv'):
+    """Salva as estatísticas no mesmo formato do salvar_estatisticas do C"""
+    nomes = ', '.join(c.coluna for c in resolver_campos(campos))
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        arquivo.write("===== ESTATÍSTICAS DE EXECUÇÃO DO MERGESORT =====\n\n")
+        arquivo.write(f"Arquivo processado: {arquivo_processado}\n")
+        arquivo.write(f"Total de registros: {total_registros}\n")
+        arquivo.write(f"Campo de ordenação: {nomes}\n\n")
+        arquivo.write("--- Métricas de Desempenho ---\n")
+        arquivo.write(f"Tempo de execução da ordenação: {tempo_execucao:.6f} segundos\n")
+        arquivo.write(f"Total de comparações: {comparacoes}\n")
+        arquivo.write(f"Total de movimentações: {movimentacoes}\n")
+        arquivo.write("\n===== FIM DAS ESTATÍSTICAS =====\n")
+
+
+def ordenar_csv(entrada, saida, campos=CampoOrdenacao.DATA_PAS, decrescente=False,
+                arquivo_estatisticas=None, formato='csv', algoritmo='lexsort'):
+    """
+    Lê, ordena e grava o CSV; retorna um dicionário com as métricas
+    formato: 'csv' (igual ao mergeSort.c) ou 'binario' (formatoBinario, lido com mmap)
+    algoritmo: 'lexsort', 'adaptativo' (conta comparações e movimentações) ou 'radix'
+    """
+    if formato not in FORMATOS_SAIDA:
+        raise ValueError(f"Formato inválido: {formato!r} (use {', '.join(FORMATOS_SAIDA)})")
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"Algoritmo inválido: {algoritmo!r} (use {', '.join(ALGORITMOS)})")
+    import registrosDados
+    # Tabela compacta (colunas NumPy e dicionários) em vez do DataFrame de texto
+    cabecalho = ler_cabecalho(entrada)
+    tabela = registrosDados.ler_registros(entrada)
+
+    contadores = {'comparacoes': 0, 'movimentacoes': 0}
+    inicio = time.perf_counter()
+    if algoritmo == 'adaptativo':
+        import ordenacaoAdaptativa
+        indices, estatisticas = ordenacaoAdaptativa.ordenar_indices_adaptativo(tabela, campos, decrescente)
+        contadores = estatisticas.para_dict()
+    elif algoritmo == 'radix':
+        import ordenacaoChaves
+        indices = ordenacaoChaves.ordenar_indices_radix(tabela, campos, decrescente)
+    else:
+        indices = ordenar_indices(tabela, campos, decrescente)
+    tempo = time.perf_counter() - inicio
+
+    if formato == 'binario':
+        import formatoBinario
+        campos = resolver_campos(campos)
+        formatoBinario.escrever_binario(saida, tabela.para_dataframe(), indices,
+                                        [campo.coluna for campo in campos], decrescente)
+    else:
+        tabela.escrever_csv(saida, cabecalho, indices)
+
+    if arquivo_estatisticas:
+        salvar_estatisticas(arquivo_estatisticas, campos, len(tabela), tempo,
+                            contadores['comparacoes'], contadores['movimentacoes'],
+                            arquivo_processado=str(entrada))
+
+    resultado = {'total_registros': len(tabela), 'tempo_execucao': tempo,
+                 'bytes_por_registro': tabela.memoria()['bytes_por_linha']}
+    resultado.update(contadores)
+    return resultado
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Ordena o CSV de focos de calor (equivalente ao mergeSort.c)',
+        epilog='Exemplo: python ordenacaoDados.py focos_br_sc_ref_2024.csv -c data_pas'
+    )
+    parser.add_argument('entrada', help='CSV de entrada')
+    parser.add_argument('--saida', '-o', default='dados_ordenados.csv',
+                        help='CSV ordenado (padrão: dados_ordenados.csv)')
+    parser.add_argument('--campo', '-c', action='append',
+                        help='Campo de ordenação (nome ou número 1-9); repita para várias chaves')
+    parser.add_argument('--decrescente', '-d', action='store_true',
+                        help='Ordena em ordem decrescente')
+    parser.add_argument('--estatisticas', '-e', default='estatisticas_execucao.txt',
+                        help='Arquivo de estatísticas (padrão: estatisticas_execucao.txt)')
+    parser.add_argument('--formato', '-f', choices=FORMATOS_SAIDA, default='csv',
+                        help='Formato da saída: csv (igual ao C) ou binario (.focos, aberto com mmap)')
+    parser.add_argument('--algoritmo', '-a', choices=ALGORITMOS, default='lexsort',
+                        help='lexsort (padrão), adaptativo (merge natural, com contadores) '
+                             'ou radix (chaves inteiras pré-calculadas)')
+
+    args = parser.parse_args(argv)
+
+    try:
+        campos = resolver_campos(args.campo or [CampoOrdenacao.DATA_PAS])
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("Lendo e ordenando arquivo CSV...")
+    resultado = ordenar_csv(args.entrada, args.saida, campos, args.decrescente,
+                            args.estatisticas, args.formato, args.algoritmo)
+
+    print(f"Total de registros: {resultado['total_registros']}")
+    print(f"Memória dos registros: {resultado['bytes_por_registro']:.1f} bytes por registro")
+    print(f"Ordenação concluída em {resultado['tempo_execucao']:.6f} segundos")
+    if args.algoritmo == 'adaptativo':
+        print(f"Comparações: {resultado['comparacoes']}")
+        print(f"Movimentações: {resultado['movimentacoes']}")
+    print(f"Arquivo ordenado: {args.saida}")
+    print(f"Estatísticas: {args.estatisticas}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
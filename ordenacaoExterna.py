@@ -0,0 +1,238 @@
+"""
+Ordenação externa (fora da memória) do CSV de focos
+
+Lê o CSV em corridas limitadas pelo orçamento de memória, ordena cada
+corrida com o ordenacaoDados (mesma comparação do comparar_registros),
+grava as corridas em arquivos temporários e faz o merge de k vias com
+heap até gerar o dados_ordenados.csv.
+"""
+import heapq
+import os
+import shutil
+import sys
+import tempfile
+import time
+from functools import total_ordering
+
+import ordenacaoDados
+from ordenacaoDados import COLUNAS, COLUNAS_NUMERICAS
+
+# Orçamento de memória padrão para as corridas (bytes)
+MEMORIA_PADRAO = 256 * 1024 * 1024
+
+# Número máximo de corridas abertas ao mesmo tempo em um merge
+VIAS_PADRAO = 16
+
+# Um registro ocupa várias vezes o tamanho da linha quando vira DataFrame
+FATOR_MEMORIA = 8
+
+# Amostra lida para estimar o tamanho médio de uma linha
+BYTES_AMOSTRA = 64 * 1024
+
+LINHAS_MINIMAS_CORRIDA = 1000
+
+
+@total_ordering
+class _Invertido:
+    """Inverte a comparação de um valor (ordem decrescente em chaves mistas)"""
+    __slots__ = ('valor',)
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def __eq__(self, outro):
+        return self.valor == outro.valor
+
+    def __lt__(self, outro):
+        return outro.valor < self.valor
+
+
+def estimar_linhas_por_corrida(caminho, memoria):
+    """Estima quantas linhas cabem em uma corrida dentro do orçamento"""
+    with open(caminho, 'rb') as arquivo:
+        arquivo.readline()
+        amostra = arquivo.read(BYTES_AMOSTRA)
+    linhas = amostra.count(b'\n')
+    bytes_por_linha = len(amostra) / linhas if linhas else 128
+    return max(LINHAS_MINIMAS_CORRIDA, int(memoria / (bytes_por_linha * FATOR_MEMORIA)))
+
+
+def criar_extrator_chave(campos, decrescente=False):
+    """
+    Cria a função que extrai a chave de uma linha já formatada
+    A ordem é a mesma usada ao ordenar cada corrida
+    """
+    campos = ordenacaoDados.resolver_campos(campos)
+    decrescente = ordenacaoDados.resolver_decrescente(campos, decrescente)
+
+    posicoes = [COLUNAS.index(c.coluna) for c in campos]
+    numericos = [c.coluna in COLUNAS_NUMERICAS for c in campos]
+    mistas = len(set(decrescente)) > 1
+
+    def converter(texto, numerico, desc):
+        valor = float(texto) if numerico else texto.strip()
+        if not desc:
+            return valor
+        if numerico:
+            return -valor
+        return _Invertido(valor)
+
+    if len(campos) == 1 and not mistas:
+        # Caminho rápido: uma única chave
+        pos, numerico = posicoes[0], numericos[0]
+        if numerico:
+            return lambda linha: float(linha.split(',', pos + 1)[pos])
+        return lambda linha: linha.split(',', pos + 1)[pos].strip()
+
+    def chave(linha):
+        partes = linha.split(',')
+        return tuple(converter(partes[p], n, d if mistas else False)
+                     for p, n, d in zip(posicoes, numericos, decrescente))
+
+    return chave
+
+
+def gerar_corridas(entrada, pasta, campos, decrescente, linhas_por_corrida):
+    """Ordena o CSV em corridas e grava cada uma em um arquivo temporário"""
+    corridas = []
+    for i, bloco in enumerate(ordenacaoDados.ler_csv_em_blocos(entrada, linhas_por_corrida)):
+        indices = ordenacaoDados.ordenar_indices(bloco, campos, decrescente)
+        caminho = os.path.join(pasta, f'corrida_{i:06d}.csv')
+        with open(caminho, 'w', encoding='utf-8', errors='surrogateescape', newline='') as arquivo:
+            for trecho in ordenacaoDados.formatar_linhas(bloco, indices):
+                arquivo.write(trecho)
+        corridas.append(caminho)
+    return corridas
+
+
+def intercalar(corridas, destino, chave, inverter, buffer, cabecalho=None):
+    """
+    Merge de k vias (heap) das corridas para o arquivo destino
+    heapq.merge é estável: empates saem na ordem das corridas
+    """
+    arquivos = [open(c, 'r', encoding='utf-8', errors='surrogateescape',
+                     newline='', buffering=buffer) for c in corridas]
+    try:
+        with open(destino, 'w', encoding='utf-8', errors='surrogateescape',
+                  newline='', buffering=buffer) as saida:
+            if cabecalho is not None:
+                saida.write(cabecalho)
+            saida.writelines(heapq.merge(*arquivos, key=chave, reverse=inverter))
+    finally:
+        for arquivo in arquivos:
+            arquivo.close()
+
+
+def ordenar_csv_externo(entrada, saida, campos=ordenacaoDados.CampoOrdenacao.DATA_PAS,
+                        decrescente=False, memoria=MEMORIA_PADRAO, vias=VIAS_PADRAO,
+                        pasta_temporaria=None):
+    """
+    Ordena um CSV maior que a memória disponível
+    memoria: orçamento em bytes para cada corrida
+    vias: número máximo de corridas intercaladas por vez
+    Retorna um dicionário com as métricas da execução
+    """
+    if vias < 2:
+        raise ValueError("O merge precisa de pelo menos 2 vias")
+
+    campos = ordenacaoDados.resolver_campos(campos)
+    if isinstance(decrescente, bool):
+        lista_decrescente = [decrescente] * len(campos)
+    else:
+        lista_decrescente = list(decrescente)
+    mistas = len(set(lista_decrescente)) > 1
+    inverter = lista_decrescente[0] and not mistas
+
+    cabecalho = ordenacaoDados.ler_cabecalho(entrada)
+    linhas_por_corrida = estimar_linhas_por_corrida(entrada, memoria)
+    chave = criar_extrator_chave(campos, lista_decrescente)
+    # Buffer de E/S de cada arquivo aberto durante o merge
+    buffer = max(64 * 1024, memoria // (vias + 1))
+
+    inicio = time.perf_counter()
+    pasta = tempfile.mkdtemp(prefix='mergesort_', dir=pasta_temporaria)
+    try:
+        corridas = gerar_corridas(entrada, pasta, campos, lista_decrescente, linhas_por_corrida)
+        total_corridas = len(corridas)
+        tempo_corridas = time.perf_counter() - inicio
+
+        passadas = 0
+        # Passadas intermediárias até sobrarem no máximo 'vias' corridas
+        while len(corridas) > vias:
+            novas = []
+            for i in range(0, len(corridas), vias):
+                grupo = corridas[i:i + vias]
+                if len(grupo) == 1:
+                    novas.append(grupo[0])
+                    continue
+                destino = os.path.join(pasta, f'passada_{passadas}_{i // vias:06d}.csv')
+                intercalar(grupo, destino, chave, inverter, buffer)
+                for caminho in grupo:
+                    os.remove(caminho)
+                novas.append(destino)
+            corridas = novas
+            passadas += 1
+
+        intercalar(corridas, saida, chave, inverter, buffer, cabecalho)
+        passadas += 1
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    tempo_total = time.perf_counter() - inicio
+    tamanho = os.path.getsize(entrada)
+    return {
+        'linhas_por_corrida': linhas_por_corrida,
+        'corridas': total_corridas,
+        'passadas_merge': passadas,
+        'tempo_corridas': tempo_corridas,
+        'tempo_execucao': tempo_total,
+        'mb_por_segundo': tamanho / (1024 * 1024) / tempo_total if tempo_total else 0.0,
+    }
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Ordenação externa (k-way merge) do CSV de focos de calor',
+        epilog='Exemplo: python ordenacaoExterna.py focos.csv -c data_pas --memoria 512 --vias 32'
+    )
+    parser.add_argument('entrada', help='CSV de entrada')
+    parser.add_argument('--saida', '-o', default='dados_ordenados.csv',
+                        help='CSV ordenado (padrão: dados_ordenados.csv)')
+    parser.add_argument('--campo', '-c', action='append',
+                        help='Campo de ordenação (nome ou número 1-9); repita para várias chaves')
+    parser.add_argument('--decrescente', '-d', action='store_true',
+                        help='Ordena em ordem decrescente')
+    parser.add_argument('--memoria', '-m', type=int, default=MEMORIA_PADRAO // (1024 * 1024),
+                        help='Orçamento de memória por corrida em MB (padrão: %(default)s)')
+    parser.add_argument('--vias', '-k', type=int, default=VIAS_PADRAO,
+                        help='Corridas intercaladas por merge (padrão: %(default)s)')
+    parser.add_argument('--temp', default=None,
+                        help='Pasta para os arquivos temporários (padrão: temp do sistema)')
+
+    args = parser.parse_args(argv)
+
+    try:
+        campos = ordenacaoDados.resolver_campos(args.campo or ['data_pas'])
+    except ValueError as e:
+        parser.error(str(e))
+
+    print("Iniciando ordenação externa...")
+    resultado = ordenar_csv_externo(
+        args.entrada, args.saida, campos, args.decrescente,
+        memoria=args.memoria * 1024 * 1024, vias=args.vias,
+        pasta_temporaria=args.temp
+    )
+
+    print(f"Corridas geradas: {resultado['corridas']} "
+          f"({resultado['linhas_por_corrida']} linhas cada)")
+    print(f"Passadas de merge: {resultado['passadas_merge']}")
+    print(f"Ordenação concluída em {resultado['tempo_execucao']:.6f} segundos "
+          f"({resultado['mb_por_segundo']:.1f} MB/s)")
+    print(f"Arquivo ordenado: {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+Ordenação paralela do CSV de focos (sample sort com pool de processos); a
+permutação é a mesma de ordenacaoDados.ordenar_indices (estável)
+"""
+import gc
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import ordenacaoChaves
+import ordenacaoDados
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+# Abaixo disso o custo de criar o pool supera o ganho
+MINIMO_PARALELO = 200_000
+
+# Colunas de texto herdadas pelos processos do pool (fork); ver _codificar_trecho
+_COLUNAS = None
+
+
+class _BufferCompartilhado:
+    """Array NumPy em memória compartilhada (criado no processo principal)"""
+
+    def __init__(self, dados=None, forma=None, dtype=None):
+        if dados is not None:
+            forma, dtype = dados.shape, dados.dtype
+        dtype = np.dtype(dtype)
+        tamanho = max(1, int(np.prod(forma)) * dtype.itemsize)
+        self.shm = shared_memory.SharedMemory(create=True, size=tamanho)
+        self.descricao = (self.shm.name, tuple(forma), dtype.str)
+        self.array = np.ndarray(forma, dtype=dtype, buffer=self.shm.buf)
+        if dados is not None:
+            self.array[...] = dados
+
+    def liberar(self):
+        del self.array
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _anexar(descricao):
+    """Abre no processo filho um buffer criado pelo processo principal"""
+    return shared_memory.SharedMemory(name=descricao[0])
+
+
+def _array(shm, descricao):
+    _, forma, dtype = descricao
+    return np.ndarray(forma, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def _com_buffers(descricoes, funcao):
+    """
+    Executa funcao(*arrays) com os buffers compartilhados abertos
+    As views são descartadas antes de fechar a memória compartilhada
+    """
+    abertos = [_anexar(d) for d in descricoes]
+    try:
+        return funcao(*[_array(shm, d) for shm, d in zip(abertos, descricoes)])
+    finally:
+        for shm in abertos:
+            shm.close()
+
+
+def _codificar_trecho(coluna, inicio, fim, decrescente):
+    """
+    Codifica pelo valor o trecho [inicio, fim) de uma coluna de _COLUNAS
+    Retorna (codificador, largura, minúsculas, maiúsculas, chaves) ou None
+    """
+    texto = _COLUNAS[coluna][inicio:fim]
+    codificado = ordenacaoChaves.codificar_texto(texto, decrescente)
+    if codificado is None:
+        return None
+    codificar, chaves = codificado
+    minusculas = maiusculas = False
+    if codificar is ordenacaoChaves.codificar_uuid:
+        letras = texto.astype('S').view(np.uint8)
+        minusculas = bool((letras >= ord('a')).any())
+        maiusculas = bool(((letras >= ord('A')) & (letras <= ord('F'))).any())
+    return codificar.__name__, len(texto[0]), minusculas, maiusculas, chaves
+
+
+def _juntar_trechos(resultados):
+    """
+    Chaves da coluna inteira a partir dos trechos, ou None se a ordem de um
+    trecho não vale nos outros (outro codificador, outra largura de id,
+    UUIDs em minúsculas e em maiúsculas)
+    """
+    if any(r is None for r in resultados):
+        return None
+    if len({r[:2] for r in resultados}) != 1:
+        return None
+    if any(r[2] for r in resultados) and any(r[3] for r in resultados):
+        return None
+    return [np.concatenate(chaves) for chaves in zip(*(r[4] for r in resultados))]
+
+
+def ordenar_particao(chaves, locais, inicio, fim, amostras):
+    """
+    Grava em locais[inicio:fim] a ordem estável da partição e devolve
+    'amostras' linhas em posições regulares dela
+    """
+    ordem = np.lexsort([c[inicio:fim] for c in chaves[::-1]])
+    locais[inicio:fim] = ordem + inicio
+    if fim == inicio:
+        return np.empty(0, dtype=np.int64)
+    posicoes = np.linspace(0, fim - inicio - 1, amostras).astype(np.int64)
+    return locais[inicio:fim][posicoes].copy()
+
+
+def _composta(chaves, linha):
+    """Chave composta de uma linha: os campos e, desempatando, a posição no arquivo"""
+    return tuple(int(c[linha]) for c in chaves) + (int(linha),)
+
+
+def _primeira_posicao(chaves, locais, inicio, fim, separador):
+    """Busca binária: primeira posição da partição ordenada com chave composta >= separador"""
+    while inicio < fim:
+        meio = (inicio + fim) // 2
+        if _composta(chaves, locais[meio]) < separador:
+            inicio = meio + 1
+        else:
+            fim = meio
+    return inicio
+
+
+def planejar_baldes(chaves, locais, particoes, amostras, baldes):
+    """
+    Separadores regulares (PSRS) sobre as amostras e, para cada balde,
+    os trechos (inicio, fim) de cada partição ordenada que caem nele
+    """
+    # Chave composta sem empates: um separador por balde mesmo com chave principal constante
+    amostras = np.unique(amostras)
+    amostras = amostras[np.lexsort([amostras] + [c[amostras] for c in chaves[::-1]])]
+    posicoes = np.arange(1, baldes) * len(amostras) // baldes
+    separadores = [_composta(chaves, amostras[p]) for p in posicoes]
+
+    trechos = [[] for _ in range(len(separadores) + 1)]
+    for inicio, fim in particoes:
+        cortes = ([inicio] + [_primeira_posicao(chaves, locais, inicio, fim, s) for s in separadores]
+                  + [fim])
+        for j in range(len(trechos)):
+            if cortes[j + 1] > cortes[j]:
+                trechos[j].append((cortes[j], cortes[j + 1]))
+    return trechos
+
+
+def _ordenar_particao(desc_chaves, desc_locais, inicio, fim, amostras):
+    return _com_buffers([desc_locais] + list(desc_chaves),
+                        lambda locais, *chaves: ordenar_particao(chaves, locais, inicio, fim, amostras))
+
+
+def _intercalar_balde(desc_chaves, desc_locais, desc_saida, trechos, deslocamento):
+    """
+    Junta os trechos (inicio, fim) de cada partição que caem neste balde
+    e grava a ordem final a partir de 'deslocamento'
+    """
+    def executar(locais, saida, *todas):
+        if not trechos:
+            return 0
+        # Trechos concatenados na ordem das partições: a ordenação estável
+        # mantém os empates na ordem original do arquivo
+        indices = np.concatenate([locais[a:b] for a, b in trechos])
+        chaves = [array[indices] for array in todas]
+        ordem = np.lexsort(chaves[::-1])
+        saida[deslocamento:deslocamento + len(indices)] = indices[ordem]
+        return len(indices)
+
+    return _com_buffers([desc_locais, desc_saida] + list(desc_chaves), executar)
+
+
+def _pode_bifurcar():
+    import multiprocessing
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def _codificar_campos(df, campos, decrescente, pool, particoes):
+    """
+    Chaves uint64 de todos os campos (ordenacaoChaves.chaves_normalizadas);
+    as colunas de texto codificáveis pelo valor são divididas entre os processos
+    """
+    trechos = {}
+    for campo, desc in zip(campos, decrescente):
+        serie = df[campo.coluna]
+        if (pool is not None and serie.dtype == object and len(serie)
+                and ordenacaoChaves.codificar_texto(_COLUNAS[campo.coluna][:1]) is not None):
+            trechos[campo.coluna] = [pool.submit(_codificar_trecho, campo.coluna, int(a), int(b), desc)
+                                     for a, b in particoes]
+
+    chaves = []
+    for campo, desc in zip(campos, decrescente):
+        codificadas = None
+        if campo.coluna in trechos:
+            codificadas = _juntar_trechos([f.result() for f in trechos[campo.coluna]])
+        if codificadas is None and hasattr(df, 'chaves_uint64'):
+            # registrosDados.TabelaRegistros: as colunas já estão codificadas
+            codificadas = df.chaves_uint64(campo.coluna, desc)
+        elif codificadas is None:
+            # Dicionário ordenado da coluna inteira (categorias, números, texto livre)
+            codificadas = ordenacaoChaves.codificar_coluna(df[campo.coluna], desc)
+        chaves.extend(codificadas)
+    return chaves
+
+
+def ordenar_indices_paralelo(df, campos, decrescente=False, processos=None):
+    """
+    Versão paralela de ordenacaoDados.ordenar_indices
+    processos: número de processos do pool (padrão: os.cpu_count())
+    """
+    global _COLUNAS
+
+    processos = processos or os.cpu_count() or 1
+    n = len(df)
+    if processos < 2 or n < MINIMO_PARALELO:
+        return ordenacaoDados.ordenar_indices(df, campos, decrescente)
+
+    campos = ordenacaoDados.resolver_campos(campos)
+    decrescente = ordenacaoDados.resolver_decrescente(campos, decrescente)
+    limites = np.linspace(0, n, processos + 1).astype(np.int64)
+    particoes = [(int(a), int(b)) for a, b in zip(limites[:-1], limites[1:])]
+
+    # Com fork os processos herdam as colunas de texto sem cópia nem pickle
+    bifurcar = _pode_bifurcar() and isinstance(df, pd.DataFrame)
+    contexto = None
+    if bifurcar:
+        import multiprocessing
+        contexto = multiprocessing.get_context('fork')
+        _COLUNAS = {c.coluna: df[c.coluna].to_numpy() for c in campos if df[c.coluna].dtype == object}
+
+    # Rastreador de memória compartilhada do processo principal iniciado antes do pool:
+    # os filhos usam o mesmo, em vez de cada um criar o seu e apagar os buffers ao sair
+    resource_tracker.ensure_running()
+    # Objetos atuais fora da coleta: o gc dos filhos não toca (e copia) as páginas das colunas
+    gc.freeze()
+    buffers = []
+    try:
+        # Os processos só recebem os nomes dos buffers compartilhados
+        with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as pool:
+            # Etapa 1: chaves uint64, com as colunas de texto codificadas em trechos
+            chaves = _codificar_campos(df, campos, decrescente, pool if bifurcar else None, particoes)
+            buffers = [_BufferCompartilhado(c) for c in chaves]
+            locais = _BufferCompartilhado(forma=(n,), dtype=np.int64)
+            saida = _BufferCompartilhado(forma=(n,), dtype=np.int64)
+            buffers += [locais, saida]
+            desc_chaves = [b.descricao for b in buffers[:len(chaves)]]
+
+            # Etapa 2: ordenação local das partições
+            futuros = [pool.submit(_ordenar_particao, desc_chaves, locais.descricao, a, b, processos)
+                       for a, b in particoes]
+            amostras = np.concatenate([f.result() for f in futuros])
+
+            # Etapa 3: baldes pela chave composta e merge paralelo direto na saída
+            trechos = planejar_baldes([b.array for b in buffers[:len(chaves)]], locais.array,
+                                      particoes, amostras, processos)
+            tamanhos = [sum(b - a for a, b in t) for t in trechos]
+            deslocamentos = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))
+            futuros = [pool.submit(_intercalar_balde, desc_chaves, locais.descricao,
+                                   saida.descricao, trechos[j], int(deslocamentos[j]))
+                       for j in range(len(trechos))]
+            for f in futuros:
+                f.result()
+
+        return saida.array.copy()
+    finally:
+        gc.unfreeze()
+        _COLUNAS = None
+        for b in buffers:
+            b.liberar()
+
+
+def comparar_com_sequencial(df, campos, decrescente=False, processos=None):
+    """Mede a versão sequencial e a paralela e retorna o speedup"""
+    inicio = time.perf_counter()
+    sequencial = ordenacaoDados.ordenar_indices(df, campos, decrescente)
+    tempo_sequencial = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    paralelo = ordenar_indices_paralelo(df, campos, decrescente, processos)
+    tempo_paralelo = time.perf_counter() - inicio
+
+    return {
+        'total_registros': len(df),
+        'processos': processos or os.cpu_count(),
+        'tempo_sequencial': tempo_sequencial,
+        'tempo_paralelo': tempo_paralelo,
+        'speedup': tempo_sequencial / tempo_paralelo if tempo_paralelo else 0.0,
+        'mesma_ordem': bool(np.array_equal(sequencial, paralelo)),
+    }
+
+
+def ordenar_csv_paralelo(entrada, saida, campos=ordenacaoDados.CampoOrdenacao.DATA_PAS,
+                         decrescente=False, processos=None, arquivo_estatisticas=None):
+    """Lê, ordena em paralelo e grava o CSV; retorna as métricas"""
+    cabecalho, df = ordenacaoDados.ler_csv(entrada)
+
+    inicio = time.perf_counter()
+    indices = ordenar_indices_paralelo(df, campos, decrescente, processos)
+    tempo = time.perf_counter() - inicio
+
+    ordenacaoDados.escrever_csv_ordenado(saida, df, cabecalho, indices)
+
+    if arquivo_estatisticas:
+        ordenacaoDados.salvar_estatisticas(arquivo_estatisticas, campos, len(df), tempo,
+                                           arquivo_processado=str(entrada))
+
+    return {'total_registros': len(df), 'tempo_execucao': tempo}
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Ordenação paralela do CSV de focos de calor',
+        epilog='Exemplo: python ordenacaoParalela.py focos.csv -c data_pas -p 32 --comparar'
+    )
+    parser.add_argument('entrada', help='CSV de entrada')
+    parser.add_argument('--saida', '-o', default='dados_ordenados.csv',
+                        help='CSV ordenado (padrão: dados_ordenados.csv)')
+    parser.add_argument('--campo', '-c', action='append',
+                        help='Campo de ordenação (nome ou número 1-9); repita para várias chaves')
+    parser.add_argument('--decrescente', '-d', action='store_true',
+                        help='Ordena em ordem decrescente')
+    parser.add_argument('--processos', '-p', type=int, default=None,
+                        help='Processos do pool (padrão: número de CPUs)')
+    parser.add_argument('--estatisticas', '-e', default='estatisticas_execucao.txt',
+                        help='Arquivo de estatísticas (padrão: estatisticas_execucao.txt)')
+    parser.add_argument('--comparar', action='store_true',
+                        help='Mede também a versão sequencial e mostra o speedup')
+
+    args = parser.parse_args(argv)
+
+    try:
+        campos = ordenacaoDados.resolver_campos(args.campo or ['data_pas'])
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.comparar:
+        _, df = ordenacaoDados.ler_csv(args.entrada)
+        r = comparar_com_sequencial(df, campos, args.decrescente, args.processos)
+        print(f"Registros: {r['total_registros']} | processos: {r['processos']}")
+        print(f"Sequencial: {r['tempo_sequencial']:.6f} s")
+        print(f"Paralelo:   {r['tempo_paralelo']:.6f} s")
+        print(f"Speedup:    {r['speedup']:.2f}x (mesma ordem: {r['mesma_ordem']})")
+
+    print("Ordenando em paralelo...")
+    resultado = ordenar_csv_paralelo(args.entrada, args.saida, campos, args.decrescente,
+                                     args.processos, args.estatisticas)
+    print(f"Total de registros: {resultado['total_registros']}")
+    print(f"Ordenação concluída em {resultado['tempo_execucao']:.6f} segundos")
+    print(f"Arquivo ordenado: {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Geração em lote de dashboards filtrados (um por município, bioma, mês...)
+Dados e índice carregados uma vez, herdados por um pool de processos com fork;
+o manifesto (lote.json) pula as saídas já em dia
+"""
+import contextlib
+import gc
+import io
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import namedtuple
+
+import consultaDados
+import exportacaoHtml
+import visualizadorDados
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+# Dimensões aceitas para gerar um dashboard por combinação de valores
+DIMENSOES = ('bioma', 'municipio', 'mes', 'hora')
+
+MANIFESTO_LOTE = 'lote.json'
+VERSAO_MANIFESTO = 1
+
+# posicoes: linhas já selecionadas (fatia da partição) ou None para usar o índice
+Especificacao = namedtuple('Especificacao', ['nome', 'filtro', 'posicoes'])
+
+# (visualizador, especificações, pasta, compressão), herdado pelos processos do pool
+_LOTE = None
+
+
+def _valor_texto(nome, valor):
+    """Valor de Filtro.parametros() no formato de Filtro.de_texto"""
+    if isinstance(valor, pd.Timestamp):
+        seguinte = valor + pd.Timedelta(1, 'ns')
+        if nome == 'fim' and seguinte == seguinte.normalize():
+            return valor.strftime('%Y-%m-%d')  # até o fim do dia
+        return valor.strftime('%Y-%m-%d') if valor == valor.normalize() else str(valor)
+    if nome in ('mes', 'hora'):
+        a, b = valor
+        return str(a) if a == b else f'{a}-{b}'
+    if nome in ('bioma', 'municipio'):
+        return '|'.join(valor)
+    return ','.join(f'{v:g}' for v in valor)
+
+
+def texto_filtro(filtro):
+    """'bioma=Pampa; mes=3': o texto que recria o filtro"""
+    return '; '.join(f'{nome}={_valor_texto(nome, valor)}'
+                     for nome, valor in filtro.parametros().items())
+
+
+def nome_saida(filtro):
+    """Nome de arquivo (sem extensão) do dashboard de um filtro"""
+    texto = '_'.join(parte.replace('=', '-') for parte in texto_filtro(filtro).split('; '))
+    texto = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    texto = re.sub(r'[^A-Za-z0-9_.+-]+', '-', texto.replace('|', '+')).strip('-')
+    return texto or 'todos'
+
+
+def _especificacoes(itens):
+    """
+    Especificações com nomes únicos (sufixo -2, -3... nas colisões)
+    itens: Especificacao ou filtros (texto, dicionário ou Filtro)
+    """
+    usados = {}
+    for item in itens:
+        if not isinstance(item, Especificacao):
+            filtro = consultaDados.Filtro.criar(item)
+            item = Especificacao(nome_saida(filtro), filtro, None)
+        usados[item.nome] = usados.get(item.nome, 0) + 1
+        if usados[item.nome] > 1:
+            item = item._replace(nome=f'{item.nome}-{usados[item.nome]}')
+        yield item
+
+
+def ler_filtros(linhas):
+    """
+    Filtros de um arquivo ou iterável de linhas ('bioma=Pampa; mes=3')
+    Linhas vazias e começadas por # são ignoradas
+    """
+    if isinstance(linhas, (str, os.PathLike)):
+        if str(linhas) == '-':
+            return ler_filtros(sys.stdin)
+        with open(linhas, encoding='utf-8') as arquivo:
+            return ler_filtros(list(arquivo))
+    filtros = []
+    for numero, linha in enumerate(linhas, 1):
+        linha = linha.strip()
+        if not linha or linha.startswith('#'):
+            continue
+        try:
+            filtros.append(consultaDados.Filtro.criar(linha))
+        except ValueError as e:
+            raise ValueError(f"Linha {numero}: {e}") from None
+    return filtros
+
+
+def particionar(vis, dimensoes):
+    """
+    Uma especificação por combinação existente de valores das dimensões
+    Uma única ordenação estável dos códigos do índice: as linhas de cada
+    combinação são uma fatia dela, já em ordem crescente (como em selecionar)
+    """
+    if isinstance(dimensoes, str):
+        dimensoes = [d.strip() for d in dimensoes.split(',') if d.strip()]
+    invalidas = [d for d in dimensoes if d not in DIMENSOES]
+    if not dimensoes or invalidas:
+        raise ValueError(f"Dimensões inválidas: {', '.join(invalidas) or '(nenhuma)'} "
+                         f"(use {', '.join(DIMENSOES)})")
+
+    indice = vis.indice
+    validas = np.ones(indice.total, dtype=bool)
+    chave = np.zeros(indice.total, dtype=np.int64)
+    for dimensao in dimensoes:
+        if dimensao in consultaDados.COLUNAS_INVERTIDAS:
+            codigos = indice.codigos[dimensao].astype(np.int64)
+            base = len(indice.categorias[dimensao])
+        else:
+            codigos = getattr(indice, dimensao).astype(np.int64)
+            base = 24 if dimensao == 'hora' else 13
+        validas &= codigos >= 0
+        chave = chave * base + codigos
+
+    linhas = np.flatnonzero(validas)
+    ordem = linhas[np.argsort(chave[linhas], kind='stable')]
+    chaves = chave[ordem]
+    inicios = np.flatnonzero(np.concatenate(([True], chaves[1:] != chaves[:-1]))) if len(ordem) else []
+    fins = list(inicios[1:]) + [len(ordem)]
+
+    especificacoes = []
+    for a, b in zip(inicios, fins):
+        criterios = {}
+        primeira = ordem[a]
+        for dimensao in dimensoes:
+            if dimensao in consultaDados.COLUNAS_INVERTIDAS:
+                criterios[dimensao] = indice.categorias[dimensao][indice.codigos[dimensao][primeira]]
+            else:
+                criterios[dimensao] = int(getattr(indice, dimensao)[primeira])
+        filtro = consultaDados.Filtro(**criterios)
+        # Fatia (view) de ordem: herdada pelos processos sem cópia
+        especificacoes.append(Especificacao(nome_saida(filtro), filtro, ordem[a:b]))
+    return list(_especificacoes(especificacoes))
+
+
+def _carimbo(vis, filtro, compressao):
+    parametros = visualizadorDados.parametros_dashboard(
+        vis.limite_pontos_mapa, vis.ordem, compressao, vis.janela_media,
+        vis.distancia_evento_km, vis.horas_evento
+    )
+    # Ida e volta pelo JSON, como o carimbo do dashboard
+    return json.loads(json.dumps({'dados': vis.versao_dados, 'parametros': parametros,
+                                  'filtro': texto_filtro(filtro)}))
+
+
+def _ler_manifesto(pasta):
+    try:
+        with open(os.path.join(pasta, MANIFESTO_LOTE), encoding='utf-8') as arquivo:
+            manifesto = json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+    if manifesto.get('versao') != VERSAO_MANIFESTO:
+        return {}
+    return manifesto.get('saidas', {})
+
+
+def _gerar(posicao):
+    """Gera um dashboard do lote (no processo do pool ou no principal)"""
+    vis, especificacoes, pasta, compressao = _LOTE
+    especificacao = especificacoes[posicao]
+    inicio = time.perf_counter()
+    posicoes = especificacao.posicoes
+    if posicoes is None:
+        posicoes = vis.indice.selecionar(especificacao.filtro)
+    if len(posicoes) == 0:
+        return posicao, 0, None, time.perf_counter() - inicio
+
+    # As mensagens de cada figura de centenas de dashboards só atrapalham
+    with contextlib.redirect_stdout(io.StringIO()):
+        visao = vis.visao_posicoes(posicoes, especificacao.filtro)
+        dashboard = visao.criar_dashboard_completo()
+        caminho = os.path.join(pasta, f'{especificacao.nome}.html')
+        arquivos = exportacaoHtml.exportar_html(dashboard, caminho, compressao=compressao)
+    return posicao, len(posicoes), arquivos['bytes_html'], time.perf_counter() - inicio
+
+
+def _pode_bifurcar():
+    import multiprocessing
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def publicar(vis, especificacoes, pasta='visualizacoes', processos=None, compressao=None,
+             forcar=False):
+    """
+    Gera o dashboard de cada especificação em pasta/<nome>.html
+    especificacoes: Especificacao (de particionar) ou filtros (texto, dicionário ou Filtro)
+    processos: tamanho do pool (padrão: os.cpu_count(); 1 gera no próprio processo)
+    forcar: gera também os que o manifesto indica estarem em dia
+    Retorna o manifesto com as saídas (focos, bytes, segundos, filtro)
+    """
+    global _LOTE
+
+    especificacoes = list(_especificacoes(especificacoes))
+    os.makedirs(pasta, exist_ok=True)
+
+    anteriores = _ler_manifesto(pasta)
+    saidas = {}
+    pendentes = []
+    for posicao, especificacao in enumerate(especificacoes):
+        carimbo = _carimbo(vis, especificacao.filtro, compressao)
+        anterior = anteriores.get(especificacao.nome)
+        if (not forcar and anterior and anterior.get('carimbo') == carimbo
+                and os.path.exists(os.path.join(pasta, anterior['arquivo']))):
+            saidas[especificacao.nome] = anterior
+        else:
+            pendentes.append(posicao)
+    print(f"🗂️  {len(especificacoes)} dashboards: {len(pendentes)} a gerar, "
+          f"{len(especificacoes) - len(pendentes)} já em dia")
+
+    # Maiores primeiro: o último processo a terminar não fica com o dashboard mais pesado
+    pendentes.sort(key=lambda p: -(len(especificacoes[p].posicoes)
+                                   if especificacoes[p].posicoes is not None else 0))
+
+    processos = max(1, min(processos or os.cpu_count() or 1, len(pendentes) or 1))
+    inicio = time.perf_counter()
+    if pendentes:
+        # Índice montado antes do fork: cada processo herda o mesmo
+        vis.indice
+        # Um único plotly.js na pasta, gravado antes de os processos o procurarem
+        exportacaoHtml.escrever_plotlyjs(pasta)
+        _LOTE = (vis, especificacoes, pasta, compressao)
+        try:
+            if processos > 1 and _pode_bifurcar():
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor, as_completed
+                # Objetos atuais fora da coleta: o gc dos filhos não toca (e copia) suas páginas
+                gc.freeze()
+                try:
+                    with ProcessPoolExecutor(max_workers=processos,
+                                             mp_context=multiprocessing.get_context('fork')) as pool:
+                        futuros = [pool.submit(_gerar, posicao) for posicao in pendentes]
+                        resultados = (futuro.result() for futuro in as_completed(futuros))
+                        _registrar(resultados, especificacoes, saidas, vis, compressao)
+                finally:
+                    gc.unfreeze()
+            else:
+                processos = 1
+                _registrar(map(_gerar, pendentes), especificacoes, saidas, vis, compressao)
+        finally:
+            _LOTE = None
+    tempo = time.perf_counter() - inicio
+
+    manifesto = {'versao': VERSAO_MANIFESTO,
+                 'saidas': {nome: saidas[nome] for nome in sorted(saidas)}}
+    with open(os.path.join(pasta, MANIFESTO_LOTE), 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=1)
+
+    gerados = sum(1 for p in pendentes if especificacoes[p].nome in saidas)
+    print(f"🎉 {gerados} dashboards gerados em {tempo:.2f} segundos ({processos} processos)")
+    print(f"📂 Pasta: {pasta}")
+    return manifesto
+
+
+def _registrar(resultados, especificacoes, saidas, vis, compressao):
+    """Anota no manifesto cada dashboard gerado, à medida que ficam prontos"""
+    for posicao, focos, tamanho, segundos in resultados:
+        especificacao = especificacoes[posicao]
+        if tamanho is None:
+            print(f"   ⏭️  {especificacao.nome}: sem focos")
+            continue
+        saidas[especificacao.nome] = {
+            'arquivo': f'{especificacao.nome}.html',
+            'filtro': texto_filtro(especificacao.filtro),
+            'focos': focos,
+            'bytes_html': tamanho,
+            'segundos': round(segundos, 3),
+            'carimbo': _carimbo(vis, especificacao.filtro, compressao),
+        }
+        print(f"   ✅ {especificacao.nome}: {focos} focos ({segundos:.2f} s)")
@@ -0,0 +1,180 @@
+"""
+Rankings (top-K) dos focos sem ordenar todos os registros: o resultado é o começo
+de ordenacaoDados.ordenar_indices; no CSV, a memória fica em um bloco mais k registros
+"""
+import sys
+
+import ordenacaoDados
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+K_PADRAO = 10
+
+
+def selecionar_indices(chaves, k):
+    """
+    Posições das k primeiras linhas na ordem de np.lexsort(chaves[::-1]),
+    já nessa ordem, sem ordenar as demais
+    chaves: arrays numéricos de mesmo tamanho, a principal primeiro
+    """
+    n = len(chaves[0]) if chaves else 0
+    restantes = max(0, min(int(k), n))
+    candidatos = np.arange(n)
+    escolhidos = []
+    for chave in chaves:
+        if restantes == 0 or len(candidatos) <= restantes:
+            break
+        valores = chave[candidatos]
+        limiar = np.partition(valores, restantes - 1)[restantes - 1]
+        if valores.dtype.kind == 'f' and np.isnan(limiar):
+            # NaN fica por último, como no np.lexsort
+            iguais = np.isnan(valores)
+            menores = ~iguais
+        else:
+            menores = valores < limiar
+            iguais = valores == limiar
+        escolhidos.append(candidatos[menores])
+        restantes -= len(escolhidos[-1])
+        # O desempate fica para o próximo campo (ou para a posição no arquivo)
+        candidatos = candidatos[iguais]
+    escolhidos.append(candidatos[:restantes])
+
+    selecionados = np.sort(np.concatenate(escolhidos))
+    if not chaves or len(selecionados) < 2:
+        return selecionados
+    return selecionados[np.lexsort([chave[selecionados] for chave in reversed(chaves)])]
+
+
+def primeiros_indices(df, campos, k=K_PADRAO, decrescente=False):
+    """
+    Os k primeiros de ordenacaoDados.ordenar_indices(df, campos, decrescente)
+    df: DataFrame de texto ou registrosDados.TabelaRegistros
+    """
+    chaves = ordenacaoDados.chaves_ordenacao(df, campos, decrescente)
+    if not chaves:
+        return np.arange(min(int(k), len(df)))
+    return selecionar_indices(chaves, k)
+
+
+def _registros(tabela, indices):
+    """DataFrame de texto (o de ordenacaoDados.ler_csv) das linhas escolhidas de uma tabela"""
+    return pd.DataFrame({col: tabela.valores(col, indices) for col in ordenacaoDados.COLUNAS})
+
+
+def primeiros_csv(caminho, campos, k=K_PADRAO, decrescente=False, linhas_por_bloco=None, motor='auto'):
+    """
+    Os k primeiros registros da ordenação do CSV inteiro, lendo em blocos
+    Retorna o DataFrame de texto com esses registros, já em ordem
+    """
+    import registrosDados
+
+    melhores = None
+    for bloco in registrosDados.ler_blocos(caminho, linhas_por_bloco, motor):
+        # Em ordem de arquivo, para que os empates continuem estáveis entre blocos
+        novos = _registros(bloco, np.sort(primeiros_indices(bloco, campos, k, decrescente)))
+        melhores = novos if melhores is None else pd.concat([melhores, novos], ignore_index=True)
+        if len(melhores) > k:
+            escolhidos = np.sort(primeiros_indices(melhores, campos, k, decrescente))
+            melhores = melhores.take(escolhidos).reset_index(drop=True)
+
+    if melhores is None:
+        return pd.DataFrame({col: [] for col in ordenacaoDados.COLUNAS})
+    return melhores.take(ordenacaoDados.ordenar_indices(melhores, campos, decrescente)).reset_index(drop=True)
+
+
+def maiores_contagens(contagens, k=K_PADRAO):
+    """
+    As k maiores contagens de uma Series (valor -> focos), da maior para a
+    menor; empates na ordem do índice
+    """
+    indices = selecionar_indices([-contagens.to_numpy()], k)
+    return contagens.iloc[indices]
+
+
+def _contar_bloco(tabela, coluna):
+    if tabela.codificacoes[coluna] == 'dicionario':
+        valores = tabela.dicionarios[coluna]
+        return pd.Series(np.bincount(tabela.colunas[coluna], minlength=len(valores)),
+                         index=pd.Index(valores, dtype=object))
+    return pd.Series(tabela.valores(coluna)).value_counts(sort=False)
+
+
+def maiores_contagens_csv(caminho, coluna, k=K_PADRAO, linhas_por_bloco=None, motor='auto'):
+    """
+    Os k valores de coluna com mais focos no CSV, lendo em blocos
+    A memória é um bloco mais um contador por valor distinto da coluna
+    """
+    import registrosDados
+
+    if coluna not in ordenacaoDados.COLUNAS:
+        raise ValueError(f"Coluna inválida: {coluna!r} (use {', '.join(ordenacaoDados.COLUNAS)})")
+    total = pd.Series(dtype=np.int64)
+    for bloco in registrosDados.ler_blocos(caminho, linhas_por_bloco, motor):
+        total = total.add(_contar_bloco(bloco, coluna), fill_value=0)
+    # Índice em ordem: empates saem em ordem alfabética
+    total = total.astype(np.int64).sort_index()
+    total.index.name = coluna
+    return maiores_contagens(total.rename('focos'), k)
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description='Top-K dos focos (por campo de ordenação ou por contagem) sem ordenar o arquivo inteiro',
+        epilog='Exemplos: python rankingDados.py focos.csv -c data_pas -d -k 20\n'
+               '          python rankingDados.py focos.csv --contagem municipio -k 15',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('entrada', help='CSV de focos')
+    parser.add_argument('-k', type=int, default=K_PADRAO, help=f'Tamanho do ranking (padrão: {K_PADRAO})')
+    parser.add_argument('--campo', '-c', action='append',
+                        help='Campo de ordenação (nome ou número 1-9); repita para várias chaves')
+    parser.add_argument('--decrescente', '-d', action='store_true', help='Maiores valores primeiro')
+    parser.add_argument('--contagem', default=None, metavar='COLUNA',
+                        help='Ranking dos valores da coluna com mais focos (ex.: municipio)')
+    parser.add_argument('--saida', '-o', default=None,
+                        help='Grava os registros no formato do dados_ordenados.csv')
+
+    args = parser.parse_args(argv)
+    if args.k < 1:
+        parser.error("-k deve ser pelo menos 1")
+    try:
+        campos = ordenacaoDados.resolver_campos(args.campo or [ordenacaoDados.CampoOrdenacao.DATA_PAS])
+    except ValueError as e:
+        parser.error(str(e))
+
+    inicio = time.perf_counter()
+    try:
+        if args.contagem:
+            ranking = maiores_contagens_csv(args.entrada, args.contagem, args.k)
+        else:
+            registros = primeiros_csv(args.entrada, campos, args.k, args.decrescente)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    tempo = time.perf_counter() - inicio
+
+    if args.contagem:
+        print(f"🏆 Top {args.k} de {args.contagem} por número de focos ({tempo:.3f} segundos):")
+        for posicao, (valor, focos) in enumerate(ranking.items(), 1):
+            print(f"   {posicao:>3}. {valor}: {focos}")
+        return 0
+
+    nomes = ', '.join(c.coluna for c in campos)
+    ordem = 'decrescente' if args.decrescente else 'crescente'
+    print(f"🏆 {len(registros)} primeiros por {nomes} ({ordem}) em {tempo:.3f} segundos")
+    if args.saida:
+        ordenacaoDados.escrever_csv_ordenado(args.saida, registros, ordenacaoDados.ler_cabecalho(args.entrada))
+        print(f"Registros salvos em: {args.saida}")
+    else:
+        for trecho in ordenacaoDados.formatar_linhas(registros):
+            sys.stdout.write(trecho)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Registro de figuras/painéis com avaliação preguiçosa e memoização
+
+Cada nó tem um construtor e uma função de chave (a impressão digital dos
+dados e parâmetros de que ele depende). O resultado só é construído quando
+pedido e fica guardado em um cache LRU pela chave; se a chave não mudar,
+o resultado é reaproveitado. Nós independentes podem ser construídos em
+paralelo em um pool de threads.
+
+O mesmo objeto é devolvido a todos que pedem a mesma chave (inclusive entre
+threads): trate-o como somente leitura e copie antes de alterar
+(ex.: go.Figure(fig)).
+"""
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Número máximo de resultados guardados
+MAX_ITENS_PADRAO = 32
+
+
+class RegistroFiguras:
+    def __init__(self, max_itens=MAX_ITENS_PADRAO, max_threads=None):
+        self.max_itens = max_itens
+        self.max_threads = max_threads
+        self._nos = {}
+        self._cache = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.construcoes = 0
+
+    def registrar(self, nome, construtor, chave):
+        """
+        Registra um nó
+        construtor: função sem argumentos que constrói o resultado
+        chave: função sem argumentos que devolve a impressão digital (hashable)
+        """
+        self._nos[nome] = (construtor, chave)
+
+    def __contains__(self, nome):
+        return nome in self._nos
+
+    def _chave(self, nome):
+        _, chave = self._nos[nome]
+        return (nome, chave())
+
+    def _buscar(self, chave):
+        with self._trava:
+            if chave in self._cache:
+                self._cache.move_to_end(chave)
+                self.acertos += 1
+                return True, self._cache[chave]
+        return False, None
+
+    def _guardar(self, chave, valor):
+        with self._trava:
+            self._cache[chave] = valor
+            self._cache.move_to_end(chave)
+            self.construcoes += 1
+            while len(self._cache) > self.max_itens:
+                self._cache.popitem(last=False)
+
+    def obter(self, nome):
+        """Devolve o resultado do nó, construindo apenas se a chave mudou"""
+        chave = self._chave(nome)
+        encontrado, valor = self._buscar(chave)
+        if encontrado:
+            return valor
+        return self._construir(nome, chave)
+
+    def obter_varios(self, nomes):
+        """
+        Devolve {nome: resultado}; os nós que não estão no cache são
+        construídos em paralelo
+        """
+        resultados = {}
+        pendentes = []
+        for nome in nomes:
+            chave = self._chave(nome)
+            encontrado, valor = self._buscar(chave)
+            if encontrado:
+                resultados[nome] = valor
+            else:
+                pendentes.append((nome, chave))
+
+        if len(pendentes) == 1 or self.max_threads == 1:
+            for nome, chave in pendentes:
+                resultados[nome] = self._construir(nome, chave)
+        elif pendentes:
+            with ThreadPoolExecutor(max_workers=self.max_threads or len(pendentes)) as pool:
+                futuros = {nome: pool.submit(self._construir, nome, chave)
+                           for nome, chave in pendentes}
+                for nome, futuro in futuros.items():
+                    resultados[nome] = futuro.result()
+
+        return resultados
+
+    def _construir(self, nome, chave):
+        construtor, _ = self._nos[nome]
+        valor = construtor()
+        self._guardar(chave, valor)
+        return valor
+
+    def limpar(self):
+        with self._trava:
+            self._cache.clear()
+
+
+def figura_memoizada(*parametros):
+    """
+    Decorador para métodos que constroem figuras ou painéis
+    O método passa pelo registro self.figuras; a chave é a versão dos dados
+    (self.chave_figura) mais os atributos listados em parametros
+    Com filtro, a figura é construída (e memoizada) na visão filtrada
+    devolvida por self.visao_filtrada
+    A figura devolvida é compartilhada: somente leitura
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltorio(self, filtro=None):
+            if filtro is not None:
+                visao = self.visao_filtrada(filtro)
+                if visao is not self:
+                    if len(visao.df) == 0:
+                        raise LookupError('Nenhum foco encontrado para o filtro')
+                    return getattr(visao, metodo.__name__)()
+            return self.figuras.obter(metodo.__name__)
+        envoltorio.construtor_figura = metodo
+        envoltorio.parametros_figura = parametros
+        return envoltorio
+    return decorador
+
+
+def registrar_metodos(objeto, registro):
+    """Registra no registro todos os métodos de objeto marcados com figura_memoizada"""
+    for nome in dir(type(objeto)):
+        metodo = getattr(type(objeto), nome)
+        if not hasattr(metodo, 'construtor_figura'):
+            continue
+        registro.registrar(
+            nome,
+            functools.partial(metodo.construtor_figura, objeto),
+            functools.partial(objeto.chave_figura, metodo.parametros_figura)
+        )
@@ -0,0 +1,624 @@
+"""
+Armazém compacto dos registros de focos: um array NumPy por coluna no lugar dos
+structs e strdups do mergeSort.c, escrevendo o mesmo CSV que o C
+"""
+import os
+import sys
+
+import ordenacaoChaves
+import ordenacaoDados
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+COLUNAS = ordenacaoDados.COLUNAS
+COLUNAS_DICIONARIO = ('pais', 'estado', 'municipio', 'bioma')
+
+# Codificação tentada em cada coluna de texto (as demais vão para o dicionário);
+# id_bdq e data_pas ficam em int32 quando todos os valores cabem (datas de 1901 a 2038)
+CODIFICACOES = {'id_bdq': 'digitos', 'foco_id': 'uuid', 'data_pas': 'data'}
+
+# Maior largura de id_bdq que cabe em int64 (a chave é negada na ordem decrescente)
+LARGURA_MAXIMA_INTEIRO = 18
+
+# lat/lon em micrograus (int32) quando o valor volta idêntico ao double lido
+ESCALA_MICROGRAUS = 10 ** 6
+
+# Linhas por bloco na leitura: cada bloco vira colunas compactas assim que chega,
+# então blocos menores só reduzem o pico do texto em trânsito
+LINHAS_POR_BLOCO = 65_536
+
+# Modelo de alocação do glibc: cabeçalho de 8 bytes, blocos de 16, mínimo de 32
+CABECALHO_MALLOC = 8
+BLOCO_MALLOC = 16
+MINIMO_MALLOC = 32
+
+# sizeof(Registro) no mergeSort.c (64 bits): 8 ponteiros e 2 doubles
+BYTES_STRUCT_C = 8 * 8 + 2 * 8
+
+_HEXADECIMAIS = {False: b'0123456789abcdef', True: b'0123456789ABCDEF'}
+
+
+def bytes_malloc(tamanho):
+    """Bytes realmente ocupados por um malloc(tamanho) (pode ser um array)"""
+    bloco = (np.asarray(tamanho) + CABECALHO_MALLOC + BLOCO_MALLOC - 1) // BLOCO_MALLOC * BLOCO_MALLOC
+    return np.maximum(bloco, MINIMO_MALLOC)
+
+
+def menor_inteiro(maximo):
+    """Menor dtype inteiro com sinal que guarda códigos de 0 a maximo"""
+    for tipo in (np.int8, np.int16, np.int32):
+        if maximo <= np.iinfo(tipo).max:
+            return tipo
+    return np.int64
+
+
+def _estreitar(inteiros):
+    """int32 se todos os valores cabem (a conversão é exata); senão o próprio int64"""
+    limites = np.iinfo(np.int32)
+    if len(inteiros) and limites.min <= inteiros.min() and inteiros.max() <= limites.max:
+        return inteiros.astype(np.int32)
+    return inteiros
+
+
+def _para_bytes(serie):
+    """Coluna de texto como array 'S' de largura fixa (UTF-8, sem objetos Python)"""
+    valores = serie.to_numpy(dtype=object)
+    try:
+        return valores.astype('S')
+    except UnicodeEncodeError:
+        return serie.str.encode('utf-8', 'surrogateescape').to_numpy().astype('S')
+
+
+def _escrever_digitos(matriz, inicio, valores, largura):
+    """Escreve valores (inteiros >= 0) em decimal, com zeros à esquerda, nas colunas inicio..inicio+largura"""
+    restante = valores.copy()
+    for posicao in range(inicio + largura - 1, inicio - 1, -1):
+        matriz[:, posicao] = restante % 10 + ord('0')
+        restante //= 10
+
+
+def _matriz_para_bytes(matriz):
+    """Matriz (n, largura) de bytes -> array 'S' de largura fixa"""
+    return np.ascontiguousarray(matriz).view(f'S{matriz.shape[1]}').ravel()
+
+
+def _decodificar(coluna, codificacao, extra):
+    """Texto original ('S') de uma coluna 'digitos', 'uuid' ou 'data'"""
+    if codificacao == 'digitos':
+        matriz = np.empty((len(coluna), extra), dtype=np.uint8)
+        _escrever_digitos(matriz, 0, coluna, extra)
+        return _matriz_para_bytes(matriz)
+    if codificacao == 'uuid':
+        alto, baixo = coluna
+        # Os 16 bytes big-endian do UUID; cada byte vira seu par de dígitos
+        # hexadecimais por uma tabela de 256 pares (uint16)
+        hexadecimais = np.frombuffer(_HEXADECIMAIS[extra], dtype=np.uint8)
+        pares = np.stack([np.repeat(hexadecimais, 16), np.tile(hexadecimais, 16)], axis=1)
+        octetos = np.stack([alto, baixo], axis=1).astype('>u8').view(np.uint8)
+        digitos = pares.view(np.uint16).ravel()[octetos].view(np.uint8)
+        # Grupos 8-4-4-4-12 copiados entre os hífens
+        matriz = np.empty((len(alto), ordenacaoChaves.LARGURA_UUID), dtype=np.uint8)
+        inicio = lido = 0
+        for hifen in ordenacaoChaves.HIFENS_UUID + (ordenacaoChaves.LARGURA_UUID,):
+            matriz[:, inicio:hifen] = digitos[:, lido:lido + hifen - inicio]
+            lido += hifen - inicio
+            if hifen < ordenacaoChaves.LARGURA_UUID:
+                matriz[:, hifen] = ord('-')
+            inicio = hifen + 1
+        return _matriz_para_bytes(matriz)
+    # Campos da data por aritmética, escritos nas posições fixas de 'AAAA-MM-DD HH:MM:SS'
+    dias, segundos = np.divmod(coluna, 86400)
+    datas = dias.astype('datetime64[D]')
+    meses = datas.astype('datetime64[M]')
+    matriz = np.empty((len(coluna), ordenacaoChaves.LARGURA_DATA), dtype=np.uint8)
+    for posicao, separador in ordenacaoChaves.SEPARADORES_DATA.items():
+        matriz[:, posicao] = ord(separador)
+    _escrever_digitos(matriz, 0, meses.astype('datetime64[Y]').view(np.int64) + 1970, 4)
+    _escrever_digitos(matriz, 5, meses.view(np.int64) % 12 + 1, 2)
+    _escrever_digitos(matriz, 8, (datas - meses).view(np.int64) + 1, 2)
+    _escrever_digitos(matriz, 11, segundos // 3600, 2)
+    _escrever_digitos(matriz, 14, segundos // 60 % 60, 2)
+    _escrever_digitos(matriz, 17, segundos % 60, 2)
+    return _matriz_para_bytes(matriz)
+
+
+class TabelaRegistros:
+    def __init__(self, colunas, codificacoes, dicionarios=None, extras=None):
+        """
+        colunas: {nome: array (ou tupla de arrays, no caso do UUID)}
+        codificacoes: {nome: 'digitos', 'uuid', 'data', 'micrograus', 'numero', 'dicionario' ou 'texto'}
+        dicionarios: {nome: lista ordenada de strings} das colunas 'dicionario'
+        extras: largura dos dígitos, caixa do UUID
+        """
+        self.colunas = colunas
+        self.codificacoes = codificacoes
+        self.dicionarios = dicionarios or {}
+        self.extras = extras or {}
+        primeira = colunas[COLUNAS[0]]
+        self.linhas = len(primeira[0] if isinstance(primeira, tuple) else primeira)
+
+    @classmethod
+    def de_partes(cls, partes):
+        """
+        Monta a tabela a partir de partes já separadas por coluna (_partes_dataframe, _partes_arrow):
+        colunas do dicionário como (códigos, valores), números em float64, texto em arrays 'S'
+        """
+        acumuladas = {col: [] for col in COLUNAS}
+        internadas = {col: {} for col in COLUNAS_DICIONARIO}
+        for parte in partes:
+            for col in COLUNAS:
+                if col in internadas:
+                    # Cada valor distinto vira um código global; a parte só guarda códigos
+                    codigos, valores = parte[col]
+                    mapa = internadas[col]
+                    globais = np.array([mapa.setdefault(sys.intern(str(v)), len(mapa)) for v in valores],
+                                       dtype=np.int32)
+                    acumuladas[col].append(globais[codigos] if len(globais) else codigos.astype(np.int32))
+                elif col in ordenacaoDados.COLUNAS_NUMERICAS:
+                    acumuladas[col].append(_codificar_numero(parte[col]))
+                else:
+                    # Codificada já na chegada: o texto do bloco não é guardado
+                    acumuladas[col].append(_codificar_texto(parte[col], CODIFICACOES.get(col)))
+
+        colunas, codificacoes, dicionarios, extras = {}, {}, {}, {}
+        for col in COLUNAS:
+            if col in internadas:
+                codigos = np.concatenate(acumuladas[col]) if acumuladas[col] else np.empty(0, np.int32)
+                colunas[col], dicionarios[col] = _finalizar_dicionario(codigos, internadas[col])
+                codificacoes[col] = 'dicionario'
+            elif col in ordenacaoDados.COLUNAS_NUMERICAS:
+                colunas[col], codificacoes[col] = _juntar_numeros(acumuladas[col])
+            else:
+                colunas[col], codificacoes[col], extras[col] = _juntar_textos(acumuladas[col])
+            acumuladas[col] = None
+        return cls(colunas, codificacoes, dicionarios, extras)
+
+    @classmethod
+    def de_blocos(cls, blocos):
+        """Monta a tabela a partir de blocos de texto (ordenacaoDados.ler_csv_em_blocos)"""
+        return cls.de_partes(_partes_dataframe(bloco) for bloco in blocos)
+
+    @classmethod
+    def de_dataframe(cls, df):
+        """Tabela a partir do DataFrame de texto de ordenacaoDados.ler_csv"""
+        return cls.de_blocos([df])
+
+    def __len__(self):
+        return self.linhas
+
+    @property
+    def columns(self):
+        return list(COLUNAS)
+
+    def __contains__(self, nome):
+        return nome in self.colunas
+
+    def valores(self, nome, indices=None):
+        """
+        Valores da coluna como no CSV (str, ou float para lat/lon), na ordem
+        de indices; só o trecho pedido é decodificado
+        """
+        coluna = self.colunas[nome]
+        codificacao = self.codificacoes[nome]
+        if indices is not None:
+            coluna = tuple(c[indices] for c in coluna) if isinstance(coluna, tuple) else coluna[indices]
+
+        if codificacao == 'dicionario':
+            return np.asarray(self.dicionarios[nome], dtype=object)[coluna]
+        if codificacao == 'micrograus':
+            # Divisão exata: o mesmo double que o atof leu
+            return coluna / ESCALA_MICROGRAUS
+        if codificacao == 'numero':
+            return coluna
+        if codificacao in ('digitos', 'uuid', 'data'):
+            return _decodificar(coluna, codificacao, self.extras[nome]).astype('U')
+        return np.char.decode(coluna, 'utf-8', 'surrogateescape')
+
+    def _texto(self, nome):
+        """Texto original ('S') de uma coluna 'digitos', 'uuid' ou 'data'"""
+        return _decodificar(self.colunas[nome], self.codificacoes[nome], self.extras[nome])
+
+    def __getitem__(self, nome):
+        """
+        pd.Series da coluna com a ordem do comparar_registros: códigos do
+        dicionário como Categorical, datas como datetime64, dígitos como int64
+        """
+        coluna = self.colunas[nome]
+        codificacao = self.codificacoes[nome]
+        if codificacao == 'dicionario':
+            valores = pd.Categorical.from_codes(coluna, categories=self.dicionarios[nome])
+        elif codificacao == 'data':
+            valores = coluna.astype(np.int64, copy=False).view('datetime64[s]')
+        elif codificacao == 'digitos':
+            valores = coluna.astype(np.int64, copy=False)
+        elif codificacao in ('micrograus', 'numero'):
+            valores = self.valores(nome)
+        else:
+            valores = self.valores(nome).astype(object)
+        return pd.Series(valores, name=nome, copy=False)
+
+    def chave_coluna(self, nome):
+        """
+        Chave numérica com a ordem do comparar_registros, sem decodificar o
+        texto (mesmo contrato de ordenacaoDados.chave_coluna)
+        """
+        coluna = self.colunas[nome]
+        codificacao = self.codificacoes[nome]
+        if codificacao == 'numero':
+            return coluna
+        if codificacao == 'uuid':
+            # Posto denso do par (alto, baixo): iguais recebem o mesmo posto
+            alto, baixo = coluna
+            ordem = np.lexsort((baixo, alto))
+            novos = np.ones(len(ordem), dtype=bool)
+            novos[1:] = (alto[ordem][1:] != alto[ordem][:-1]) | (baixo[ordem][1:] != baixo[ordem][:-1])
+            chave = np.empty(len(ordem), dtype=np.int64)
+            chave[ordem] = np.cumsum(novos) - 1
+            return chave
+        if codificacao == 'texto':
+            # Bytes UTF-8 comparados byte a byte: a ordem do strcmp
+            return np.unique(coluna, return_inverse=True)[1].astype(np.int64)
+        # Dígitos, segundos, micrograus e códigos do dicionário ordenado
+        return coluna.astype(np.int64)
+
+    def chaves_uint64(self, nome, decrescente=False):
+        """Chaves de ordenacaoChaves.codificar_coluna direto das colunas guardadas"""
+        coluna = self.colunas[nome]
+        if self.codificacoes[nome] == 'uuid':
+            chaves = list(coluna)
+        elif self.codificacoes[nome] == 'numero':
+            return [ordenacaoChaves.para_uint64(-coluna if decrescente else coluna)]
+        else:
+            chaves = [ordenacaoChaves.para_uint64(self.chave_coluna(nome))]
+        return [~c for c in chaves] if decrescente else chaves
+
+    def formatar_linhas(self, indices=None):
+        """Linhas do CSV ordenado no formato do escrever_csv_ordenado, em trechos"""
+        if indices is None:
+            indices = np.arange(self.linhas)
+        for inicio in range(0, len(indices), ordenacaoDados.LINHAS_POR_ESCRITA):
+            bloco = indices[inicio:inicio + ordenacaoDados.LINHAS_POR_ESCRITA]
+            colunas = [self.valores(col, bloco).tolist() for col in COLUNAS]
+            yield ''.join(ordenacaoDados.FORMATO_LINHA % registro for registro in zip(*colunas))
+
+    def escrever_csv(self, caminho, cabecalho, indices=None):
+        """Escreve o CSV ordenado com o mesmo layout do mergeSort.c"""
+        with open(caminho, 'w', encoding='utf-8', errors='surrogateescape', newline='') as arquivo:
+            arquivo.write(cabecalho)
+            for trecho in self.formatar_linhas(indices):
+                arquivo.write(trecho)
+
+    def para_dataframe(self):
+        """DataFrame com os tipos e as colunas derivadas do visualizador (leituraDados.TIPOS_COLUNAS)"""
+        import leituraDados
+        colunas = {}
+        for col in COLUNAS:
+            tipo = leituraDados.TIPOS_COLUNAS[col]
+            if col == 'data_pas':
+                colunas[col] = self[col].astype('datetime64[ns]')
+            elif tipo == 'category':
+                colunas[col] = self[col]
+            elif col in ordenacaoDados.COLUNAS_NUMERICAS or col == 'id_bdq':
+                colunas[col] = self[col].astype(tipo)
+            elif self.codificacoes[col] == 'uuid' and leituraDados.pyarrow_disponivel():
+                colunas[col] = pd.Series(_objetos_arrow(self._texto(col)), name=col)
+            else:
+                colunas[col] = pd.Series(self.valores(col).astype(object), name=col)
+        return leituraDados.adicionar_colunas_derivadas(pd.DataFrame(colunas))
+
+    def memoria(self):
+        """Bytes ocupados: arrays de cada coluna e strings dos dicionários"""
+        colunas = {}
+        for nome, coluna in self.colunas.items():
+            partes = coluna if isinstance(coluna, tuple) else (coluna,)
+            colunas[nome] = int(sum(parte.nbytes for parte in partes))
+        dicionarios = int(sum(sys.getsizeof(valor) + 8 for valores in self.dicionarios.values()
+                              for valor in valores))
+        total = sum(colunas.values()) + dicionarios
+        return {
+            'bytes': total,
+            'bytes_por_linha': total / self.linhas if self.linhas else 0.0,
+            'colunas': colunas,
+            'dicionarios': dicionarios,
+            'codificacoes': dict(self.codificacoes),
+        }
+
+    def bytes_layout_c(self, bytes_linhas):
+        """
+        Memória do mesmo conteúdo no layout do mergeSort.c: struct Registro,
+        strdup da linha (linha_original) e um strdup por campo de texto
+        bytes_linhas: tamanho de cada linha de dados sem a quebra (ou o total)
+        """
+        total = self.linhas * BYTES_STRUCT_C
+        if np.ndim(bytes_linhas) == 0:
+            media = bytes_linhas / self.linhas if self.linhas else 0
+            total += self.linhas * int(bytes_malloc(int(round(media)) + 1))
+        else:
+            total += int(bytes_malloc(np.asarray(bytes_linhas) + 1).sum())
+        for nome in COLUNAS:
+            if nome in ordenacaoDados.COLUNAS_NUMERICAS:
+                continue
+            if self.codificacoes[nome] == 'dicionario':
+                tamanhos = np.array([len(v.encode('utf-8', 'surrogateescape')) for v in self.dicionarios[nome]],
+                                    dtype=np.int64)
+                total += int(bytes_malloc(tamanhos + 1)[self.colunas[nome]].sum()) if len(tamanhos) else 0
+            elif self.codificacoes[nome] == 'texto':
+                tamanhos = np.char.str_len(self.colunas[nome])
+                total += int(bytes_malloc(tamanhos + 1).sum())
+            else:
+                largura = {'digitos': self.extras.get(nome), 'uuid': ordenacaoChaves.LARGURA_UUID,
+                           'data': ordenacaoChaves.LARGURA_DATA}[self.codificacoes[nome]]
+                total += self.linhas * int(bytes_malloc(largura + 1))
+        return total
+
+
+def _partes_dataframe(bloco):
+    """Partes de um bloco de texto de ordenacaoDados.ler_csv"""
+    parte = {}
+    for col in COLUNAS:
+        if col in COLUNAS_DICIONARIO:
+            codigos, valores = pd.factorize(bloco[col])
+            parte[col] = (codigos, list(valores))
+        elif col in ordenacaoDados.COLUNAS_NUMERICAS:
+            parte[col] = bloco[col].to_numpy(dtype=np.float64)
+        else:
+            parte[col] = _para_bytes(bloco[col])
+    return parte
+
+
+def _objetos_arrow(textos):
+    """
+    Array 'S' ASCII de largura cheia (sem \\0 de preenchimento) como array
+    de str Python, convertido pelo Arrow: bem mais rápido que astype(object)
+    """
+    import pyarrow as pa
+    binario = pa.FixedSizeBinaryArray.from_buffers(pa.binary(textos.dtype.itemsize), len(textos),
+                                                   [None, pa.py_buffer(textos)])
+    return binario.cast(pa.string()).to_numpy(zero_copy_only=False)
+
+
+def _bytes_arrow(coluna):
+    """Array de strings do Arrow como array 'S' (sem passar por objetos Python)"""
+    n = len(coluna)
+    _, buffer_posicoes, buffer_dados = coluna.buffers()
+    posicoes = np.frombuffer(buffer_posicoes, dtype=np.int32)[coluna.offset:coluna.offset + n + 1]
+    dados = np.frombuffer(buffer_dados, dtype=np.uint8) if buffer_dados is not None else np.empty(0, np.uint8)
+    tamanhos = np.diff(posicoes)
+    largura = max(int(tamanhos.max()) if n else 0, 1)
+    if n and (tamanhos == largura).all():
+        # Todos com a mesma largura (UUID, data, id): o buffer já é o array 'S'
+        return dados[posicoes[0]:posicoes[-1]].copy().view(f'S{largura}')
+    # Larguras diferentes: cada valor copiado para sua linha da matriz, completada com \0
+    matriz = np.zeros((n, largura), dtype=np.uint8)
+    linhas = np.repeat(np.arange(n), tamanhos)
+    colunas = np.arange(len(linhas)) - np.repeat(posicoes[:-1] - posicoes[0], tamanhos)
+    matriz[linhas, colunas] = dados[posicoes[0]:posicoes[-1]]
+    return matriz.view(f'S{largura}').ravel()
+
+
+def _partes_arrow(caminho, linhas_por_bloco):
+    """
+    Partes lidas com pyarrow: texto aparado e convertido direto dos buffers
+    do Arrow, colunas repetidas codificadas em dicionário na leitura
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as csv
+
+    import leituraDados
+
+    tipos = {col: (pa.float64() if col in ordenacaoDados.COLUNAS_NUMERICAS else pa.string())
+             for col in COLUNAS}
+    tamanho = max(1 << 20, linhas_por_bloco * leituraDados.BYTES_POR_LINHA)
+    # Um lote por trecho; o open_csv leria o arquivo à frente de quem consome
+    opcoes_leitura = csv.ReadOptions(column_names=COLUNAS, use_threads=False, block_size=2 * tamanho)
+    opcoes_conversao = csv.ConvertOptions(column_types=tipos, strings_can_be_null=False)
+    for lote in _lotes_arrow(caminho, tamanho, opcoes_leitura, opcoes_conversao):
+        if lote.num_rows:
+            parte = {}
+            for col in COLUNAS:
+                coluna = lote.column(col)
+                if col in ordenacaoDados.COLUNAS_NUMERICAS:
+                    parte[col] = coluna.to_numpy(zero_copy_only=False)
+                    continue
+                # Mesmo trim do C (e do _limpar de ordenacaoDados)
+                coluna = pc.utf8_trim_whitespace(coluna)
+                if col in COLUNAS_DICIONARIO:
+                    codificada = pc.dictionary_encode(coluna)
+                    parte[col] = (codificada.indices.to_numpy(zero_copy_only=False),
+                                  codificada.dictionary.to_pylist())
+                else:
+                    parte[col] = _bytes_arrow(coluna)
+            yield parte
+
+
+def _lotes_arrow(caminho, tamanho, opcoes_leitura, opcoes_conversao):
+    """Lotes do CSV (sem o cabeçalho) lidos em trechos de ~tamanho bytes terminados em linha completa"""
+    import pyarrow as pa
+    import pyarrow.csv as csv
+
+    with open(caminho, 'rb') as arquivo:
+        arquivo.readline()
+        while True:
+            trecho = arquivo.read(tamanho)
+            if not trecho:
+                break
+            trecho += arquivo.readline()
+            tabela = csv.read_csv(pa.py_buffer(trecho), read_options=opcoes_leitura,
+                                  convert_options=opcoes_conversao)
+            del trecho
+            yield from tabela.to_batches()
+
+
+def _finalizar_dicionario(codigos, mapa):
+    """Ordena o dicionário (ordem do strcmp) e reduz os códigos ao menor inteiro"""
+    valores = list(mapa)
+    # Ordem de code point, a mesma do chave_coluna e das categorias do pandas
+    ordem = sorted(range(len(valores)), key=valores.__getitem__)
+    posicao = np.empty(len(valores), dtype=np.int64)
+    posicao[ordem] = np.arange(len(valores))
+    tipo = menor_inteiro(max(len(valores) - 1, 0))
+    return posicao[codigos].astype(tipo) if len(valores) else codigos.astype(tipo), [valores[i] for i in ordem]
+
+
+def _codificar_numero(valores):
+    """(array, codificação): micrograus em int32 quando o double volta idêntico; senão float64"""
+    valores = np.asarray(valores, dtype=np.float64)
+    micrograus = np.rint(valores * ESCALA_MICROGRAUS)
+    limite = np.iinfo(np.int32).max
+    if (np.isfinite(micrograus).all() and (np.abs(micrograus) <= limite).all()
+            and (micrograus / ESCALA_MICROGRAUS == valores).all()):
+        return micrograus.astype(np.int32), 'micrograus'
+    return valores, 'numero'
+
+
+def _juntar_numeros(partes):
+    if partes and all(codificacao == 'micrograus' for _, codificacao in partes):
+        return np.concatenate([valores for valores, _ in partes]), 'micrograus'
+    numeros = [valores / ESCALA_MICROGRAUS if codificacao == 'micrograus' else valores
+               for valores, codificacao in partes]
+    return (np.concatenate(numeros) if numeros else np.empty(0, np.float64)), 'numero'
+
+
+def _codificar_texto(valores, codificacao):
+    """(coluna, codificação, extra) no formato compacto, se todos os valores servirem"""
+    valores = np.asarray(valores).astype('S', copy=False)
+    if codificacao == 'digitos' and valores.dtype.itemsize <= LARGURA_MAXIMA_INTEIRO:
+        inteiros = ordenacaoChaves.codificar_digitos(valores)
+        if inteiros is not None:
+            return _estreitar(inteiros.astype(np.int64)), 'digitos', valores.dtype.itemsize
+    elif codificacao == 'uuid':
+        partes = ordenacaoChaves.codificar_uuid(valores)
+        if partes is not None:
+            matriz = valores.view(np.uint8)
+            maiusculas = bool(((matriz >= ord('A')) & (matriz <= ord('F'))).any())
+            return partes, 'uuid', maiusculas
+    elif codificacao == 'data':
+        segundos = ordenacaoChaves.codificar_data_pas(valores)
+        if segundos is not None:
+            return _estreitar(segundos), 'data', None
+    return valores, 'texto', None
+
+
+def _juntar_textos(partes):
+    """
+    Junta as partes de uma coluna de texto; se elas não têm todas a mesma
+    codificação (um valor fora do formato, outra largura de id, outra caixa
+    de UUID), a coluna inteira volta a ser texto
+    """
+    formatos = {(codificacao, extra) for _, codificacao, extra in partes}
+    if len(formatos) == 1:
+        codificacao, extra = formatos.pop()
+        if codificacao == 'uuid':
+            return tuple(np.concatenate(metades) for metades in zip(*(c for c, _, _ in partes))), codificacao, extra
+        if codificacao != 'texto':
+            # Partes int32 e int64 juntas voltam a int64
+            return np.concatenate([c for c, _, _ in partes]), codificacao, extra
+    textos = [coluna if codificacao == 'texto' else _decodificar(coluna, codificacao, extra)
+              for coluna, codificacao, extra in partes]
+    return (np.concatenate(textos) if textos else np.empty(0, 'S1')), 'texto', None
+
+
+def _partes(caminho, linhas_por_bloco, motor):
+    import leituraDados
+    if motor not in leituraDados.MOTORES_BLOCOS:
+        raise ValueError(f"Motor inválido: {motor!r} (use {', '.join(leituraDados.MOTORES_BLOCOS)})")
+    if motor == 'auto':
+        motor = 'pyarrow' if leituraDados.pyarrow_disponivel() else 'pandas'
+    linhas_por_bloco = linhas_por_bloco or LINHAS_POR_BLOCO
+    if motor == 'pyarrow':
+        return _partes_arrow(caminho, linhas_por_bloco)
+    return (_partes_dataframe(bloco) for bloco in ordenacaoDados.ler_csv_em_blocos(caminho, linhas_por_bloco))
+
+
+def ler_registros(caminho, linhas_por_bloco=None, motor='auto'):
+    """
+    Lê o CSV em blocos direto para a tabela (o texto nunca fica inteiro na memória)
+    motor: 'pyarrow', 'pandas' ou 'auto' (pyarrow quando instalado), como em leituraDados
+    """
+    return TabelaRegistros.de_partes(_partes(caminho, linhas_por_bloco, motor))
+
+
+def ler_blocos(caminho, linhas_por_bloco=None, motor='auto'):
+    """Uma tabela por bloco do CSV, para varreduras que não guardam o arquivo inteiro"""
+    for parte in _partes(caminho, linhas_por_bloco, motor):
+        yield TabelaRegistros.de_partes([parte])
+
+
+def comparar_layouts(caminho, linhas_por_bloco=None):
+    """
+    Bytes por linha do mesmo CSV em cada layout: mergeSort.c (estimado),
+    DataFrame de texto da ordenação, DataFrame do visualizador e esta tabela
+    """
+    import leituraDados
+    tabela = ler_registros(caminho, linhas_por_bloco)
+    linhas = max(len(tabela), 1)
+    cabecalho = len(ordenacaoDados.ler_cabecalho(caminho).encode('utf-8', 'surrogateescape'))
+    # Sem o cabeçalho e sem as quebras de linha (o C troca '\n' por '\0')
+    bytes_dados = os.path.getsize(caminho) - cabecalho - len(tabela)
+
+    _, texto = ordenacaoDados.ler_csv(caminho)
+    bytes_texto = int(texto.memory_usage(index=False, deep=True).sum())
+    del texto
+    visualizador = leituraDados.carregar_csv(caminho)
+    bytes_visualizador = int(visualizador.memory_usage(index=False, deep=True).sum())
+    del visualizador
+
+    bytes_layouts = {
+        'mergesort_c': tabela.bytes_layout_c(bytes_dados),
+        'dataframe_texto': bytes_texto,
+        'dataframe_visualizador': bytes_visualizador,
+        'registros': tabela.memoria()['bytes'],
+    }
+    return {
+        'linhas': len(tabela),
+        'layouts': {
+            nome: {
+                'bytes': total,
+                'bytes_por_linha': total / linhas,
+                'linhas_por_gb': int(2 ** 30 / (total / linhas)) if total else None,
+            }
+            for nome, total in bytes_layouts.items()
+        },
+        'codificacoes': tabela.memoria()['codificacoes'],
+    }
+
+
+def main(argv=None):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(
+        description='Memória por linha dos focos em cada layout (mergeSort.c, DataFrames e tabela compacta)',
+        epilog='Exemplo: python registrosDados.py output/focos_br_sc_ref_2024.csv'
+    )
+    parser.add_argument('arquivo', help='CSV de focos')
+    parser.add_argument('--json', action='store_true', help='Imprime o relatório em JSON')
+
+    args = parser.parse_args(argv)
+
+    try:
+        relatorio = comparar_layouts(args.arquivo)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(relatorio, indent=2, ensure_ascii=False))
+        return 0
+
+    layouts = relatorio['layouts']
+    compacto = layouts['registros']['bytes_por_linha']
+    print(f"{relatorio['linhas']} registros")
+    for nome, medida in layouts.items():
+        vezes = medida['bytes_por_linha'] / compacto if compacto else 0
+        print(f"   {nome:<24} {medida['bytes_por_linha']:8.1f} bytes/linha  "
+              f"{medida['linhas_por_gb']:>13,} linhas/GB  ({vezes:.1f}x a tabela)")
+    print("Codificações: " + ', '.join(f'{k}={v}' for k, v in relatorio['codificacoes'].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,426 @@
+"""
+Servidor local do dashboard com recarga automática
+
+Figuras servidas em JSON com ETag (304 se nada mudou); o CSV é observado
+e as linhas novas incorporadas.
+
+Rotas:
+    /                  página do dashboard
+    /plotly.min.js     plotly.js embutido no pacote plotly
+    /estado            versão dos dados, total de focos, biomas e municípios
+    /figura/<nome>     figura em JSON; aceita os critérios de consultaDados.Filtro
+                       (?inicio=&fim=&bioma=&municipio=&mes=&hora=&bbox=&raio=)
+    /metricas          tempo, CPU e memória das etapas no formato do Prometheus
+                       (só com instrumentação, --metricas)
+"""
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import plotly.offline
+
+import consultaDados
+import espacialDados
+import eventosDados
+import exportacaoHtml
+import instrumentacaoDados
+import leituraDados
+import temporalDados
+
+# Nome usado na URL -> método do VisualizadorFocosPlotly
+FIGURAS = {
+    'dashboard': 'criar_dashboard_completo',
+    'mapa': 'criar_mapa_interativo',
+    'densidade': 'criar_mapa_densidade',
+    'serie': 'criar_serie_temporal',
+    'municipios': 'criar_top_municipios',
+    'temporal': 'criar_analise_temporal_completa',
+    'bioma': 'criar_analise_bioma',
+    'eventos': 'criar_eventos_fogo',
+}
+
+PARAMETROS_FILTRO = consultaDados.Filtro.CAMPOS
+
+# Segundos entre verificações do CSV
+INTERVALO_PADRAO = 2.0
+
+# Respostas serializadas mantidas em memória
+MAX_RESPOSTAS = 64
+
+# Respostas menores que isso não são comprimidas
+TAMANHO_MINIMO_GZIP = 1024
+
+PAGINA = """<!DOCTYPE html>
+<html lang="pt-br">
+<head>
+<meta charset="utf-8">
+<title>Focos de Calor</title>
+<script src="/plotly.min.js"></script>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 0; background: #F5F5F5; }}
+form {{ padding: 8px 12px; background: #2C3E50; color: white; }}
+form * {{ margin-right: 6px; }}
+#estado {{ float: right; }}
+#figura {{ height: calc(100vh - 48px); }}
+</style>
+</head>
+<body>
+<form id="filtro">
+  <select name="figura">{opcoes}</select>
+  Início <input type="date" name="inicio">
+  Fim <input type="date" name="fim">
+  <select name="bioma"><option value="">Todos os biomas</option></select>
+  <input name="municipio" list="municipios" placeholder="Município">
+  <datalist id="municipios"></datalist>
+  <input name="mes" size="5" placeholder="Mês">
+  <input name="hora" size="5" placeholder="Hora">
+  <input name="bbox" size="18" placeholder="lon,lat,lon,lat">
+  <input name="raio" size="14" placeholder="lat,lon,km">
+  <button>Filtrar</button>
+  <span id="estado"></span>
+</form>
+<div id="figura"></div>
+<script>
+const form = document.getElementById('filtro');
+let versao = null;
+
+function consulta() {{
+  const p = new URLSearchParams();
+  for (const nome of {parametros}) {{
+    const v = form.elements[nome].value.trim();
+    if (v) p.set(nome, v);
+  }}
+  return p.toString();
+}}
+
+async function desenhar() {{
+  const inicio = performance.now();
+  const r = await fetch('/figura/' + form.elements.figura.value + '?' + consulta());
+  const corpo = await r.json();
+  if (!r.ok) {{
+    Plotly.purge('figura');
+    document.getElementById('figura').textContent = corpo.erro;
+    return;
+  }}
+  await Plotly.react('figura', corpo.data, corpo.layout, {{responsive: true}});
+  document.getElementById('estado').textContent =
+    Math.round(performance.now() - inicio) + ' ms';
+}}
+
+async function verificar() {{
+  const r = await fetch('/estado');
+  const estado = await r.json();
+  if (versao === null) {{
+    const bioma = form.elements.bioma;
+    for (const b of estado.biomas) bioma.add(new Option(b, b));
+    const lista = document.getElementById('municipios');
+    for (const m of estado.municipios) lista.appendChild(new Option(m));
+  }}
+  if (estado.versao !== versao) {{
+    versao = estado.versao;
+    await desenhar();
+  }}
+}}
+
+form.addEventListener('submit', e => {{ e.preventDefault(); desenhar(); }});
+form.elements.figura.addEventListener('change', desenhar);
+verificar();
+setInterval(verificar, {intervalo_ms});
+</script>
+</body>
+</html>
+"""
+
+
+def _resumo(*partes):
+    return hashlib.blake2b(repr(partes).encode('utf-8'), digest_size=12).hexdigest()
+
+
+def ler_filtro(consulta):
+    """
+    Converte a query string em consultaDados.Filtro
+    Lança ValueError para critérios inválidos
+    """
+    valores = parse_qs(consulta, keep_blank_values=False)
+    return consultaDados.Filtro.de_parametros({nome: lista[-1] for nome, lista in valores.items()})
+
+
+class ServidorFocos:
+    def __init__(self, visualizador, intervalo=INTERVALO_PADRAO, max_respostas=MAX_RESPOSTAS):
+        self.visualizador = visualizador
+        self.intervalo = intervalo
+        self.max_respostas = max_respostas
+        # Uma figura por vez: pandas/plotly e o registro de figuras
+        # são compartilhados entre as threads do servidor
+        self.trava = threading.RLock()
+        self._respostas = OrderedDict()
+        self._parar = threading.Event()
+        self._observador = None
+        self._plotlyjs = None
+
+    def versao(self):
+        return _resumo(self.visualizador.versao_dados)
+
+    def etag(self, nome, filtro):
+        """
+        ETag da figura: muda com os dados, o filtro, o limite de pontos do mapa,
+        a janela da média e os limites dos eventos de fogo
+        """
+        return '"' + _resumo(self.visualizador.versao_dados, nome, filtro.chave(),
+                             self.visualizador.limite_pontos_mapa, self.visualizador.janela_media,
+                             self.visualizador.distancia_evento_km, self.visualizador.horas_evento) + '"'
+
+    def estado(self):
+        with self.trava:
+            df = self.visualizador.df
+            return {
+                'versao': self.versao(),
+                'registros': len(df),
+                'inicio': str(df['data_pas'].min()) if len(df) else None,
+                'fim': str(df['data_pas'].max()) if len(df) else None,
+                'biomas': sorted(map(str, df['bioma'].cat.categories)),
+                'municipios': sorted(map(str, df['municipio'].cat.categories)),
+            }
+
+    def figura(self, nome, filtro):
+        """
+        Retorna (etag, corpo JSON em bytes, corpo gzip ou None)
+        Lança KeyError para figura desconhecida e LookupError se o filtro
+        não encontrar focos
+        """
+        metodo = FIGURAS[nome]
+        with self.trava:
+            etag = self.etag(nome, filtro)
+            if etag in self._respostas:
+                self._respostas.move_to_end(etag)
+                return (etag,) + self._respostas[etag]
+
+            fig = getattr(self.visualizador, metodo)(filtro)
+            corpo = exportacaoHtml.figura_json(fig).encode('utf-8')
+            comprimido = None
+            if len(corpo) >= TAMANHO_MINIMO_GZIP:
+                comprimido = gzip.compress(corpo, compresslevel=5, mtime=0)
+
+            self._respostas[etag] = (corpo, comprimido)
+            while len(self._respostas) > self.max_respostas:
+                self._respostas.popitem(last=False)
+            return etag, corpo, comprimido
+
+    def plotlyjs(self):
+        if self._plotlyjs is None:
+            self._plotlyjs = plotly.offline.get_plotlyjs().encode('utf-8')
+        return self._plotlyjs
+
+    def pagina(self):
+        opcoes = ''.join(f'<option value="{nome}">{nome}</option>' for nome in FIGURAS)
+        return PAGINA.format(
+            opcoes=opcoes,
+            parametros=json.dumps(list(PARAMETROS_FILTRO)),
+            intervalo_ms=int(self.intervalo * 1000),
+        ).encode('utf-8')
+
+    def verificar_arquivo(self):
+        """Incorpora mudanças do CSV; retorna o modo usado ou None"""
+        with self.trava:
+            modo = self.visualizador.recarregar_se_mudou()
+            if modo:
+                self._respostas.clear()
+        return modo
+
+    def _observar(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                modo = self.verificar_arquivo()
+                if modo:
+                    print(f"🔄 {self.visualizador.arquivo_csv} mudou ({modo}): "
+                          f"{len(self.visualizador.df)} registros")
+            except Exception as e:
+                # Arquivo sendo regravado: tenta de novo na próxima volta
+                print(f"⚠️  Erro ao recarregar os dados: {e}")
+
+    def iniciar_observador(self):
+        if self.intervalo and self._observador is None:
+            self._observador = threading.Thread(target=self._observar, daemon=True)
+            self._observador.start()
+
+    def parar(self):
+        self._parar.set()
+
+
+class ManipuladorFocos(BaseHTTPRequestHandler):
+    server_version = 'FocosDashboard/1.0'
+
+    @property
+    def focos(self):
+        return self.server.focos
+
+    def log_message(self, formato, *args):
+        if self.server.verboso:
+            super().log_message(formato, *args)
+
+    def _enviar(self, status, corpo=b'', tipo='application/json', cabecalhos=None):
+        self.send_response(status)
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Type', tipo)
+            self.send_header('Content-Length', str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        if status != HTTPStatus.NOT_MODIFIED and self.command != 'HEAD':
+            self.wfile.write(corpo)
+
+    def _erro(self, status, mensagem):
+        self._enviar(status, json.dumps({'erro': mensagem}).encode('utf-8'))
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path in ('/', '/index.html'):
+            self._enviar(HTTPStatus.OK, self.focos.pagina(), 'text/html; charset=utf-8')
+        elif url.path == '/plotly.min.js':
+            self._enviar(HTTPStatus.OK, self.focos.plotlyjs(), 'application/javascript',
+                         {'Cache-Control': 'public, max-age=86400'})
+        elif url.path == '/estado':
+            self._enviar(HTTPStatus.OK, json.dumps(self.focos.estado()).encode('utf-8'),
+                         cabecalhos={'Cache-Control': 'no-store'})
+        elif url.path.startswith('/figura/'):
+            self._figura(url.path[len('/figura/'):], url.query)
+        elif url.path == '/metricas':
+            self._metricas()
+        else:
+            self._erro(HTTPStatus.NOT_FOUND, f'Rota desconhecida: {url.path}')
+
+    def _metricas(self):
+        instrumentacao = self.focos.visualizador.instrumentacao
+        if instrumentacao is None:
+            self._erro(HTTPStatus.NOT_FOUND, 'Instrumentação desligada (use --metricas)')
+            return
+        self._enviar(HTTPStatus.OK, instrumentacao.para_prometheus().encode('utf-8'),
+                     'text/plain; version=0.0.4; charset=utf-8', {'Cache-Control': 'no-store'})
+
+    def _figura(self, nome, consulta):
+        if nome not in FIGURAS:
+            self._erro(HTTPStatus.NOT_FOUND, f"Figura desconhecida: {nome} (use {', '.join(FIGURAS)})")
+            return
+        try:
+            filtro = ler_filtro(consulta)
+        except ValueError as e:
+            self._erro(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        # Revalidação sem tocar nos dados: o ETag só depende da versão e do pedido
+        etag = self.focos.etag(nome, filtro)
+        cabecalhos = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag in (t.strip() for t in self.headers.get('If-None-Match', '').split(',')):
+            self._enviar(HTTPStatus.NOT_MODIFIED, cabecalhos=cabecalhos)
+            return
+
+        inicio = time.perf_counter()
+        try:
+            etag, corpo, comprimido = self.focos.figura(nome, filtro)
+        except LookupError as e:
+            self._erro(HTTPStatus.NOT_FOUND, str(e))
+            return
+        cabecalhos['ETag'] = etag
+        cabecalhos['Server-Timing'] = f'figura;dur={(time.perf_counter() - inicio) * 1000:.1f}'
+        cabecalhos['Vary'] = 'Accept-Encoding'
+        if comprimido is not None and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            cabecalhos['Content-Encoding'] = 'gzip'
+            corpo = comprimido
+        self._enviar(HTTPStatus.OK, corpo, cabecalhos=cabecalhos)
+
+
+def criar_servidor(visualizador, host='127.0.0.1', porta=8050, intervalo=INTERVALO_PADRAO,
+                   verboso=False):
+    """Cria o servidor HTTP (ainda sem atender) com o observador do CSV ligado"""
+    focos = ServidorFocos(visualizador, intervalo)
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorFocos)
+    servidor.daemon_threads = True
+    servidor.focos = focos
+    servidor.verboso = verboso
+    focos.iniciar_observador()
+    return servidor
+
+
+def servir(visualizador, host='127.0.0.1', porta=8050, intervalo=INTERVALO_PADRAO,
+           verboso=False, abrir_navegador=False):
+    """Atende até Ctrl+C"""
+    servidor = criar_servidor(visualizador, host, porta, intervalo, verboso)
+    endereco = f"http://{host}:{servidor.server_address[1]}/"
+    print(f"🌐 Dashboard em {endereco} (Ctrl+C para sair)")
+    if abrir_navegador:
+        import webbrowser
+        webbrowser.open(endereco)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando servidor...")
+    finally:
+        servidor.focos.parar()
+        servidor.server_close()
+
+
+def main(argv=None):
+    import argparse
+
+    from visualizadorDados import VisualizadorFocosPlotly
+
+    parser = argparse.ArgumentParser(
+        description='Servidor local do dashboard de focos de calor',
+        epilog='Exemplo: python servidorDados.py output/dados_ordenados.csv --porta 8050'
+    )
+    parser.add_argument('arquivo', nargs='?', default=None,
+                        help='Caminho para o arquivo CSV ordenado')
+    parser.add_argument('--host', default='127.0.0.1', help='Endereço (padrão: 127.0.0.1)')
+    parser.add_argument('--porta', type=int, default=8050, help='Porta (padrão: 8050)')
+    parser.add_argument('--intervalo', type=float, default=INTERVALO_PADRAO,
+                        help=f'Segundos entre verificações do CSV; 0 desliga (padrão: {INTERVALO_PADRAO})')
+    parser.add_argument('--sem-cache', action='store_true', help='Ignora o cache em disco e relê o CSV')
+    parser.add_argument('--pasta-cache', default=None,
+                        help='Pasta do cache (padrão: .cache_focos ao lado do CSV)')
+    parser.add_argument('--linhas-por-bloco', type=int, default=leituraDados.LINHAS_POR_BLOCO,
+                        help=f'Linhas lidas por bloco do CSV (padrão: {leituraDados.LINHAS_POR_BLOCO})')
+    parser.add_argument('--limite-pontos-mapa', type=int, default=espacialDados.LIMITE_PONTOS_MAPA,
+                        help=f'Acima deste número de focos os mapas usam células agregadas '
+                             f'(padrão: {espacialDados.LIMITE_PONTOS_MAPA})')
+    parser.add_argument('--janela', type=int, default=temporalDados.JANELA_PADRAO,
+                        help=f'Dias da média móvel das séries temporais (padrão: {temporalDados.JANELA_PADRAO})')
+    parser.add_argument('--evento-km', type=float, default=eventosDados.DISTANCIA_PADRAO_KM,
+                        help=f'Distância máxima entre focos do mesmo evento de fogo '
+                             f'(padrão: {eventosDados.DISTANCIA_PADRAO_KM})')
+    parser.add_argument('--evento-horas', type=float, default=eventosDados.HORAS_PADRAO,
+                        help=f'Intervalo máximo entre focos do mesmo evento de fogo '
+                             f'(padrão: {eventosDados.HORAS_PADRAO})')
+    parser.add_argument('--metricas', action='store_true',
+                        help='Mede as etapas e publica as métricas em /metricas')
+    parser.add_argument('--abrir', action='store_true', help='Abre o dashboard no navegador')
+    parser.add_argument('--verboso', '-v', action='store_true', help='Mostra cada requisição')
+
+    args = parser.parse_args(argv)
+
+    visualizador = VisualizadorFocosPlotly(
+        args.arquivo,
+        usar_cache=not args.sem_cache,
+        pasta_cache=args.pasta_cache,
+        linhas_por_bloco=args.linhas_por_bloco,
+        limite_pontos_mapa=args.limite_pontos_mapa,
+        janela_media=args.janela,
+        distancia_evento_km=args.evento_km,
+        horas_evento=args.evento_horas,
+        instrumentacao=instrumentacaoDados.Instrumentacao() if args.metricas else None
+    )
+    servir(visualizador, args.host, args.porta, args.intervalo, args.verboso, args.abrir)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
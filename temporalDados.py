@@ -0,0 +1,196 @@
+"""
+Séries temporais dos focos em um calendário contínuo
+
+data_pas é convertida em baldes inteiros (dias ou horas desde 1970) e
+contada com um único np.bincount, já separada por grupo (bioma). O
+calendário vai do primeiro ao último balde sem buracos: dias sem focos
+entram com zero, então a média móvel de 7 dias cobre sempre 7 dias de
+calendário, e não 7 dias com focos.
+
+Todas as séries (total e uma por grupo) ficam em uma matriz; somas e
+médias móveis saem de uma soma acumulada sobre a matriz inteira, com
+a janela que se quiser, sem laços em Python.
+"""
+import sys
+
+from importacaoTardia import modulo_tardio
+
+np = modulo_tardio('numpy')
+pd = modulo_tardio('pandas')
+
+UNIDADES = ('D', 'h')
+
+JANELA_PADRAO = 7
+
+MESES = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun',
+         'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
+
+
+def baldes_tempo(datas, unidade='D'):
+    """
+    Baldes int64 (dias ou horas desde 1970) de uma coluna de datas
+    Datas inválidas (NaT) ficam com -1 em validos
+    Retorna (baldes, validos)
+    """
+    if unidade not in UNIDADES:
+        raise ValueError(f"Unidade inválida: {unidade!r} (use {', '.join(UNIDADES)})")
+    valores = pd.to_datetime(pd.Series(datas, copy=False)).to_numpy()
+    validos = ~np.isnat(valores)
+    # astype para uma unidade maior arredonda para baixo (inclusive antes de 1970)
+    baldes = valores.astype(f'datetime64[{unidade}]').view(np.int64)
+    return baldes, validos
+
+
+class SerieTemporal:
+    def __init__(self, baldes, grupos=None, nomes_grupos=(), pesos=None, unidade='D'):
+        """
+        baldes: int64 por foco (baldes_tempo)
+        grupos: código do grupo por foco (-1 = sem grupo, entra só no total)
+        nomes_grupos: nome de cada código, na ordem em que as séries aparecem
+        pesos: focos representados por linha (padrão: 1)
+        """
+        if unidade not in UNIDADES:
+            raise ValueError(f"Unidade inválida: {unidade!r} (use {', '.join(UNIDADES)})")
+        self.unidade = unidade
+        self.grupos = list(nomes_grupos)
+        baldes = np.asarray(baldes, dtype=np.int64)
+        if len(baldes) == 0:
+            self.inicio = 0
+            self.contagens = np.zeros((1 + len(self.grupos), 0), dtype=np.int64)
+            return
+
+        self.inicio = int(baldes.min())
+        tamanho = int(baldes.max()) - self.inicio + 1
+        # Linha 0: focos sem grupo; linha g + 1: grupo g
+        linha = np.zeros(len(baldes), dtype=np.int64) if grupos is None else np.asarray(grupos, dtype=np.int64) + 1
+        posicao = linha * tamanho + (baldes - self.inicio)
+        contagens = np.bincount(posicao, weights=pesos, minlength=(1 + len(self.grupos)) * tamanho)
+        contagens = contagens.reshape(1 + len(self.grupos), tamanho)
+        if pesos is None or np.issubdtype(np.asarray(pesos).dtype, np.integer):
+            contagens = contagens.astype(np.int64)
+        # Linha 0 vira o total
+        contagens[0] += contagens[1:].sum(axis=0)
+        self.contagens = contagens
+
+    @classmethod
+    def de_focos(cls, df, coluna_data='data_pas', coluna_grupo='bioma', unidade='D'):
+        """Série de um DataFrame de focos, com um grupo por valor de coluna_grupo (ordem de aparição)"""
+        baldes, validos = baldes_tempo(df[coluna_data], unidade)
+        if coluna_grupo is None:
+            return cls(baldes[validos], unidade=unidade)
+        # factorize: códigos na ordem de aparição, como pd.unique; NaN vira -1
+        codigos, nomes = pd.factorize(df[coluna_grupo], sort=False)
+        return cls(baldes[validos], codigos[validos], list(nomes), unidade=unidade)
+
+    def __len__(self):
+        return self.contagens.shape[1]
+
+    @property
+    def total(self):
+        """Focos por balde, com zeros nos baldes sem focos"""
+        return self.contagens[0]
+
+    def eixo(self):
+        """Datas (datetime64) de cada balde do calendário"""
+        return (np.arange(len(self), dtype=np.int64) + self.inicio).astype(f'datetime64[{self.unidade}]')
+
+    def serie(self, grupo=None):
+        """pd.Series do total (ou de um grupo) indexada pelas datas"""
+        linha = 0 if grupo is None else self.grupos.index(grupo) + 1
+        return pd.Series(self.contagens[linha], index=pd.DatetimeIndex(self.eixo(), name='data'), name='focos')
+
+    def acumulado(self):
+        """Soma acumulada de todas as séries (matriz com a forma de contagens)"""
+        return np.cumsum(self.contagens, axis=1)
+
+    def soma_movel(self, janela=JANELA_PADRAO, centralizada=True, min_periodos=None):
+        """
+        Soma móvel de todas as séries em uma passada
+        Mesma convenção do pandas rolling(janela, center=centralizada,
+        min_periods=min_periodos): sem baldes suficientes na janela, NaN
+        """
+        if janela < 1:
+            raise ValueError("A janela deve ter pelo menos 1 balde")
+        min_periodos = janela if min_periodos is None else min_periodos
+        if not 0 <= min_periodos <= janela:
+            raise ValueError("min_periodos deve estar entre 0 e a janela")
+        n = len(self)
+        acumulado = np.zeros((self.contagens.shape[0], n + 1), dtype=self.contagens.dtype)
+        np.cumsum(self.contagens, axis=1, out=acumulado[:, 1:])
+
+        # A janela do balde i termina em i (ou em i + (janela - 1) // 2, centralizada)
+        fim = np.arange(n) + 1 + ((janela - 1) // 2 if centralizada else 0)
+        inicio = np.clip(fim - janela, 0, n)
+        fim = np.minimum(fim, n)
+        soma = (acumulado[:, fim] - acumulado[:, inicio]).astype(np.float64)
+        observados = fim - inicio
+        soma[:, observados < min_periodos] = np.nan
+        return soma, observados
+
+    def media_movel(self, janela=JANELA_PADRAO, centralizada=True, min_periodos=None):
+        """Média móvel de todas as séries (matriz com a forma de contagens)"""
+        soma, observados = self.soma_movel(janela, centralizada, min_periodos)
+        return soma / np.maximum(observados, 1)
+
+    def por_mes_do_ano(self):
+        """Focos por mês do calendário (jan a dez, somando os anos): matriz (séries, 12)"""
+        meses = self.eixo().astype('datetime64[M]').view(np.int64) % 12
+        return np.stack([np.bincount(meses, weights=linha, minlength=12) for linha in self.contagens]).astype(
+            self.contagens.dtype)
+
+    def quadro(self, janelas=(JANELA_PADRAO,), centralizada=True):
+        """
+        DataFrame com focos, acumulado e médias móveis de cada série
+        Colunas em dois níveis: (série, medida), com 'total' e um por grupo
+        """
+        medidas = {'focos': self.contagens, 'acumulado': self.acumulado()}
+        for janela in janelas:
+            medidas[f'media_{janela}'] = self.media_movel(janela, centralizada)
+        colunas = {}
+        for linha, nome in enumerate(['total'] + [str(g) for g in self.grupos]):
+            for medida, matriz in medidas.items():
+                colunas[(nome, medida)] = matriz[linha]
+        return pd.DataFrame(colunas, index=pd.DatetimeIndex(self.eixo(), name='data'))
+
+
+def main(argv=None):
+    import argparse
+    import time
+
+    import leituraDados
+
+    parser = argparse.ArgumentParser(
+        description='Séries diárias (ou horárias) de focos com calendário contínuo e médias móveis',
+        epilog='Exemplo: python temporalDados.py output/dados_ordenados.csv --janela 7 --janela 30 -o serie.csv'
+    )
+    parser.add_argument('arquivo', help='CSV de focos')
+    parser.add_argument('--unidade', choices=UNIDADES, default='D', help='D (dias, padrão) ou h (horas)')
+    parser.add_argument('--janela', type=int, action='append', default=None,
+                        help=f'Janela da média móvel em baldes; repita para várias (padrão: {JANELA_PADRAO})')
+    parser.add_argument('--grupo', default='bioma', help="Coluna das séries por grupo (padrão: bioma; 'nenhum' desliga)")
+    parser.add_argument('--saida', '-o', default=None, help='Grava o quadro em CSV')
+
+    args = parser.parse_args(argv)
+
+    try:
+        df = leituraDados.carregar_csv(args.arquivo)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    inicio = time.perf_counter()
+    serie = SerieTemporal.de_focos(df, coluna_grupo=None if args.grupo == 'nenhum' else args.grupo,
+                                   unidade=args.unidade)
+    quadro = serie.quadro(args.janela or [JANELA_PADRAO])
+    print(f"{len(serie)} baldes ({int((serie.total == 0).sum())} sem focos), "
+          f"{len(serie.grupos)} grupo(s) em {time.perf_counter() - inicio:.3f} segundos")
+    if args.saida:
+        quadro.to_csv(args.saida)
+        print(f"Quadro salvo em: {args.saida}")
+    else:
+        print(quadro['total'].tail(10).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
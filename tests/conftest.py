@@ -0,0 +1,65 @@
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+# Entrada do mergeSort.c e a saída dele ordenada por data_pas
+CSV_SC = RAIZ / 'output' / 'focos_br_sc_ref_2024.csv'
+CSV_ORDENADO_C = RAIZ / 'output' / 'dados_ordenados.csv'
+
+
+@pytest.fixture
+def csv_sc(tmp_path):
+    """Cópia do CSV do INPE de SC (os testes podem gravar ao lado dela)"""
+    destino = tmp_path / CSV_SC.name
+    shutil.copyfile(CSV_SC, destino)
+    return destino
+
+
+@pytest.fixture
+def csv_sintetico(tmp_path):
+    """Gera CSVs sintéticos (benchmarkDados.gerar_dataset) na pasta do teste"""
+    import benchmarkDados
+
+    def gerar(linhas, distribuicao='aleatoria', semente=0, nome='sintetico.csv'):
+        return benchmarkDados.gerar_dataset(tmp_path / nome, linhas, distribuicao, semente)
+    return gerar
+
+
+@pytest.fixture(scope='session')
+def mergesort_c(tmp_path_factory):
+    """
+    mergeSort.c compilado (sem a chamada de console do Windows):
+    ordenar(caminho, campo 1-9) -> (bytes do CSV ordenado, texto das estatísticas)
+    """
+    compilador = shutil.which('gcc') or shutil.which('cc')
+    if compilador is None:
+        pytest.skip('compilador C não encontrado')
+    pasta = tmp_path_factory.mktemp('mergesort_c')
+    fonte = pasta / 'mergeSort.c'
+    linhas = (RAIZ / 'mergeSort.c').read_bytes().splitlines(keepends=True)
+    fonte.write_bytes(b''.join(linha for linha in linhas
+                               if b'windows.h' not in linha and b'SetConsoleOutputCP' not in linha))
+    executavel = pasta / 'mergeSort'
+    subprocess.run([compilador, '-O2', '-o', str(executavel), str(fonte), '-lm'],
+                   check=True, capture_output=True)
+    resultados = {}
+
+    def ordenar(caminho, campo):
+        chave = (Path(caminho).read_bytes(), campo)
+        if chave not in resultados:
+            # O programa lê a entrada pelo nome fixo e grava na pasta atual
+            trabalho = Path(tempfile.mkdtemp(dir=pasta))
+            shutil.copyfile(caminho, trabalho / CSV_SC.name)
+            subprocess.run([str(executavel)], input=f'{campo}\n', cwd=trabalho,
+                           check=True, capture_output=True, text=True)
+            resultados[chave] = ((trabalho / 'dados_ordenados.csv').read_bytes(),
+                                 (trabalho / 'estatisticas_execucao.txt').read_text(encoding='utf-8'))
+        return resultados[chave]
+    return ordenar
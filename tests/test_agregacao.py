@@ -0,0 +1,31 @@
+import pandas as pd
+
+import agregacaoDados
+import leituraDados
+
+
+def test_hora_por_dia_semana_com_horas_sem_focos(csv_sc):
+    df = leituraDados.carregar_csv(csv_sc)
+    # O arquivo de SC só tem focos em algumas horas da tarde
+    assert df['hora'].nunique() < 24
+
+    tabela = agregacaoDados.CuboAgregado(df).hora_por_dia_semana()
+    esperado = pd.crosstab(df['hora'].astype(int), df['dia_semana'].astype(str)).reindex(
+        index=range(24), columns=agregacaoDados.DIAS_ORDEM, fill_value=0)
+
+    assert list(tabela.index) == list(range(24))
+    assert list(tabela.columns) == agregacaoDados.DIAS_ORDEM
+    assert (tabela.to_numpy() == esperado.to_numpy()).all()
+
+
+def test_hora_por_dia_semana_filtrado():
+    datas = pd.to_datetime(['2024-03-04 03:10:00', '2024-03-05 21:00:00', '2024-03-05 21:30:00'])
+    df = pd.DataFrame({'data_pas': datas, 'municipio': pd.Categorical(['LAGES'] * 3),
+                       'bioma': pd.Categorical(['Pampa'] * 3)})
+    df = leituraDados.adicionar_colunas_derivadas(df)
+
+    tabela = agregacaoDados.CuboAgregado(df).hora_por_dia_semana()
+    assert tabela.shape == (24, 7)
+    assert tabela.loc[3, 'Monday'] == 1
+    assert tabela.loc[21, 'Tuesday'] == 2
+    assert tabela.to_numpy().sum() == 3
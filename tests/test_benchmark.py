@@ -0,0 +1,34 @@
+import tracemalloc
+
+import benchmarkDados
+
+
+def test_medir_tempo_sem_tracemalloc():
+    rastreando, preparos = [], []
+
+    def funcao(n):
+        rastreando.append(tracemalloc.is_tracing())
+        return bytearray(n)
+
+    resultado, tempo, pico = benchmarkDados.medir(funcao, 4 * 1024 * 1024,
+                                                  preparar=lambda: preparos.append(1))
+    assert rastreando == [False, True]
+    assert len(preparos) == 2
+    assert len(resultado) == 4 * 1024 * 1024
+    assert tempo > 0 and pico >= 4
+    assert not tracemalloc.is_tracing()
+
+
+def test_dataset_no_formato_do_inpe(csv_sintetico):
+    caminho = csv_sintetico(3000, 'quase_ordenada', semente=7)
+    linhas = caminho.read_text(encoding='utf-8').splitlines()
+    assert linhas[0] + '\n' == benchmarkDados.CABECALHO
+    assert len(linhas) == 3001
+    for linha in linhas[1:]:
+        id_bdq, foco_id, lat, lon, data, pais, estado, municipio, bioma = linha.split(',')
+        assert id_bdq == f' {int(id_bdq)} '
+        assert [len(p) for p in foco_id.split('-')] == [8, 4, 4, 4, 12]
+        assert lat == f'{float(lat):12.6f} ' and lon == f'{float(lon):12.6f} '
+        assert len(data) == 19 and data[10] == ' '
+        assert (pais, estado) == ('Brasil', 'SANTA CATARINA')
+        assert municipio in benchmarkDados.MUNICIPIOS and bioma in benchmarkDados.BIOMAS
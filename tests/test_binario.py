@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import formatoBinario
+import leituraDados
+from conftest import CSV_SC
+
+
+@pytest.fixture(scope='module')
+def focos():
+    return leituraDados.carregar_csv(CSV_SC)
+
+
+def test_ida_e_volta_igual_ao_csv(focos, tmp_path):
+    caminho = tmp_path / 'focos.focos'
+    formatoBinario.escrever_binario(caminho, focos, ordem=['data_pas'])
+    assert formatoBinario.eh_binario(caminho)
+    assert formatoBinario.ler_descritor(caminho)['ordem'] == ['data_pas']
+    pd.testing.assert_frame_equal(formatoBinario.abrir_binario(caminho), focos)
+
+    # converter_csv passa pelo mesmo leitor
+    convertido = tmp_path / 'convertido.focos'
+    formatoBinario.converter_csv(CSV_SC, convertido)
+    pd.testing.assert_frame_equal(formatoBinario.abrir_binario(convertido), focos)
+
+
+def test_ida_e_volta_na_ordem_dos_indices(focos, tmp_path):
+    caminho = tmp_path / 'focos.focos'
+    indices = np.random.default_rng(0).permutation(len(focos))[:500]
+    formatoBinario.escrever_binario(caminho, focos, indices)
+    # Colunas na ordem do arquivo
+    aberto = formatoBinario.abrir_binario(caminho, colunas=['lat', 'municipio', 'foco_id'])
+    esperado = focos[['foco_id', 'lat', 'municipio']].take(indices).reset_index(drop=True)
+    pd.testing.assert_frame_equal(aberto, esperado)
+
+
+def test_colunas_numericas_sao_views_somente_leitura(focos, tmp_path):
+    caminho = tmp_path / 'focos.focos'
+    formatoBinario.escrever_binario(caminho, focos)
+    aberto = formatoBinario.abrir_binario(caminho)
+    for coluna in ('lat', 'lon', 'id_bdq', 'data_pas', 'hora'):
+        valores = aberto[coluna].to_numpy()
+        assert not valores.flags.writeable
+        assert not valores.flags.owndata
+        with pytest.raises(ValueError):
+            valores[0] = valores[1]
+    codigos = aberto['municipio'].cat.codes.to_numpy()
+    assert not codigos.flags.writeable
+
+
+def test_arquivo_sem_linhas(focos, tmp_path):
+    caminho = tmp_path / 'vazio.focos'
+    vazio = focos.iloc[:0]
+    assert formatoBinario.escrever_binario(caminho, vazio)['linhas'] == 0
+    aberto = formatoBinario.abrir_binario(caminho)
+    assert len(aberto) == 0
+    assert list(aberto.columns) == list(focos.columns)
+    assert (aberto.dtypes == focos.dtypes).all()
+
+
+def test_foco_id_nulo_volta_nulo(focos, tmp_path):
+    caminho = tmp_path / 'nulos.focos'
+    com_nulos = focos.copy()
+    com_nulos.loc[[3, 10], 'foco_id'] = None
+    com_nulos.loc[11, 'foco_id'] = np.nan
+    formatoBinario.escrever_binario(caminho, com_nulos)
+    aberto = formatoBinario.abrir_binario(caminho)
+    assert np.flatnonzero(aberto['foco_id'].isna()).tolist() == [3, 10, 11]
+    assert not aberto['foco_id'].isin(['None', 'nan', '']).any()
+    com_nulos.loc[[3, 10], 'foco_id'] = np.nan
+    pd.testing.assert_frame_equal(aberto, com_nulos)
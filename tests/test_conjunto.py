@@ -0,0 +1,125 @@
+import json
+
+import pandas as pd
+import pytest
+
+import cacheDados
+import conjuntoDados
+import leituraDados
+from conftest import CSV_SC
+
+FRAGMENTOS = ('focos_br_sc_ref_2023.csv', 'focos_br_sc_ref_2024.csv', 'focos_br_pr_ref_2024.csv',
+              'focos_br_rs_ref_2021.csv', 'outros_focos.csv')
+
+
+@pytest.fixture
+def pasta(tmp_path):
+    """O CSV de SC dividido em arquivos renomeados por estado e ano (e um fora do padrão)"""
+    linhas = CSV_SC.read_text(encoding='utf-8').splitlines(keepends=True)
+    cabecalho, dados = linhas[0], linhas[1:]
+    pasta = tmp_path / 'focos'
+    pasta.mkdir()
+    parte = len(dados) // len(FRAGMENTOS) + 1
+    for i, nome in enumerate(FRAGMENTOS):
+        (pasta / nome).write_text(cabecalho + ''.join(dados[i * parte:(i + 1) * parte]), encoding='utf-8')
+    (pasta / 'leia-me.md').write_text('não é um arquivo de focos', encoding='utf-8')
+    return pasta
+
+
+def _nomes(arquivos):
+    return sorted(p.rsplit('/', 1)[-1] for p in arquivos)
+
+
+def test_particao_pelo_nome():
+    assert conjuntoDados.particao('dados/focos_br_sc_ref_2024.csv') == ('sc', 2024)
+    assert conjuntoDados.particao('FOCOS_BR_PR_REF_2023.focos') == ('pr', 2023)
+    assert conjuntoDados.particao('outros_focos.csv') == (None, None)
+
+
+@pytest.mark.parametrize('ufs, anos, esperados', [
+    (None, None, FRAGMENTOS),
+    ('sc', None, ('focos_br_sc_ref_2023.csv', 'focos_br_sc_ref_2024.csv', 'outros_focos.csv')),
+    (' SC , pr', '2024', ('focos_br_sc_ref_2024.csv', 'focos_br_pr_ref_2024.csv', 'outros_focos.csv')),
+    (None, '2020-2023', ('focos_br_sc_ref_2023.csv', 'focos_br_rs_ref_2021.csv', 'outros_focos.csv')),
+    (['rs', 'sc'], [2021, '2024'], ('focos_br_sc_ref_2024.csv', 'focos_br_rs_ref_2021.csv',
+                                    'outros_focos.csv')),
+])
+def test_poda_por_estado_e_ano(pasta, ufs, anos, esperados):
+    conjunto = conjuntoDados.ConjuntoDados(str(pasta), ufs, anos)
+    assert _nomes(conjunto.arquivos) == sorted(esperados)
+    assert _nomes(conjunto.descartados) == sorted(set(FRAGMENTOS) - set(esperados))
+    # Arquivos fora do padrão não podem ser podados
+    assert 'outros_focos.csv' in _nomes(conjunto.arquivos)
+
+
+def test_nada_sobra_depois_da_poda(pasta):
+    (pasta / 'outros_focos.csv').unlink()
+    with pytest.raises(FileNotFoundError):
+        conjuntoDados.ConjuntoDados(str(pasta), ufs='am')
+
+
+def test_manifestos(pasta, tmp_path):
+    # .txt: comentários, linhas vazias, caminhos relativos à pasta do manifesto e absolutos
+    txt = pasta / 'lista.txt'
+    txt.write_text(f'# recortes\nfocos_br_sc_ref_2023.csv\n\n  focos_br_pr_ref_2024.csv  \n'
+                   f'{pasta / "focos_br_rs_ref_2021.csv"}\n', encoding='utf-8')
+    assert conjuntoDados.eh_conjunto(str(txt))
+    assert _nomes(conjuntoDados.resolver_arquivos(str(txt))) == [
+        'focos_br_pr_ref_2024.csv', 'focos_br_rs_ref_2021.csv', 'focos_br_sc_ref_2023.csv']
+
+    # .json: lista ou {"arquivos": [...]}, relativo à pasta do manifesto
+    outra = tmp_path / 'manifestos'
+    outra.mkdir()
+    lista = outra / 'lista.json'
+    lista.write_text(json.dumps(['../focos/focos_br_sc_ref_2024.csv', '../focos/outros_focos.csv']))
+    objeto = outra / 'objeto.json'
+    objeto.write_text(json.dumps({'arquivos': ['../focos/focos_br_sc_ref_2024.csv']}))
+    assert _nomes(conjuntoDados.resolver_arquivos(str(lista))) == ['focos_br_sc_ref_2024.csv', 'outros_focos.csv']
+    assert _nomes(conjuntoDados.ConjuntoDados(str(objeto)).arquivos) == ['focos_br_sc_ref_2024.csv']
+
+    # Manifesto apontando para um arquivo que não existe
+    (outra / 'quebrado.txt').write_text('nao_existe.csv\n')
+    with pytest.raises(FileNotFoundError):
+        conjuntoDados.ConjuntoDados(str(outra / 'quebrado.txt'))
+
+
+def test_glob_e_lista_sem_repeticoes(pasta):
+    por_glob = conjuntoDados.resolver_arquivos(str(pasta / 'focos_br_*_ref_*.csv'))
+    assert _nomes(por_glob) == sorted(set(FRAGMENTOS) - {'outros_focos.csv'})
+    misturados = conjuntoDados.resolver_arquivos(
+        [str(pasta / 'focos_br_sc_*.csv'), str(pasta / 'focos_br_sc_ref_2024.csv'), str(pasta)])
+    assert _nomes(misturados) == sorted(FRAGMENTOS)
+
+
+def _sem_categorias(df):
+    return df.astype({c: object for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+
+
+@pytest.mark.parametrize('processos', [1, 2])
+def test_carregar_igual_aos_arquivos_concatenados(pasta, tmp_path, processos):
+    conjunto = conjuntoDados.ConjuntoDados(str(pasta), anos='2021-2024')
+    esperado = pd.concat([leituraDados.carregar_csv(c) for c in conjunto.arquivos], ignore_index=True)
+    cache = tmp_path / 'cache'
+    for _ in range(2):  # a segunda leitura vem do cache
+        df = conjunto.carregar(processos, usar_cache=True, pasta_cache=str(cache))
+        assert len(df) == len(esperado)
+        pd.testing.assert_frame_equal(_sem_categorias(df), _sem_categorias(esperado))
+        # Municípios de arquivos diferentes continuam categóricos
+        assert isinstance(df['municipio'].dtype, pd.CategoricalDtype)
+    assert any(cache.iterdir())
+
+
+def test_falha_no_cache_nao_interrompe_a_leitura(pasta, tmp_path, monkeypatch, capsys):
+    def falhar(*_, **__):
+        raise OSError('disco cheio')
+
+    monkeypatch.setattr(cacheDados, 'salvar_cache', falhar)
+    conjunto = conjuntoDados.ConjuntoDados(str(pasta), ufs='pr')
+    df = conjunto.carregar(1, usar_cache=True, pasta_cache=str(tmp_path / 'cache'))
+    assert len(df) == sum(len(leituraDados.carregar_csv(c)) for c in conjunto.arquivos)
+    assert 'disco cheio' in capsys.readouterr().out
+
+    # Outros erros não são engolidos
+    monkeypatch.setattr(cacheDados, 'salvar_cache', lambda *_, **__: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        conjunto.carregar(1, usar_cache=True, pasta_cache=str(tmp_path / 'cache'))
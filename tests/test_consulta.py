@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+import consultaDados
+import leituraDados
+from conftest import CSV_SC
+from consultaDados import Filtro
+
+
+@pytest.fixture(scope='module', params=['ordenado', 'embaralhado'])
+def focos(request):
+    """Focos de SC na ordem do arquivo (por data_pas) e fora de ordem (índice temporal com argsort)"""
+    df = leituraDados.carregar_csv(CSV_SC)
+    if request.param == 'embaralhado':
+        df = df.sample(frac=1, random_state=0).reset_index(drop=True)
+    return df, consultaDados.IndiceFocos(df)
+
+
+def _mascara(df, filtro):
+    """Referência: o filtro aplicado a todas as linhas"""
+    mascara = np.ones(len(df), dtype=bool)
+    if filtro.inicio is not None:
+        mascara &= (df['data_pas'] >= filtro.inicio).to_numpy()
+    if filtro.fim is not None:
+        mascara &= (df['data_pas'] < filtro.fim_exclusivo).to_numpy()
+    for coluna in ('municipio', 'bioma'):
+        if getattr(filtro, coluna) is not None:
+            mascara &= df[coluna].isin(getattr(filtro, coluna)).to_numpy()
+    if filtro.mes is not None:
+        mascara &= df['mes'].between(*filtro.mes).to_numpy()
+    if filtro.hora is not None:
+        mascara &= df['hora'].between(*filtro.hora).to_numpy()
+    if filtro.bbox is not None:
+        lon_min, lat_min, lon_max, lat_max = filtro.bbox
+        mascara &= (df['lon'].between(lon_min, lon_max) & df['lat'].between(lat_min, lat_max)).to_numpy()
+    if filtro.raio is not None:
+        lat0, lon0, km = filtro.raio
+        mascara &= consultaDados.distancia_km(df['lat'].to_numpy(), df['lon'].to_numpy(), lat0, lon0) <= km
+    return np.flatnonzero(mascara)
+
+
+@pytest.mark.parametrize('texto', [
+    # Datas: o fim só com o dia inclui o dia inteiro; com hora, vai até aquele instante
+    'inicio=2024-08-01; fim=2024-08-31',
+    'fim=2024-03-05',
+    'inicio=2024-09-10 12:00; fim=2024-09-12 17:30:00',
+    'inicio=2024-12-31',
+    # Índice invertido com um e com vários municípios (e um que não existe)
+    'municipio=LAGES',
+    'municipio=LAGES|CURITIBANOS|SÃO JOAQUIM',
+    'municipio=LAGES|NÃO EXISTE; mes=8-9',
+    'bioma=Mata Atlântica; hora=12-18',
+    # Espacial: bbox sozinho, bbox com outro critério, raio e bbox + raio
+    'bbox=-50.5,-28.5,-49.5,-27.5',
+    'bbox=-53,-29,-48,-26; municipio=LAGES',
+    'raio=-27.8,-50.3,25',
+    'raio=-27.8,-50.3,60; inicio=2024-08-15',
+    'bbox=-50.4,-28,-50,-27.6; raio=-27.8,-50.3,25',
+    'raio=10,10,5',
+])
+def test_selecionar_igual_a_mascara(focos, texto):
+    df, indice = focos
+    filtro = Filtro.de_texto(texto)
+    esperado = _mascara(df, filtro)
+    assert np.array_equal(indice.selecionar(filtro), esperado)
+    assert indice.contar(filtro) == len(esperado)
+
+
+def test_fim_so_com_data_inclui_o_dia_todo(focos):
+    df, indice = focos
+    ultimo_dia = df['data_pas'].max().normalize()
+    filtro = Filtro(inicio=ultimo_dia, fim=ultimo_dia.strftime('%Y-%m-%d'))
+    assert len(indice.selecionar(filtro)) == int((df['data_pas'] >= ultimo_dia).sum()) > 0
+
+
+def _como_texto(parametros):
+    """Volta de Filtro.parametros() para a sintaxe de texto"""
+    partes = []
+    for nome, valor in parametros.items():
+        if nome in ('inicio', 'fim'):
+            valor = valor.isoformat()
+        elif nome in ('bioma', 'municipio'):
+            valor = '|'.join(valor)
+        elif nome in ('mes', 'hora'):
+            valor = f'{valor[0]}-{valor[1]}'
+        else:
+            valor = ','.join(repr(v) for v in valor)
+        partes.append(f'{nome}={valor}')
+    return '; '.join(partes)
+
+
+@pytest.mark.parametrize('texto', [
+    'bioma=Mata Atlântica; mes=3; hora=12-18; bbox=-50,-28,-48,-26',
+    'inicio=2024-03-01; fim=2024-03-31; municipio=LAGES|CURITIBANOS',
+    ' raio=-27.8,-50.3,25 ;; fim=2024-03-31 23:00 ',
+    '',
+])
+def test_de_texto_ida_e_volta(texto):
+    filtro = Filtro.de_texto(texto)
+    assert Filtro.de_texto(_como_texto(filtro.parametros())) == filtro
+    assert Filtro.de_parametros(filtro.parametros()) == filtro
+    assert hash(Filtro.criar(texto)) == hash(filtro)
+
+
+@pytest.mark.parametrize('texto', ['mes=13', 'hora=5-2', 'bbox=1,2,3', 'cor=azul', 'bioma', 'inicio=ontem'])
+def test_de_texto_invalido(texto):
+    with pytest.raises(ValueError):
+        Filtro.de_texto(texto)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+import espacialDados
+from conftest import CSV_SC
+
+
+def _focos_com_falhas():
+    """Focos de SC com um bioma a mais, alguns sem coordenada e alguns sem bioma"""
+    df = pd.read_csv(CSV_SC, skipinitialspace=True)[['lat', 'lon', 'bioma']]
+    df.loc[df.index[::7], 'bioma'] = 'Pampa'
+    df.loc[df.index[3::50], 'lat'] = np.nan
+    df.loc[df.index[5::61], 'lon'] = np.inf
+    df.loc[df.index[11::40], 'bioma'] = None
+    return df
+
+
+def test_nulos_fora_da_piramide():
+    df = _focos_com_falhas()
+    validos = df[np.isfinite(df['lat']) & np.isfinite(df['lon'])]
+    niveis = espacialDados.piramide_espacial(df['lat'], df['lon'])
+    for pontos in niveis.values():
+        assert np.isfinite(pontos[['lat', 'lon']].to_numpy()).all()
+        assert pontos['focos'].sum() == len(validos)
+
+
+def test_grupo_nulo_nao_conta_em_outro_grupo():
+    df = _focos_com_falhas()
+    validos = df[np.isfinite(df['lat']) & np.isfinite(df['lon']) & df['bioma'].notna()]
+    for limite in (10, 10 ** 6):
+        pontos, _ = espacialDados.reduzir_pontos(df, limite, coluna_grupo='bioma')
+        assert np.isfinite(pontos[['lat', 'lon']].to_numpy()).all()
+        assert pontos.groupby('bioma')['focos'].sum().to_dict() == validos['bioma'].value_counts().to_dict()
+
+    # No nível mais fino, o centróide de um foco isolado é o próprio foco
+    pontos, zoom = espacialDados.reduzir_pontos(validos.iloc[:1], 10, coluna_grupo='bioma')
+    assert zoom == espacialDados.ZOOM_MAXIMO
+    assert np.allclose(pontos[['lat', 'lon']].to_numpy(), validos[['lat', 'lon']].to_numpy()[:1])
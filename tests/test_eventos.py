@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import consultaDados
+import eventosDados
+import ordenacaoDados
+from conftest import CSV_SC
+
+
+def _eventos_forca_bruta(lat, lon, datas, distancia_km, horas):
+    """Componentes conexas da relação comparando todos os pares (referência)"""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    validos = np.flatnonzero(~np.isnat(datas) & np.isfinite(lat) & np.isfinite(lon))
+    segundos = datas[validos].astype('datetime64[s]').view(np.int64)
+    # Em ordem de tempo (estável), como a numeração dos eventos
+    ordem = np.argsort(segundos, kind='stable')
+    validos, segundos = validos[ordem], segundos[ordem]
+    a, b = lat[validos], lon[validos]
+    perto = consultaDados.distancia_km(a[:, None], b[:, None], a[None, :], b[None, :]) <= distancia_km
+    ligados = perto & (np.abs(segundos[:, None] - segundos[None, :]) <= horas * 3600)
+
+    eventos = np.full(len(lat), -1, dtype=np.int64)
+    visitados = np.zeros(len(validos), dtype=bool)
+    proximo = 0
+    for inicio in range(len(validos)):
+        if visitados[inicio]:
+            continue
+        visitados[inicio] = True
+        fronteira = np.array([inicio])
+        while len(fronteira):
+            fronteira = np.flatnonzero(ligados[fronteira].any(axis=0) & ~visitados)
+            visitados[fronteira] = True
+            eventos[validos[fronteira]] = proximo
+        eventos[validos[inicio]] = proximo
+        proximo += 1
+    return eventos
+
+
+def _focos_densos(n, semente):
+    """Focos em uma caixa pequena (~30 km) e em 10 dias, fora de ordem, com alguns inválidos"""
+    rng = np.random.default_rng(semente)
+    lat = rng.uniform(-27.3, -27.0, n)
+    lon = rng.uniform(-50.3, -50.0, n)
+    datas = (np.datetime64('2024-08-01T00:00:00')
+             + rng.integers(0, 10 * 86400, n).astype('timedelta64[s]'))
+    # Repetidos: mesmo lugar e mesma hora
+    lat[1::50], lon[1::50], datas[1::50] = lat[::50], lon[::50], datas[::50]
+    lat[3::97] = np.nan
+    datas[5::89] = np.datetime64('NaT')
+    return lat, lon, datas
+
+
+@pytest.mark.parametrize('distancia_km, horas', [(0.5, 0), (1.0, 24), (2.0, 6), (5.0, 6), (12.0, 1)])
+def test_rotulos_iguais_aos_da_forca_bruta(distancia_km, horas):
+    lat, lon, datas = _focos_densos(1500, semente=int(distancia_km * 10) + horas)
+    esperado = _eventos_forca_bruta(lat, lon, datas, distancia_km, horas)
+    # Lotes minúsculos: os pares candidatos atravessam vários lotes
+    for pares_por_lote in (eventosDados.PARES_POR_LOTE, 7):
+        eventos = eventosDados.rotular_eventos(lat, lon, datas, distancia_km, horas, pares_por_lote)
+        assert np.array_equal(eventos, esperado)
+
+
+@pytest.mark.parametrize('distancia_km, horas', [(2.0, 48), (10.0, 24)])
+def test_rotulos_do_csv_de_sc(distancia_km, horas):
+    _, df = ordenacaoDados.ler_csv(CSV_SC)
+    datas = np.asarray(df['data_pas'], dtype='datetime64[s]')
+    esperado = _eventos_forca_bruta(df['lat'], df['lon'], datas, distancia_km, horas)
+    eventos = eventosDados.rotular_eventos(df['lat'], df['lon'], datas, distancia_km, horas)
+    assert np.array_equal(eventos, esperado)
+    assert eventos.max() + 1 < len(df)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+import cacheDados
+import incrementalDados
+import leituraDados
+import ordenacaoDados
+from conftest import CSV_ORDENADO_C, CSV_SC
+
+
+def _gravar_lote(caminho, linhas, deslocamento_dias, semente):
+    """Linhas do CSV do INPE com data e foco_id novos, no layout de entrada"""
+    rng = np.random.default_rng(semente)
+    _, df = ordenacaoDados.ler_csv(CSV_SC)
+    lote = df.iloc[rng.choice(len(df), linhas, replace=False)].copy()
+    datas = pd.to_datetime(lote['data_pas']) + pd.to_timedelta(deslocamento_dias, unit='D')
+    lote['data_pas'] = datas.dt.strftime('%Y-%m-%d %H:%M:%S')
+    lote['foco_id'] = [f'{i:08x}-0000-4000-8000-{i:012x}' for i in rng.integers(0, 2 ** 31, linhas)]
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(','.join(ordenacaoDados.COLUNAS) + '\n')
+        for registro in lote.itertuples(index=False):
+            arquivo.write(','.join(str(v) for v in registro) + '\n')
+    return caminho
+
+
+def _visualizador(caminho, pasta_cache):
+    from visualizadorDados import VisualizadorFocosPlotly
+    return VisualizadorFocosPlotly(str(caminho), pasta_cache=str(pasta_cache), interativo=False)
+
+
+def test_lote_intercalado_espelha_o_arquivo_e_o_cache(tmp_path):
+    csv = tmp_path / 'dados_ordenados.csv'
+    csv.write_bytes(CSV_ORDENADO_C.read_bytes())
+    cache = tmp_path / 'cache'
+    vis = _visualizador(csv, cache)
+
+    # Datas espalhadas pelo ano: o lote cai no meio do arquivo
+    lote = _gravar_lote(tmp_path / 'lote.csv', 40, np.arange(40) % 3, semente=1)
+    assert vis.anexar_lote(str(lote))['modo'] == 'intercalado'
+
+    # O arquivo continua ordenado, como se tudo tivesse sido ordenado junto
+    _, final = ordenacaoDados.ler_csv(csv)
+    assert (ordenacaoDados.ordenar_indices(final, 'data_pas') == np.arange(len(final))).all()
+
+    fresco = leituraDados.carregar_csv(csv)
+    pd.testing.assert_frame_equal(vis.df, fresco)
+    pd.testing.assert_frame_equal(cacheDados.carregar_cache(csv, cache), fresco)
+    assert vis.cubo.total == len(fresco)
+
+    # Lote depois da última data: só anexado ao fim, mais uma parte no cache
+    fim = _gravar_lote(tmp_path / 'fim.csv', 5, 400, semente=2)
+    assert vis.anexar_lote(str(fim))['modo'] == 'anexado'
+    fresco = leituraDados.carregar_csv(csv)
+    pd.testing.assert_frame_equal(vis.df, fresco)
+    pd.testing.assert_frame_equal(_visualizador(csv, cache).df, fresco)
+
+
+def test_cache_recebe_so_o_lote(tmp_path):
+    csv = tmp_path / 'dados_ordenados.csv'
+    csv.write_bytes(CSV_ORDENADO_C.read_bytes())
+    cache = tmp_path / 'cache'
+    vis = _visualizador(csv, cache)
+    dados, meta = cacheDados.caminhos_cache(csv, cache)
+    antes = dados.stat().st_mtime_ns
+
+    vis.anexar_lote(str(_gravar_lote(tmp_path / 'lote.csv', 10, 1, semente=3)))
+
+    # Os dados já guardados não foram regravados; a assinatura nova não tem hash
+    assert dados.stat().st_mtime_ns == antes
+    meta = cacheDados._ler_meta(meta)
+    assert meta['hash'] is None and len(meta['partes']) == 1
+    assert meta['tamanho'] == csv.stat().st_size
+
+
+def test_posicoes_do_merge(tmp_path):
+    csv = tmp_path / 'dados_ordenados.csv'
+    csv.write_bytes(CSV_ORDENADO_C.read_bytes())
+    lote = _gravar_lote(tmp_path / 'lote.csv', 25, np.arange(25) % 5, semente=4)
+
+    resultado = incrementalDados.anexar_lote_ordenado(csv, lote, detalhar=True)
+    with open(csv, encoding='utf-8') as arquivo:
+        linhas = arquivo.readlines()[1:]
+    assert [linhas[p] for p in resultado['posicoes']] == resultado['linhas']
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+import leituraDados
+
+
+@pytest.mark.parametrize('motor', ['pandas', 'pyarrow', 'registros'])
+def test_blocos_nao_mudam_o_dataframe(csv_sintetico, motor):
+    if motor == 'pyarrow' and not leituraDados.pyarrow_disponivel():
+        pytest.skip('pyarrow não instalado')
+    # 20 mil linhas: vários blocos também no pyarrow, que lê no mínimo 1 MB por bloco
+    caminho = csv_sintetico(20_000)
+    inteiro = leituraDados.carregar_csv(caminho, 100_000, motor=motor)
+    em_blocos = leituraDados.carregar_csv(caminho, 997, motor=motor)
+    pd.testing.assert_frame_equal(inteiro, em_blocos)
+    categorias = inteiro['municipio'].cat.categories
+    assert list(categorias) == sorted(categorias)
+
+
+def test_motores_iguais(csv_sc):
+    if not leituraDados.pyarrow_disponivel():
+        pytest.skip('pyarrow não instalado')
+    referencia = leituraDados.carregar_csv(csv_sc, motor='pandas')
+    for motor in ('pyarrow', 'registros'):
+        pd.testing.assert_frame_equal(referencia, leituraDados.carregar_csv(csv_sc, motor=motor))
+
+
+def test_categorias_de_blocos_diferentes():
+    blocos = [
+        pd.DataFrame({'municipio': pd.Categorical(['LAGES', 'SEARA']), 'n': [1, 2]}),
+        pd.DataFrame({'municipio': pd.Categorical(['CHAPECÓ', None, 'LAGES']), 'n': [3, 4, 5]}),
+    ]
+    df = leituraDados.concatenar_blocos(iter(blocos))
+    assert list(df['municipio'].cat.categories) == ['CHAPECÓ', 'LAGES', 'SEARA']
+    assert df['municipio'].tolist()[:3] == ['LAGES', 'SEARA', 'CHAPECÓ']
+    assert pd.isna(df['municipio'][3])
+    assert df['n'].tolist() == [1, 2, 3, 4, 5]
@@ -0,0 +1,156 @@
+import numpy as np
+import pytest
+
+import ordenacaoAdaptativa
+import ordenacaoChaves
+import ordenacaoDados
+import ordenacaoExterna
+import ordenacaoParalela
+from conftest import CSV_SC
+
+CAMPOS = range(1, 10)
+
+
+@pytest.fixture(params=['sc', 'duplicadas'])
+def entrada(request, csv_sintetico):
+    """CSV de SC e um sintético com muitas datas repetidas (empates testam a estabilidade)"""
+    if request.param == 'sc':
+        return CSV_SC
+    return csv_sintetico(20_000, 'duplicadas', semente=3)
+
+
+@pytest.mark.parametrize('campo', CAMPOS)
+def test_ordenar_csv_igual_ao_c(entrada, campo, mergesort_c, tmp_path):
+    esperado, _ = mergesort_c(entrada, campo)
+    saida = tmp_path / 'ordenado.csv'
+    ordenacaoDados.ordenar_csv(entrada, saida, campo)
+    assert saida.read_bytes() == esperado
+
+
+@pytest.mark.parametrize('campo', CAMPOS)
+def test_dataframe_de_texto_igual_ao_c(entrada, campo, mergesort_c, tmp_path):
+    esperado, _ = mergesort_c(entrada, campo)
+    cabecalho, df = ordenacaoDados.ler_csv(entrada)
+    saida = tmp_path / 'ordenado.csv'
+    ordenacaoDados.escrever_csv_ordenado(saida, df, cabecalho, ordenacaoDados.ordenar_indices(df, campo))
+    assert saida.read_bytes() == esperado
+
+
+@pytest.mark.parametrize('campo', CAMPOS)
+def test_ordenacao_externa_igual_ao_c(campo, csv_sintetico, mergesort_c, tmp_path):
+    entrada = csv_sintetico(20_000, 'duplicadas', semente=3)
+    esperado, _ = mergesort_c(entrada, campo)
+    saida = tmp_path / 'ordenado.csv'
+    # Orçamento mínimo: 20 corridas de 1000 linhas, intercaladas 4 a 4 (20 -> 5 -> 2 -> 1)
+    metricas = ordenacaoExterna.ordenar_csv_externo(entrada, saida, campo, memoria=1, vias=4,
+                                                    pasta_temporaria=tmp_path)
+    assert metricas['corridas'] == 20
+    assert metricas['passadas_merge'] == 3
+    assert saida.read_bytes() == esperado
+
+
+@pytest.mark.parametrize('campo', CAMPOS)
+def test_ordenacao_paralela_igual_ao_c(campo, csv_sintetico, mergesort_c, tmp_path, monkeypatch):
+    # Sem o mínimo de linhas: o pool roda mesmo em 20 mil linhas
+    monkeypatch.setattr(ordenacaoParalela, 'MINIMO_PARALELO', 0)
+    entrada = csv_sintetico(20_000, 'duplicadas', semente=3)
+    esperado, _ = mergesort_c(entrada, campo)
+    saida = tmp_path / 'ordenado.csv'
+    ordenacaoParalela.ordenar_csv_paralelo(entrada, saida, campo, processos=3)
+    assert saida.read_bytes() == esperado
+
+
+def test_ordenacao_paralela_varias_chaves(csv_sintetico, monkeypatch):
+    monkeypatch.setattr(ordenacaoParalela, 'MINIMO_PARALELO', 0)
+    _, df = ordenacaoDados.ler_csv(csv_sintetico(20_000, 'duplicadas', semente=3))
+    campos, decrescente = ['municipio', 'data_pas', 'lat'], [False, True, False]
+    assert np.array_equal(ordenacaoParalela.ordenar_indices_paralelo(df, campos, decrescente, processos=4),
+                          ordenacaoDados.ordenar_indices(df, campos, decrescente))
+
+
+@pytest.mark.parametrize('campos', [['pais'], ['bioma', 'foco_id'], ['estado', 'id_bdq', 'lon']])
+def test_ordenacao_paralela_baldes_equilibrados(campos, csv_sintetico, monkeypatch):
+    monkeypatch.setattr(ordenacaoParalela, 'MINIMO_PARALELO', 0)
+    _, df = ordenacaoDados.ler_csv(csv_sintetico(20_000, 'duplicadas', semente=3))
+    assert np.array_equal(ordenacaoParalela.ordenar_indices_paralelo(df, campos, processos=4),
+                          ordenacaoDados.ordenar_indices(df, campos))
+
+    # Chave principal com um único valor ('Brasil'): os baldes continuam do tamanho das partições
+    chaves = ordenacaoChaves.chaves_normalizadas(df, campos)
+    locais = np.empty(len(df), dtype=np.int64)
+    particoes = [(0, 5000), (5000, 10_000), (10_000, 15_000), (15_000, 20_000)]
+    amostras = np.concatenate([ordenacaoParalela.ordenar_particao(chaves, locais, a, b, 4)
+                               for a, b in particoes])
+    trechos = ordenacaoParalela.planejar_baldes(chaves, locais, particoes, amostras, 4)
+    tamanhos = [sum(b - a for a, b in t) for t in trechos]
+    assert len(tamanhos) == 4 and sum(tamanhos) == len(df)
+    assert max(tamanhos) <= 2 * len(df) // 4
+
+
+def test_ordenacao_paralela_uuid_em_duas_caixas(csv_sintetico, monkeypatch):
+    monkeypatch.setattr(ordenacaoParalela, 'MINIMO_PARALELO', 0)
+    _, df = ordenacaoDados.ler_csv(csv_sintetico(20_000, semente=5))
+    # Uma partição em maiúsculas: a ordem do strcmp exige o dicionário da coluna inteira
+    df.loc[:4999, 'foco_id'] = df.loc[:4999, 'foco_id'].str.upper()
+    assert np.array_equal(ordenacaoParalela.ordenar_indices_paralelo(df, 'foco_id', True, processos=4),
+                          ordenacaoDados.ordenar_indices(df, 'foco_id', True))
+
+
+def test_decrescente_com_um_valor_por_campo(monkeypatch):
+    monkeypatch.setattr(ordenacaoParalela, 'MINIMO_PARALELO', 0)
+    _, df = ordenacaoDados.ler_csv(CSV_SC)
+    campos = ['municipio', 'data_pas']
+    for ordenar in (ordenacaoDados.ordenar_indices, ordenacaoChaves.ordenar_indices_radix,
+                    ordenacaoParalela.ordenar_indices_paralelo):
+        with pytest.raises(ValueError):
+            ordenar(df, campos, [True])
+
+
+@pytest.mark.parametrize('campo', CAMPOS)
+def test_merge_natural_igual_ao_c(entrada, campo, mergesort_c, tmp_path):
+    esperado, estatisticas = mergesort_c(entrada, campo)
+    saida = tmp_path / 'ordenado.csv'
+    ordenacaoDados.ordenar_csv(entrada, saida, campo, algoritmo='adaptativo')
+    assert saida.read_bytes() == esperado
+
+    # Os contadores reproduzidos são os mesmos que o C grava nas estatísticas
+    _, df = ordenacaoDados.ler_csv(entrada)
+    _, contadores = ordenacaoAdaptativa.contar_mergesort_c(ordenacaoAdaptativa.montar_chaves(df, campo))
+    assert f'Total de comparações: {contadores.comparacoes}\n' in estatisticas
+    assert f'Total de movimentações: {contadores.movimentacoes}\n' in estatisticas
+
+
+def test_merge_natural_em_entrada_ordenada(csv_sintetico):
+    _, df = ordenacaoDados.ler_csv(csv_sintetico(20_000, 'ordenada'))
+    indices, estatisticas = ordenacaoAdaptativa.ordenar_indices_adaptativo(df, 'data_pas')
+    assert np.array_equal(indices, np.arange(len(df)))
+    # Uma corrida só: n - 1 comparações e nenhuma movimentação
+    assert estatisticas.comparacoes == len(df) - 1
+    assert estatisticas.movimentacoes == 0
+
+
+@pytest.mark.parametrize('campo', CAMPOS)
+def test_radix_igual_ao_c(entrada, campo, mergesort_c, tmp_path):
+    esperado, _ = mergesort_c(entrada, campo)
+    saida = tmp_path / 'ordenado.csv'
+    ordenacaoDados.ordenar_csv(entrada, saida, campo, algoritmo='radix')
+    assert saida.read_bytes() == esperado
+
+    # Chaves codificadas a partir do DataFrame de texto
+    cabecalho, df = ordenacaoDados.ler_csv(entrada)
+    saida_texto = tmp_path / 'ordenado_texto.csv'
+    ordenacaoDados.escrever_csv_ordenado(saida_texto, df, cabecalho,
+                                         ordenacaoChaves.ordenar_indices_radix(df, campo))
+    assert saida_texto.read_bytes() == esperado
+
+
+@pytest.mark.parametrize('campos, decrescente', [
+    (['lat'], True),
+    (['foco_id'], True),
+    (['bioma', 'lon', 'id_bdq'], [False, True, False]),
+    (['data_pas', 'municipio'], [True, True]),
+])
+def test_radix_igual_ao_lexsort(entrada, campos, decrescente):
+    _, df = ordenacaoDados.ler_csv(entrada)
+    assert np.array_equal(ordenacaoChaves.ordenar_indices_radix(df, campos, decrescente),
+                          ordenacaoDados.ordenar_indices(df, campos, decrescente))
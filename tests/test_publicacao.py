@@ -0,0 +1,107 @@
+import json
+
+import numpy as np
+import pytest
+
+import consultaDados
+import publicacaoDados
+from conftest import CSV_SC
+
+
+@pytest.fixture(scope='module')
+def vis():
+    from visualizadorDados import VisualizadorFocosPlotly
+    return VisualizadorFocosPlotly(str(CSV_SC), usar_cache=False, interativo=False)
+
+
+@pytest.fixture
+def gerados(monkeypatch):
+    """Nomes dos dashboards efetivamente gerados (processos=1 chama _gerar no próprio processo)"""
+    nomes = []
+    original = publicacaoDados._gerar
+
+    def gerar(posicao):
+        nomes.append(publicacaoDados._LOTE[1][posicao].nome)
+        return original(posicao)
+
+    monkeypatch.setattr(publicacaoDados, '_gerar', gerar)
+    return nomes
+
+
+@pytest.mark.parametrize('dimensoes', ['bioma,mes', 'municipio', 'mes,hora'])
+def test_fatias_iguais_a_selecionar(vis, dimensoes):
+    especificacoes = publicacaoDados.particionar(vis, dimensoes)
+    assert len({e.nome for e in especificacoes}) == len(especificacoes)
+    for especificacao in especificacoes:
+        assert np.array_equal(especificacao.posicoes, vis.indice.selecionar(especificacao.filtro))
+    # Toda linha com as dimensões válidas cai em exatamente uma fatia
+    todas = np.concatenate([e.posicoes for e in especificacoes])
+    assert len(np.unique(todas)) == len(todas)
+
+
+def test_dimensao_invalida(vis):
+    with pytest.raises(ValueError):
+        publicacaoDados.particionar(vis, 'estado')
+    with pytest.raises(ValueError):
+        publicacaoDados.particionar(vis, '')
+
+
+def test_nomes_repetidos_recebem_sufixo():
+    filtro = consultaDados.Filtro(mes=3)
+    especificacoes = list(publicacaoDados._especificacoes(['mes=3', {'mes': 3}, filtro, 'mes=4']))
+    assert [e.nome for e in especificacoes] == ['mes-3', 'mes-3-2', 'mes-3-3', 'mes-4']
+    assert publicacaoDados.nome_saida(consultaDados.Filtro(municipio='SÃO JOSÉ')) == 'municipio-SAO-JOSE'
+    assert publicacaoDados.nome_saida(consultaDados.Filtro()) == 'todos'
+
+
+def test_manifesto_pula_os_que_estao_em_dia(vis, gerados, tmp_path, monkeypatch):
+    especificacoes = publicacaoDados.particionar(vis, 'bioma,mes')
+    nomes = sorted(e.nome for e in especificacoes)
+    manifesto = publicacaoDados.publicar(vis, especificacoes, tmp_path, processos=1)
+    assert sorted(gerados) == nomes
+    assert sorted(manifesto['saidas']) == nomes
+    assert json.loads((tmp_path / publicacaoDados.MANIFESTO_LOTE).read_text(encoding='utf-8')) == manifesto
+    for especificacao in especificacoes:
+        saida = manifesto['saidas'][especificacao.nome]
+        assert saida['focos'] == len(especificacao.posicoes)
+        assert (tmp_path / saida['arquivo']).exists()
+
+    # Segunda chamada: nada a gerar, mesmo manifesto
+    gerados.clear()
+    assert publicacaoDados.publicar(vis, especificacoes, tmp_path, processos=1) == manifesto
+    assert gerados == []
+
+    # HTML apagado: só ele volta
+    (tmp_path / manifesto['saidas'][nomes[0]]['arquivo']).unlink()
+    publicacaoDados.publicar(vis, especificacoes, tmp_path, processos=1)
+    assert gerados == [nomes[0]]
+
+    # forcar gera todos
+    gerados.clear()
+    publicacaoDados.publicar(vis, especificacoes, tmp_path, processos=1, forcar=True)
+    assert sorted(gerados) == nomes
+
+    # Outro parâmetro do dashboard muda o carimbo de todos
+    gerados.clear()
+    monkeypatch.setattr(vis, 'janela_media', vis.janela_media + 3)
+    publicacaoDados.publicar(vis, especificacoes, tmp_path, processos=1)
+    assert sorted(gerados) == nomes
+
+    # Manifesto de outra versão é ignorado
+    gerados.clear()
+    caminho = tmp_path / publicacaoDados.MANIFESTO_LOTE
+    antigo = json.loads(caminho.read_text(encoding='utf-8'))
+    antigo['versao'] = publicacaoDados.VERSAO_MANIFESTO + 1
+    caminho.write_text(json.dumps(antigo), encoding='utf-8')
+    publicacaoDados.publicar(vis, especificacoes, tmp_path, processos=1)
+    assert sorted(gerados) == nomes
+
+
+def test_filtros_com_nomes_repetidos_e_sem_focos(vis, gerados, tmp_path):
+    manifesto = publicacaoDados.publicar(vis, ['mes=3', {'mes': 3}, 'municipio=NAO EXISTE'],
+                                         tmp_path, processos=1)
+    assert sorted(gerados) == ['mes-3', 'mes-3-2', 'municipio-NAO-EXISTE']
+    # Sem focos: nenhum HTML nem entrada no manifesto
+    assert sorted(manifesto['saidas']) == ['mes-3', 'mes-3-2']
+    assert not (tmp_path / 'municipio-NAO-EXISTE.html').exists()
+    assert manifesto['saidas']['mes-3']['focos'] == manifesto['saidas']['mes-3-2']['focos'] > 0
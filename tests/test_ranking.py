@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import ordenacaoDados
+import rankingDados
+import registrosDados
+from conftest import CSV_SC
+
+CONSULTAS = [
+    ('data_pas', False),
+    ('data_pas', True),
+    ('lat', False),
+    ('municipio', True),
+    (['bioma', 'municipio', 'data_pas'], [False, True, False]),
+]
+
+
+@pytest.fixture(params=['sc', 'duplicadas'])
+def entrada(request, csv_sintetico):
+    if request.param == 'sc':
+        return CSV_SC
+    return csv_sintetico(20_000, 'duplicadas', semente=3)
+
+
+@pytest.mark.parametrize('campos, decrescente', CONSULTAS)
+@pytest.mark.parametrize('k', [1, 10, 500, 10 ** 6])
+def test_primeiros_indices_sao_o_comeco_da_ordenacao(entrada, campos, decrescente, k):
+    _, df = ordenacaoDados.ler_csv(entrada)
+    esperado = ordenacaoDados.ordenar_indices(df, campos, decrescente)[:k]
+    assert np.array_equal(rankingDados.primeiros_indices(df, campos, k, decrescente), esperado)
+    tabela = registrosDados.TabelaRegistros.de_dataframe(df)
+    assert np.array_equal(rankingDados.primeiros_indices(tabela, campos, k, decrescente), esperado)
+
+
+@pytest.mark.parametrize('campos, decrescente', CONSULTAS)
+def test_primeiros_csv_em_blocos(entrada, campos, decrescente):
+    _, df = ordenacaoDados.ler_csv(entrada)
+    indices = ordenacaoDados.ordenar_indices(df, campos, decrescente)[:25]
+    # Blocos pequenos: os empates precisam continuar estáveis entre blocos
+    primeiros = rankingDados.primeiros_csv(entrada, campos, 25, decrescente,
+                                           linhas_por_bloco=333, motor='pandas')
+    assert (''.join(ordenacaoDados.formatar_linhas(primeiros))
+            == ''.join(ordenacaoDados.formatar_linhas(df, indices)))
+
+
+def test_primeiros_csv_sao_as_primeiras_linhas_do_c(mergesort_c):
+    esperado, _ = mergesort_c(CSV_SC, 5)
+    primeiros = rankingDados.primeiros_csv(CSV_SC, 'data_pas', 50, linhas_por_bloco=200)
+    linhas = esperado.decode('utf-8').splitlines(keepends=True)[1:51]
+    assert ''.join(ordenacaoDados.formatar_linhas(primeiros)) == ''.join(linhas)
+
+
+@pytest.mark.parametrize('coluna', ['municipio', 'bioma', 'data_pas'])
+def test_maiores_contagens_csv(entrada, coluna):
+    _, df = ordenacaoDados.ler_csv(entrada)
+    contagens = df[coluna].value_counts()
+    # Da maior para a menor contagem; empates em ordem alfabética
+    esperado = sorted(contagens.items(), key=lambda item: (-item[1], item[0]))[:15]
+    maiores = rankingDados.maiores_contagens_csv(entrada, coluna, 15, linhas_por_bloco=777)
+    assert list(maiores.items()) == esperado
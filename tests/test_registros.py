@@ -0,0 +1,35 @@
+import numpy as np
+
+import ordenacaoDados
+import registrosDados
+from conftest import CSV_ORDENADO_C, CSV_SC
+
+
+def test_tabela_escreve_o_mesmo_csv_que_o_c(tmp_path):
+    tabela = registrosDados.ler_registros(CSV_SC)
+    indices = ordenacaoDados.ordenar_indices(tabela, 'data_pas')
+    saida = tmp_path / 'ordenado.csv'
+    tabela.escrever_csv(saida, ordenacaoDados.ler_cabecalho(CSV_SC), indices)
+    assert saida.read_bytes() == CSV_ORDENADO_C.read_bytes()
+
+
+def test_inteiros_estreitados_so_quando_cabem():
+    tabela = registrosDados.ler_registros(CSV_SC)
+    assert tabela.colunas['id_bdq'].dtype == np.int32
+    assert tabela.colunas['data_pas'].dtype == np.int32
+    assert tabela['id_bdq'].dtype == np.int64
+    # O mergeSort.c guarda ~10x mais por linha
+    bytes_dados = CSV_SC.stat().st_size - len(CSV_SC.open('rb').readline()) - len(tabela)
+    assert tabela.bytes_layout_c(bytes_dados) / tabela.memoria()['bytes'] >= 10
+
+    # Um id além de int32 (e uma data depois de 2038) em outra parte: a coluna volta a int64
+    _, texto = ordenacaoDados.ler_csv(CSV_SC)
+    grandes = texto.iloc[:3].copy()
+    grandes['id_bdq'] = ['9000000001', '9000000002', '9000000003']
+    grandes['data_pas'] = '2040-01-01 00:00:00'
+    mista = registrosDados.TabelaRegistros.de_blocos([texto, grandes])
+    assert mista.colunas['id_bdq'].dtype == np.int64
+    assert mista.colunas['data_pas'].dtype == np.int64
+    assert list(mista.valores('id_bdq')[-3:]) == list(grandes['id_bdq'])
+    assert list(mista.valores('data_pas')[-3:]) == list(grandes['data_pas'])
+    assert list(mista.valores('id_bdq')[:len(texto)]) == list(texto['id_bdq'])
@@ -0,0 +1,101 @@
+import gzip
+import http.client
+import json
+import threading
+
+import pytest
+
+import servidorDados
+from conftest import CSV_SC
+
+
+@pytest.fixture
+def servidor(tmp_path):
+    """Servidor numa porta livre, sem observador (verificar_arquivo chamado pelo teste)"""
+    from visualizadorDados import VisualizadorFocosPlotly
+    csv = tmp_path / 'focos.csv'
+    csv.write_bytes(CSV_SC.read_bytes())
+    vis = VisualizadorFocosPlotly(str(csv), usar_cache=False, interativo=False)
+    servidor = servidorDados.criar_servidor(vis, porta=0, intervalo=0)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.focos.parar()
+    servidor.server_close()
+    thread.join()
+
+
+def _pedir(servidor, caminho, **cabecalhos):
+    """(status, cabeçalhos, corpo) de um GET"""
+    conexao = http.client.HTTPConnection(*servidor.server_address, timeout=30)
+    try:
+        conexao.request('GET', caminho, headers=cabecalhos)
+        resposta = conexao.getresponse()
+        return resposta.status, dict(resposta.getheaders()), resposta.read()
+    finally:
+        conexao.close()
+
+
+def test_etag_304_e_nova_versao_depois_de_anexar(servidor):
+    status, cabecalhos, corpo = _pedir(servidor, '/figura/serie?mes=3')
+    assert status == 200
+    etag = cabecalhos['ETag']
+    assert 'data' in json.loads(corpo)
+
+    status, cabecalhos, corpo = _pedir(servidor, '/figura/serie?mes=3', **{'If-None-Match': etag})
+    assert status == 304 and corpo == b''
+    assert cabecalhos['ETag'] == etag
+
+    # Outro filtro, outro ETag
+    assert _pedir(servidor, '/figura/serie?mes=4')[1]['ETag'] != etag
+
+    # Uma linha anexada ao CSV: o ETag antigo deixa de valer
+    csv = servidor.focos.visualizador.arquivo_csv
+    with open(csv, 'rb') as arquivo:
+        ultima = arquivo.read().splitlines(keepends=True)[-1]
+    with open(csv, 'ab') as arquivo:
+        arquivo.write(ultima)
+    assert servidor.focos.verificar_arquivo() == 'anexado'
+    assert servidor.focos.verificar_arquivo() is None
+
+    status, cabecalhos, _ = _pedir(servidor, '/figura/serie?mes=3', **{'If-None-Match': etag})
+    assert status == 200
+    assert cabecalhos['ETag'] != etag
+    estado = json.loads(_pedir(servidor, '/estado')[2])
+    assert estado['registros'] == 1802
+
+
+def test_gzip_negociado(servidor):
+    _, simples, corpo = _pedir(servidor, '/figura/municipios')
+    assert 'Content-Encoding' not in simples
+    _, cabecalhos, comprimido = _pedir(servidor, '/figura/municipios', **{'Accept-Encoding': 'gzip, br'})
+    assert cabecalhos['Content-Encoding'] == 'gzip'
+    assert cabecalhos['Vary'] == 'Accept-Encoding'
+    assert int(cabecalhos['Content-Length']) == len(comprimido) < len(corpo)
+    assert gzip.decompress(comprimido) == corpo
+    assert cabecalhos['ETag'] == simples['ETag']
+
+
+@pytest.mark.parametrize('caminho, status', [
+    ('/figura/serie?mes=13', 400),
+    ('/figura/serie?bbox=1,2,3', 400),
+    ('/figura/nada', 404),
+    ('/nada', 404),
+    ('/figura/serie?municipio=NAO%20EXISTE', 404),
+    ('/metricas', 404),
+])
+def test_erros(servidor, caminho, status):
+    recebido, cabecalhos, corpo = _pedir(servidor, caminho)
+    assert recebido == status
+    assert cabecalhos['Content-Type'] == 'application/json'
+    assert json.loads(corpo)['erro']
+
+
+def test_pagina_e_estado(servidor):
+    status, cabecalhos, corpo = _pedir(servidor, '/')
+    assert status == 200 and cabecalhos['Content-Type'].startswith('text/html')
+    assert b'/plotly.min.js' in corpo
+    estado = json.loads(_pedir(servidor, '/estado')[2])
+    assert estado['registros'] == 1801
+    assert estado['biomas'] == ['Mata Atlântica']
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import temporalDados
+from temporalDados import SerieTemporal
+
+
+@pytest.fixture(scope='module')
+def focos():
+    """Dois anos e meio de focos com semanas vazias, datas NaT e bioma nulo"""
+    rng = np.random.default_rng(1)
+    n = 4000
+    segundos = rng.integers(0, 900 * 86400, n)
+    # Sem focos em boa parte dos dias: o calendário precisa dos zeros
+    segundos = segundos[(segundos // 86400) % 9 < 4]
+    datas = pd.Series(pd.Timestamp('2022-06-01') + pd.to_timedelta(segundos, unit='s'))
+    datas[::37] = pd.NaT
+    bioma = pd.Series(rng.choice(['Mata Atlântica', 'Pampa', 'Cerrado'], len(datas), p=[0.7, 0.2, 0.1]),
+                      dtype=object)
+    bioma[5::23] = None
+    return pd.DataFrame({'data_pas': datas, 'bioma': bioma})
+
+
+def _referencias(df, unidade):
+    """Contagem por balde de cada série (total e por bioma), com os baldes vazios, via pandas"""
+    validos = df[df['data_pas'].notna()]
+    baldes = validos['data_pas'].dt.floor(unidade)
+    calendario = pd.date_range(baldes.min(), baldes.max(), freq=unidade)
+    total = baldes.value_counts().reindex(calendario, fill_value=0)
+    grupos = {nome: baldes[validos['bioma'] == nome].value_counts().reindex(calendario, fill_value=0)
+              for nome in pd.unique(df['bioma'].dropna())}
+    return total, grupos
+
+
+@pytest.mark.parametrize('unidade', ['D', 'h'])
+def test_calendario_com_buracos(focos, unidade):
+    serie = SerieTemporal.de_focos(focos, unidade=unidade)
+    total, grupos = _referencias(focos, unidade)
+    assert serie.grupos == list(grupos)
+    assert (serie.eixo() == total.index.to_numpy()).all()
+    assert (serie.total == 0).any()
+    np.testing.assert_array_equal(serie.total, total.to_numpy())
+    # Focos sem bioma entram só no total
+    assert serie.total.sum() == focos['data_pas'].notna().sum() > serie.contagens[1:].sum()
+    for nome, referencia in grupos.items():
+        np.testing.assert_array_equal(serie.serie(nome).to_numpy(), referencia.to_numpy())
+
+
+@pytest.mark.parametrize('janela', [1, 2, 7, 30])
+@pytest.mark.parametrize('centralizada', [True, False])
+@pytest.mark.parametrize('min_periodos', [None, 1, 3])
+def test_soma_e_media_moveis_iguais_ao_rolling(focos, janela, centralizada, min_periodos):
+    serie = SerieTemporal.de_focos(focos)
+    if min_periodos is not None and min_periodos > janela:
+        # Como no pandas
+        with pytest.raises(ValueError):
+            serie.soma_movel(janela, centralizada, min_periodos)
+        return
+    total, grupos = _referencias(focos, 'D')
+    soma, _ = serie.soma_movel(janela, centralizada, min_periodos)
+    media = serie.media_movel(janela, centralizada, min_periodos)
+    for linha, referencia in enumerate([total] + list(grupos.values())):
+        janelas = referencia.astype(float).rolling(janela, center=centralizada, min_periods=min_periodos)
+        np.testing.assert_allclose(soma[linha], janelas.sum().to_numpy())
+        np.testing.assert_allclose(media[linha], janelas.mean().to_numpy())
+
+
+def test_por_mes_do_ano(focos):
+    serie = SerieTemporal.de_focos(focos)
+    validos = focos[focos['data_pas'].notna()]
+    meses = validos['data_pas'].dt.month
+    esperado = meses.groupby(meses).size().reindex(range(1, 13), fill_value=0)
+    por_mes = serie.por_mes_do_ano()
+    assert por_mes.shape == (1 + len(serie.grupos), 12)
+    np.testing.assert_array_equal(por_mes[0], esperado.to_numpy())
+    for linha, nome in enumerate(serie.grupos, start=1):
+        do_grupo = meses[validos['bioma'] == nome]
+        esperado = do_grupo.groupby(do_grupo).size().reindex(range(1, 13), fill_value=0)
+        np.testing.assert_array_equal(por_mes[linha], esperado.to_numpy())
+    assert len(temporalDados.MESES) == 12
+
+
+def test_sem_focos():
+    serie = SerieTemporal.de_focos(pd.DataFrame({'data_pas': pd.to_datetime([]), 'bioma': []}))
+    assert len(serie) == 0
+    assert serie.soma_movel()[0].shape == (1, 0)
+    assert serie.por_mes_do_ano().sum() == 0
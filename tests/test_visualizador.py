@@ -0,0 +1,65 @@
+import threading
+import time
+
+import temporalDados
+from conftest import CSV_SC
+
+
+def _visualizador(caminho, **opcoes):
+    from visualizadorDados import VisualizadorFocosPlotly
+    return VisualizadorFocosPlotly(str(caminho), usar_cache=False, interativo=False, **opcoes)
+
+
+def test_estruturas_construidas_uma_vez_entre_threads(monkeypatch):
+    vis = _visualizador(CSV_SC)
+    original = temporalDados.SerieTemporal.de_focos
+    chamadas = []
+
+    def de_focos_lento(df):
+        chamadas.append(1)
+        time.sleep(0.05)
+        return original(df)
+
+    monkeypatch.setattr(temporalDados.SerieTemporal, 'de_focos', staticmethod(de_focos_lento))
+    series = []
+    threads = [threading.Thread(target=lambda: series.append(vis.serie)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(chamadas) == 1
+    assert all(serie is series[0] for serie in series)
+
+
+def test_dashboard_com_paineis_em_paralelo():
+    paralelo = _visualizador(CSV_SC)
+    sequencial = _visualizador(CSV_SC)
+    sequencial.figuras.max_threads = 1
+
+    a = paralelo.criar_dashboard_completo()
+    b = sequencial.criar_dashboard_completo()
+    assert a.to_json() == b.to_json()
+
+
+def test_instrumentacao_conta_as_linhas_da_visao_filtrada():
+    import instrumentacaoDados
+    instrumentacao = instrumentacaoDados.Instrumentacao(memoria=False)
+    vis = _visualizador(CSV_SC, instrumentacao=instrumentacao)
+    municipio = vis.df['municipio'].iloc[0]
+
+    vis.criar_top_municipios({'municipio': municipio})
+    vis.criar_top_municipios()
+    filtrada, completa = [m for m in instrumentacao.registros if m.etapa == 'criar_top_municipios']
+    assert filtrada.linhas == int((vis.df['municipio'] == municipio).sum()) < len(vis.df)
+    assert completa.linhas == len(vis.df)
+
+
+def test_limpar_estruturas_volta_ao_estado_inicial():
+    vis = _visualizador(CSV_SC)
+    figura = vis.criar_top_municipios()
+    cubo = vis.cubo
+    vis.limpar_estruturas()
+    assert vis.cubo is not cubo
+    assert vis.criar_top_municipios() is not figura
+    assert vis.criar_top_municipios().to_json() == figura.to_json()
@@ -1,149 +1,591 @@
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import json
 import os
 import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 
+import agregacaoDados
+import cacheDados
+import conjuntoDados
+import consultaDados
+import espacialDados
+import eventosDados
+import exportacaoHtml
+import formatoBinario
+import incrementalDados
+import instrumentacaoDados
+import leituraDados
+import ordenacaoDados
+import registroFiguras
+import temporalDados
+from instrumentacaoDados import instrumentado
+from importacaoTardia import modulo_tardio
+from registroFiguras import figura_memoizada
+
+# pandas e plotly só são importados quando uma figura é de fato construída
+pd = modulo_tardio('pandas')
+px = modulo_tardio('plotly.express')
+go = modulo_tardio('plotly.graph_objects')
+subplots = modulo_tardio('plotly.subplots')
+
+# Bytes do fim do arquivo comparados para saber se ele apenas cresceu
+BYTES_FINAL_ARQUIVO = 4096
+
+# Visões filtradas mantidas em memória
+MAX_VISOES = 16
+
+# Eventos de fogo desenhados no painel (os de mais focos)
+MAX_EVENTOS_PAINEL = 500
+
+# Gravado na pasta do dashboard: de quais dados e parâmetros ele foi gerado
+CARIMBO_DASHBOARD = '.dashboard.json'
+VERSAO_CARIMBO = 1
+
+
+def _medir_carga(vis, _):
+    """Linhas carregadas e bytes lidos (para a instrumentação)"""
+    if vis.conjunto is not None:
+        lidos = sum(os.path.getsize(c) for c in vis.conjunto.arquivos)
+    else:
+        lidos = os.path.getsize(vis.arquivo_csv)
+    return len(vis.df), lidos
+
+
+def _medir_figura(vis, _, filtro=None):
+    """Linhas da visão de onde a figura saiu (a filtrada, se houver filtro)"""
+    if filtro is not None:
+        vis = vis.visao_filtrada(filtro)
+    return len(vis.df), None
+
+
+def _medir_html(vis, caminho, *_, **__):
+    return len(vis.df), os.path.getsize(caminho)
+
+
+def localizar_arquivo_csv(arquivo_fornecido, interativo=False, verboso=True):
+    """
+    Procura o arquivo CSV em diferentes localizações possíveis
+    Com verboso=False não imprime nada e não pergunta: só levanta FileNotFoundError
+    """
+    # Lista de possíveis locais onde o arquivo pode estar
+    possiveis_caminhos = []
+    
+    if arquivo_fornecido:
+        # Se um arquivo foi fornecido, adiciona ele primeiro
+        possiveis_caminhos.append(arquivo_fornecido)
+    
+    # Adicionar caminhos padrão baseados na estrutura do projeto
+    base_dir = Path.cwd()  # Diretório atual
+    
+    # Estrutura esperada: APS/output/dados_ordenados.csv
+    possiveis_caminhos.extend([
+        base_dir / 'output' / 'dados_ordenados.csv',
+        base_dir / 'output' / 'dados.csv',
+        base_dir / 'dados_ordenados.csv',
+        base_dir / '..' / 'output' / 'dados_ordenados.csv',
+        Path('output/dados_ordenados.csv'),
+        Path('dados_ordenados.csv'),
+        Path('../output/dados_ordenados.csv')
+    ])
+    
+    # Procurar o arquivo
+    for caminho in possiveis_caminhos:
+        caminho = Path(caminho)
+        if caminho.exists() and caminho.is_file():
+            if verboso:
+                print(f"Arquivo CSV encontrado em: {caminho.resolve()}")
+            return str(caminho.resolve())
+    
+    if not verboso:
+        raise FileNotFoundError("Arquivo CSV de focos não encontrado; informe o caminho")
+    
+    # Se não encontrou, listar arquivos disponíveis
+    print("Arquivo CSV não encontrado nos locais esperados!")
+    print("\nEstrutura atual do diretório:")
+    
+    # Mostrar estrutura de pastas
+    print(f"\nDiretório atual: {base_dir}")
+    
+    # Verificar se existe pasta output
+    output_dir = base_dir / 'output'
+    if output_dir.exists():
+        print(f"\nConteúdo da pasta 'output':")
+        for arquivo in output_dir.iterdir():
+            if arquivo.suffix == '.csv':
+                print(f"   - {arquivo.name}")
+    else:
+        print("Pasta 'output' não encontrada")
+    
+    # Listar CSVs no diretório atual
+    csvs_local = list(base_dir.glob('*.csv'))
+    if csvs_local:
+        print(f"\nArquivos CSV no diretório atual:")
+        for csv in csvs_local:
+            print(f"   - {csv.name}")
+    
+    if not interativo:
+        # Sem terminal (jobs em lote): falha em vez de esperar resposta
+        raise FileNotFoundError("Arquivo CSV de focos não encontrado; informe o caminho")
+    
+    # Pedir ao usuário o caminho correto
+    print("\n" + "="*50)
+    caminho_usuario = input("Digite o caminho completo para o arquivo CSV ordenado\n(ou pressione Enter para sair): ").strip()
+    
+    if caminho_usuario:
+        if Path(caminho_usuario).exists():
+            return caminho_usuario
+        else:
+            print(f"Arquivo '{caminho_usuario}' não existe!")
+            sys.exit(1)
+    else:
+        print("\nDicas:")
+        print("1. Execute primeiro o programa MergeSort em C")
+        print("2. Certifique-se que o arquivo 'dados_ordenados.csv' foi gerado")
+        print("3. Verifique se está na pasta 'output'")
+        print("\nVocê pode especificar o arquivo ao executar:")
+        print("   python visualizador_plotly.py caminho/para/arquivo.csv")
+        sys.exit(1)
+
+
+def versao_fonte(arquivo_csv=None, ufs=None, anos=None):
+    """
+    Versão dos dados de entrada (a mesma de versao_dados) sem carregá-los:
+    só o nome, o tamanho e o mtime dos arquivos
+    """
+    if ufs is not None or anos is not None or (
+            arquivo_csv is not None and conjuntoDados.eh_conjunto(arquivo_csv)):
+        return conjuntoDados.ConjuntoDados(arquivo_csv, ufs, anos).versao()
+    arquivo_csv = localizar_arquivo_csv(arquivo_csv, verboso=False)
+    assinatura = cacheDados.assinatura_arquivo(arquivo_csv, com_hash=False)
+    return (assinatura['caminho'], assinatura['tamanho'], assinatura['mtime_ns'])
+
+
+def parametros_dashboard(limite_pontos_mapa, ordem=None, compressao=None,
+                         janela_media=temporalDados.JANELA_PADRAO,
+                         distancia_evento_km=eventosDados.DISTANCIA_PADRAO_KM,
+                         horas_evento=eventosDados.HORAS_PADRAO):
+    """Parâmetros que mudam o HTML gerado (além dos dados)"""
+    return {'limite_pontos_mapa': limite_pontos_mapa, 'ordem': ordem, 'compressao': compressao,
+            'janela_media': janela_media, 'distancia_evento_km': distancia_evento_km,
+            'horas_evento': horas_evento}
+
+
+def _carimbo(versao_dados, parametros):
+    # Ida e volta pelo JSON: tuplas viram listas dos dois lados da comparação
+    return json.loads(json.dumps({
+        'versao': VERSAO_CARIMBO, 'dados': versao_dados, 'parametros': parametros,
+    }))
+
+
+def dashboard_em_dia(pasta, versao_dados, parametros):
+    """Caminho do index.html se o dashboard da pasta foi gerado destes dados e parâmetros"""
+    caminho_index = os.path.join(pasta, 'index.html')
+    if not (os.path.exists(caminho_index) and os.path.exists(os.path.join(pasta, 'dashboard.html'))):
+        return None
+    try:
+        with open(os.path.join(pasta, CARIMBO_DASHBOARD), encoding='utf-8') as arquivo:
+            carimbo = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    return caminho_index if carimbo == _carimbo(versao_dados, parametros) else None
+
+
 class VisualizadorFocosPlotly:
-    def __init__(self, arquivo_csv=None):
+    def __init__(self, arquivo_csv=None, usar_cache=True, pasta_cache=None,
+                 linhas_por_bloco=leituraDados.LINHAS_POR_BLOCO,
+                 limite_pontos_mapa=espacialDados.LIMITE_PONTOS_MAPA, df=None,
+                 ufs=None, anos=None, processos=None, interativo=None, instrumentacao=None,
+                 janela_media=temporalDados.JANELA_PADRAO,
+                 distancia_evento_km=eventosDados.DISTANCIA_PADRAO_KM,
+                 horas_evento=eventosDados.HORAS_PADRAO, motor='auto'):
         """
         Inicializa o visualizador
         Procura o arquivo CSV em diferentes locais possíveis
+        arquivo_csv também pode ser um conjunto (glob, pasta ou manifesto),
+        podado por ufs/anos e lido com processos em paralelo
+        Com df, usa o DataFrame já carregado (visões filtradas)
+        interativo: pergunta o caminho se não achar o arquivo (padrão: só com terminal)
+        instrumentacao: instrumentacaoDados.Instrumentacao que mede as etapas
+        janela_media: dias da média móvel das séries temporais
+        distancia_evento_km, horas_evento: focos mais próximos que isso são do mesmo evento de fogo
+        motor: motor de leitura do CSV (leituraDados.MOTORES)
         """
-        self.arquivo_csv = self.encontrar_arquivo_csv(arquivo_csv)
+        self.instrumentacao = instrumentacao
+        self.interativo = sys.stdin.isatty() if interativo is None else interativo
+        self.processos = processos
+        self.conjunto = None
+        if df is None and arquivo_csv is not None and (
+                ufs is not None or anos is not None or conjuntoDados.eh_conjunto(arquivo_csv)):
+            self.conjunto = conjuntoDados.ConjuntoDados(arquivo_csv, ufs, anos)
+            self.arquivo_csv = str(arquivo_csv)
+        else:
+            self.arquivo_csv = arquivo_csv if df is not None else self.encontrar_arquivo_csv(arquivo_csv)
+        self.usar_cache = usar_cache
+        self.pasta_cache = pasta_cache
+        self.linhas_por_bloco = linhas_por_bloco
+        self.motor = motor
+        self.limite_pontos_mapa = limite_pontos_mapa
+        self.janela_media = janela_media
+        self.distancia_evento_km = distancia_evento_km
+        self.horas_evento = horas_evento
         self.df = None
-        self.carregar_dados()
+        self.versao_dados = None
+        self._cubo = None
+        self._serie = None
+        self._eventos = None
+        self._indice = None
+        self._visoes = OrderedDict()
+        self._pontos_mapa = {}
+        # Os painéis do dashboard rodam em threads e compartilham estas estruturas
+        self._trava_estruturas = threading.RLock()
+        self.ordem = None
+        self.figuras = registroFiguras.RegistroFiguras()
+        registroFiguras.registrar_metodos(self, self.figuras)
+        if df is None:
+            self.carregar_dados()
+        else:
+            self.df = df
     
     def encontrar_arquivo_csv(self, arquivo_fornecido):
         """
         Procura o arquivo CSV em diferentes localizações possíveis
         """
-        # Lista de possíveis locais onde o arquivo pode estar
-        possiveis_caminhos = []
-        
-        if arquivo_fornecido:
-            # Se um arquivo foi fornecido, adiciona ele primeiro
-            possiveis_caminhos.append(arquivo_fornecido)
-        
-        # Adicionar caminhos padrão baseados na estrutura do projeto
-        base_dir = Path.cwd()  # Diretório atual
-        
-        # Estrutura esperada: APS/output/dados_ordenados.csv
-        possiveis_caminhos.extend([
-            base_dir / 'output' / 'dados_ordenados.csv',
-            base_dir / 'output' / 'dados.csv',
-            base_dir / 'dados_ordenados.csv',
-            base_dir / '..' / 'output' / 'dados_ordenados.csv',
-            Path('output/dados_ordenados.csv'),
-            Path('dados_ordenados.csv'),
-            Path('../output/dados_ordenados.csv')
-        ])
-        
-        # Procurar o arquivo
-        for caminho in possiveis_caminhos:
-            caminho = Path(caminho)
-            if caminho.exists() and caminho.is_file():
-                print(f"Arquivo CSV encontrado em: {caminho.resolve()}")
-                return str(caminho.resolve())
-        
-        # Se não encontrou, listar arquivos disponíveis
-        print("Arquivo CSV não encontrado nos locais esperados!")
-        print("\nEstrutura atual do diretório:")
-        
-        # Mostrar estrutura de pastas
-        print(f"\nDiretório atual: {base_dir}")
-        
-        # Verificar se existe pasta output
-        output_dir = base_dir / 'output'
-        if output_dir.exists():
-            print(f"\nConteúdo da pasta 'output':")
-            for arquivo in output_dir.iterdir():
-                if arquivo.suffix == '.csv':
-                    print(f"   - {arquivo.name}")
-        else:
-            print("Pasta 'output' não encontrada")
-        
-        # Listar CSVs no diretório atual
-        csvs_local = list(base_dir.glob('*.csv'))
-        if csvs_local:
-            print(f"\nArquivos CSV no diretório atual:")
-            for csv in csvs_local:
-                print(f"   - {csv.name}")
-        
-        # Pedir ao usuário o caminho correto
-        print("\n" + "="*50)
-        caminho_usuario = input("Digite o caminho completo para o arquivo CSV ordenado\n(ou pressione Enter para sair): ").strip()
-        
-        if caminho_usuario:
-            if Path(caminho_usuario).exists():
-                return caminho_usuario
-            else:
-                print(f"Arquivo '{caminho_usuario}' não existe!")
-                sys.exit(1)
-        else:
-            print("\nDicas:")
-            print("1. Execute primeiro o programa MergeSort em C")
-            print("2. Certifique-se que o arquivo 'dados_ordenados.csv' foi gerado")
-            print("3. Verifique se está na pasta 'output'")
-            print("\nVocê pode especificar o arquivo ao executar:")
-            print("   python visualizador_plotly.py caminho/para/arquivo.csv")
-            sys.exit(1)
+        return localizar_arquivo_csv(arquivo_fornecido, self.interativo)
         
+    @instrumentado(medir=_medir_carga)
     def carregar_dados(self):
-        """Carrega e prepara os dados"""
+        """Carrega e prepara os dados (usando o cache em disco quando válido)"""
         try:
             print(f"Carregando dados de: {self.arquivo_csv}")
+            self.limpar_estruturas()
+            self.ordem = None
             
-            # Ler CSV
-            self.df = pd.read_csv(self.arquivo_csv)
+            if self.conjunto is not None:
+                self.df = self.conjunto.carregar(self.processos, self.linhas_por_bloco,
+                                                 self.usar_cache, self.pasta_cache)
+                self.atualizar_versao_dados()
+                print(f"{len(self.df)} registros carregados de {len(self.conjunto)} arquivo(s)!")
+                if self.conjunto.descartados:
+                    print(f"{len(self.conjunto.descartados)} arquivo(s) fora dos estados/anos pedidos")
+                print(f"Período: {self.df['data_pas'].min()} até {self.df['data_pas'].max()}")
+                return
             
-            # Limpar espaços
-            self.df.columns = self.df.columns.str.strip()
-            for col in self.df.select_dtypes(include=['object']).columns:
-                self.df[col] = self.df[col].str.strip()
+            if formatoBinario.eh_binario(self.arquivo_csv):
+                # Saída binária da ordenação: colunas mapeadas do arquivo, sem parse
+                self.df = formatoBinario.abrir_binario(self.arquivo_csv, colunas=self.colunas_binario())
+                self.atualizar_versao_dados()
+                print(f"{len(self.df)} registros mapeados do arquivo binário!")
+                print(f"Período: {self.df['data_pas'].min()} até {self.df['data_pas'].max()}")
+                return
             
-            # Converter data
-            self.df['data_pas'] = pd.to_datetime(self.df['data_pas'])
+            if self.usar_cache:
+                df_cache = cacheDados.carregar_cache(self.arquivo_csv, self.pasta_cache)
+                if df_cache is not None:
+                    self.df = df_cache
+                    self.atualizar_versao_dados()
+                    print(f"{len(self.df)} registros carregados do cache!")
+                    print(f"Período: {self.df['data_pas'].min()} até {self.df['data_pas'].max()}")
+                    return
             
-            # Criar colunas auxiliares
-            self.df['mes'] = self.df['data_pas'].dt.month
-            self.df['mes_nome'] = self.df['data_pas'].dt.strftime('%B')
-            self.df['dia_semana'] = self.df['data_pas'].dt.day_name()
-            self.df['hora'] = self.df['data_pas'].dt.hour
-            self.df['data'] = self.df['data_pas'].dt.date
+            # Ler CSV em blocos com tipos explícitos (categorias, int64, float32)
+            self.df = leituraDados.carregar_csv(self.arquivo_csv, self.linhas_por_bloco, self.motor)
+            self.atualizar_versao_dados()
             
             print(f"{len(self.df)} registros carregados!")
             print(f"Período: {self.df['data_pas'].min()} até {self.df['data_pas'].max()}")
             
+            if self.usar_cache:
+                try:
+                    caminho_cache = cacheDados.salvar_cache(self.arquivo_csv, self.df, self.pasta_cache)
+                    print(f"Cache salvo em: {caminho_cache}")
+                except Exception as e:
+                    print(f"⚠️  Não foi possível salvar o cache: {e}")
+            
         except Exception as e:
             print(f"Erro ao carregar dados: {e}")
             raise
     
+    def colunas_binario(self):
+        """Colunas lidas do arquivo binário (o texto sem dicionário fica de fora)"""
+        descritor = formatoBinario.ler_descritor(self.arquivo_csv)
+        return [coluna['nome'] for coluna in descritor['colunas']
+                if coluna['nome'] not in formatoBinario.COLUNAS_TEXTO]
+    
+    def atualizar_versao_dados(self):
+        """Impressão digital dos dados carregados (arquivo, tamanho e mtime)"""
+        if self.conjunto is not None:
+            self.versao_dados = self.conjunto.versao()
+            return self.versao_dados
+        assinatura = cacheDados.assinatura_arquivo(self.arquivo_csv, com_hash=False)
+        self.versao_dados = (assinatura['caminho'], assinatura['tamanho'], assinatura['mtime_ns'])
+        self._final_lido = self._ler_final(assinatura['tamanho'])
+        return self.versao_dados
+    
+    def _ler_final(self, tamanho):
+        """Últimos bytes já lidos do arquivo (para detectar se ele só cresceu)"""
+        with open(self.arquivo_csv, 'rb') as arquivo:
+            arquivo.seek(max(0, tamanho - BYTES_FINAL_ARQUIVO))
+            return arquivo.read(min(tamanho, BYTES_FINAL_ARQUIVO))
+    
+    def recarregar_se_mudou(self):
+        """
+        Verifica se o CSV mudou desde a última leitura
+        Se linhas foram apenas anexadas ao fim, lê só o trecho novo e aplica
+        o delta ao cubo; qualquer outra mudança recarrega o arquivo inteiro
+        Retorna None (sem mudança), 'anexado' ou 'recarregado'
+        """
+        if self.conjunto is not None:
+            # Conjunto: relista os arquivos (podem ter surgido novos) e relê se algo mudou
+            self.conjunto.resolver()
+            if self.conjunto.versao() == self.versao_dados:
+                return None
+            self.carregar_dados()
+            return 'recarregado'
+        
+        assinatura = cacheDados.assinatura_arquivo(self.arquivo_csv, com_hash=False)
+        _, tamanho, mtime_ns = self.versao_dados
+        if assinatura['tamanho'] == tamanho and assinatura['mtime_ns'] == mtime_ns:
+            return None
+        
+        so_cresceu = (
+            not formatoBinario.eh_binario(self.arquivo_csv)
+            and assinatura['tamanho'] > tamanho
+            and self._final_lido.endswith(b'\n')
+            and self._ler_final(tamanho) == self._final_lido
+        )
+        if not so_cresceu:
+            self.carregar_dados()
+            return 'recarregado'
+        
+        df_novo = leituraDados.carregar_csv_a_partir(self.arquivo_csv, tamanho, self.linhas_por_bloco)
+        if self.ordem is not None:
+            # Os dados em memória foram reordenados: não espelham mais o arquivo
+            self.carregar_dados()
+            return 'recarregado'
+        self._incorporar(df_novo)
+        print(f"{len(df_novo)} registros novos lidos do fim do arquivo")
+        return 'anexado'
+    
+    def _incorporar(self, df_lote, posicoes=None):
+        """
+        Junta um lote já lido ao DataFrame, ao cubo e ao cache em disco
+        posicoes: linha de cada registro do lote no arquivo (None: no fim),
+        para que o DataFrame e o cache continuem na ordem do arquivo
+        """
+        versao_anterior, linhas_anteriores = self.versao_dados, len(self.df)
+        if len(df_lote):
+            self.df = leituraDados.intercalar_blocos(self.df, df_lote, posicoes)
+            if self._cubo is not None:
+                self._cubo.adicionar(df_lote)
+            self._serie = None
+            self._eventos = None
+            self._indice = None
+            self._visoes.clear()
+            self._pontos_mapa = {}
+            self.ordem = None
+        self.atualizar_versao_dados()
+        
+        if self.usar_cache:
+            try:
+                # Só o lote é gravado; sem o cache da versão anterior, grava tudo
+                if not cacheDados.anexar_cache(self.arquivo_csv, df_lote, versao_anterior,
+                                               linhas_anteriores, posicoes, self.pasta_cache, self.df):
+                    cacheDados.salvar_cache(self.arquivo_csv, self.df, self.pasta_cache)
+            except Exception as e:
+                print(f"⚠️  Não foi possível atualizar o cache: {e}")
+    
+    def chave_figura(self, parametros=()):
+        """Chave de memoização de uma figura: versão dos dados + parâmetros usados"""
+        return (self.versao_dados,) + tuple(getattr(self, p) for p in parametros)
+    
+    def _estrutura(self, atributo, construtor):
+        """Devolve a estrutura guardada em atributo, construindo-a uma só vez mesmo entre threads"""
+        valor = getattr(self, atributo)
+        if valor is None:
+            with self._trava_estruturas:
+                valor = getattr(self, atributo)
+                if valor is None:
+                    valor = construtor()
+                    setattr(self, atributo, valor)
+        return valor
+    
+    def limpar_estruturas(self):
+        """Descarta as estruturas derivadas de self.df e as figuras guardadas (reconstruídas sob demanda)"""
+        with self._trava_estruturas:
+            self._cubo = None
+            self._serie = None
+            self._eventos = None
+            self._indice = None
+            self._visoes.clear()
+            self._pontos_mapa = {}
+            self.figuras.limpar()
+    
+    @property
+    def cubo(self):
+        """Cubo de contagens usado pelos gráficos (construído na primeira vez)"""
+        return self._estrutura('_cubo', lambda: agregacaoDados.CuboAgregado(self.df))
+    
+    @property
+    def serie(self):
+        """Séries diárias (total e por bioma) em calendário contínuo (construídas na primeira vez)"""
+        return self._estrutura('_serie', lambda: temporalDados.SerieTemporal.de_focos(self.df))
+    
+    @property
+    def eventos(self):
+        """Focos agrupados em eventos de fogo (construídos na primeira vez)"""
+        return self._estrutura('_eventos', lambda: eventosDados.EventosFogo.de_focos(
+            self.df, self.distancia_evento_km, self.horas_evento
+        ))
+    
+    def anexar_lote(self, arquivo_lote, campos='data_pas', decrescente=False):
+        """
+        Incorpora um lote novo sem recarregar tudo: o lote é intercalado no CSV
+        ordenado, entra no DataFrame nas mesmas posições, é aplicado como delta
+        ao cubo e gravado como uma parte a mais do cache
+        """
+        if self.conjunto is not None:
+            raise ValueError("Lotes só podem ser anexados a um único CSV ordenado, não a um conjunto")
+        if formatoBinario.eh_binario(self.arquivo_csv):
+            raise ValueError("Lotes só podem ser anexados ao CSV ordenado, não ao arquivo binário")
+        print(f"Anexando lote: {arquivo_lote}")
+        resultado = incrementalDados.anexar_lote_ordenado(
+            self.arquivo_csv, arquivo_lote, campos, decrescente, detalhar=True
+        )
+        
+        if self.ordem is not None:
+            # Os dados em memória foram reordenados: não espelham mais o arquivo
+            self.carregar_dados()
+            print(f"{resultado['linhas_lote']} registros anexados ({resultado['modo']})")
+            return resultado
+        
+        # As linhas como foram gravadas, na posição em que ficaram no arquivo
+        df_lote = leituraDados.carregar_linhas(self.arquivo_csv, resultado.pop('linhas'),
+                                               self.linhas_por_bloco)
+        self._incorporar(df_lote, resultado.pop('posicoes'))
+        
+        print(f"{len(df_lote)} registros anexados ({resultado['modo']})")
+        return resultado
+    
+    def mapa_agregado(self):
+        """Indica se os mapas devem usar células agregadas em vez dos pontos"""
+        return len(self.df) > self.limite_pontos_mapa
+    
+    def pontos_mapa(self, coluna_grupo=None):
+        """Células agregadas (lat, lon, focos) que cabem no limite de pontos do mapa"""
+        chave = (coluna_grupo, self.limite_pontos_mapa)
+        with self._trava_estruturas:
+            if chave not in self._pontos_mapa:
+                pontos, zoom = espacialDados.reduzir_pontos(
+                    self.df, self.limite_pontos_mapa, coluna_grupo
+                )
+                print(f"   {len(self.df)} focos agregados em {len(pontos)} células (zoom {zoom})")
+                self._pontos_mapa[chave] = pontos
+            return self._pontos_mapa[chave]
+    
+    @property
+    def indice(self):
+        """Índices temporal, invertidos e espacial usados nas consultas (construídos na primeira vez)"""
+        return self._estrutura('_indice', lambda: consultaDados.IndiceFocos(self.df))
+    
+    def filtrar(self, filtro=None, **criterios):
+        """
+        Visualizador apenas com os focos do filtro
+        filtro: consultaDados.Filtro, texto ('bioma=Pampa; mes=3') ou dicionário
+        A visão compartilha as colunas categóricas e tem cache de figuras próprio
+        """
+        filtro = consultaDados.Filtro.criar(filtro, **criterios)
+        return self.visao_posicoes(self.indice.selecionar(filtro), filtro)
+
+    def visao_posicoes(self, indices, filtro):
+        """Visualizador com as linhas indices, já selecionadas pelo filtro (ex.: em publicacaoDados)"""
+        visao = type(self)(
+            self.arquivo_csv,
+            usar_cache=False,
+            linhas_por_bloco=self.linhas_por_bloco,
+            limite_pontos_mapa=self.limite_pontos_mapa,
+            df=self.df.iloc[indices].reset_index(drop=True),
+            janela_media=self.janela_media,
+            distancia_evento_km=self.distancia_evento_km,
+            horas_evento=self.horas_evento
+        )
+        visao.versao_dados = (self.versao_dados, filtro.chave())
+        return visao
+    
+    def visao_filtrada(self, filtro):
+        """Visão do filtro guardada em LRU pela versão dos dados; sem critérios, o próprio visualizador"""
+        filtro = consultaDados.Filtro.criar(filtro)
+        if filtro.vazio:
+            return self
+        chave = (self.versao_dados, filtro.chave())
+        if chave in self._visoes:
+            self._visoes.move_to_end(chave)
+            return self._visoes[chave]
+        visao = self.filtrar(filtro)
+        self._visoes[chave] = visao
+        while len(self._visoes) > MAX_VISOES:
+            self._visoes.popitem(last=False)
+        return visao
+    
+    def ordenar(self, campos='data_pas', decrescente=False):
+        """Ordena os dados em memória pelos campos do mergeSort (sem passar pelo disco)"""
+        indices = ordenacaoDados.ordenar_indices(self.df, campos, decrescente)
+        self.df = self.df.iloc[indices].reset_index(drop=True)
+        self._indice = None
+        self._eventos = None
+        self._visoes.clear()
+        self.ordem = (campos, decrescente)
+        # A ordem dos pontos muda os traces; figuras guardadas não valem mais
+        self.figuras.limpar()
+        return self.df
+    
+    @instrumentado(medir=_medir_figura)
+    @figura_memoizada('limite_pontos_mapa')
     def criar_mapa_interativo(self):
         """Cria mapa interativo com os focos"""
         print("Criando mapa interativo...")
         
-        fig = px.scatter_mapbox(
-            self.df,
-            lat='lat',
-            lon='lon',
-            hover_name='municipio',
-            hover_data={
-                'estado': True,
-                'bioma': True,
-                'data_pas': '|%Y-%m-%d %H:%M',
-                'lat': ':.4f',
-                'lon': ':.4f'
-            },
-            color='bioma',
-            color_discrete_sequence=px.colors.qualitative.Set1,
-            zoom=6,
-            height=700,
-            title='Focos de Calor - Mapa - Santa Catarina'
-        )
+        if self.mapa_agregado():
+            # Muitos pontos: células agregadas com tamanho pelo número de focos
+            pontos = self.pontos_mapa('bioma')
+            fig = px.scatter_mapbox(
+                pontos,
+                lat='lat',
+                lon='lon',
+                size=espacialDados.tamanho_marcador(pontos['focos']),
+                size_max=30,
+                hover_data={
+                    'focos': True,
+                    'bioma': True,
+                    'lat': ':.4f',
+                    'lon': ':.4f'
+                },
+                color='bioma',
+                color_discrete_sequence=px.colors.qualitative.Set1,
+                zoom=6,
+                height=700,
+                title='Focos de Calor - Mapa - Santa Catarina'
+            )
+        else:
+            fig = px.scatter_mapbox(
+                self.df,
+                lat='lat',
+                lon='lon',
+                hover_name='municipio',
+                hover_data={
+                    'estado': True,
+                    'bioma': True,
+                    'data_pas': '|%Y-%m-%d %H:%M',
+                    'lat': ':.4f',
+                    'lon': ':.4f'
+                },
+                color='bioma',
+                color_discrete_sequence=px.colors.qualitative.Set1,
+                zoom=6,
+                height=700,
+                title='Focos de Calor - Mapa - Santa Catarina'
+            )
         
         fig.update_layout(
             mapbox_style="open-street-map",
@@ -153,13 +595,23 @@ class VisualizadorFocosPlotly:
         
         return fig
     
+    @instrumentado(medir=_medir_figura)
+    @figura_memoizada('limite_pontos_mapa')
     def criar_mapa_densidade(self):
         """Cria mapa de densidade (heatmap)"""
         print("Criando mapa de densidade...")
         
+        if self.mapa_agregado():
+            # Células agregadas com peso igual ao número de focos
+            pontos = self.pontos_mapa()
+            lat, lon, peso = pontos['lat'], pontos['lon'], pontos['focos']
+        else:
+            lat, lon, peso = self.df['lat'], self.df['lon'], None
+        
         fig = go.Figure(go.Densitymapbox(
-            lat=self.df['lat'],
-            lon=self.df['lon'],
+            lat=lat,
+            lon=lon,
+            z=peso,
             radius=15,
             colorscale='Hot',
             showscale=True,
@@ -183,12 +635,14 @@ class VisualizadorFocosPlotly:
         
         return fig
     
+    @instrumentado(medir=_medir_figura)
+    @figura_memoizada('janela_media')
     def criar_serie_temporal(self):
         """Cria gráfico de série temporal"""
         print("📈 Criando série temporal...")
         
-        # Agrupar por dia
-        focos_dia = self.df.groupby('data').size().reset_index(name='focos')
+        # Focos por dia, com zero nos dias sem focos
+        focos_dia = self.serie.serie().reset_index()
         
         fig = px.line(
             focos_dia,
@@ -202,9 +656,9 @@ class VisualizadorFocosPlotly:
         # Adicionar linha de tendência
         fig.add_trace(go.Scatter(
             x=focos_dia['data'],
-            y=focos_dia['focos'].rolling(window=7, center=True).mean(),
+            y=self.serie.media_movel(self.janela_media)[0],
             mode='lines',
-            name='Média Móvel (7 dias)',
+            name=f'Média Móvel ({self.janela_media} dias)',
             line=dict(color='red', width=2, dash='dash')
         ))
         
@@ -218,11 +672,13 @@ class VisualizadorFocosPlotly:
         
         return fig
     
+    @instrumentado(medir=_medir_figura)
+    @figura_memoizada()
     def criar_top_municipios(self):
         """Cria gráfico dos top municípios"""
         print("🏙️ Criando ranking de municípios...")
         
-        top_15 = self.df['municipio'].value_counts().head(15)
+        top_15 = self.cubo.maiores('municipio', 15)
         
         fig = px.bar(
             x=top_15.values,
@@ -244,12 +700,14 @@ class VisualizadorFocosPlotly:
         
         return fig
     
+    @instrumentado(medir=_medir_figura)
+    @figura_memoizada()
     def criar_analise_temporal_completa(self):
         """Cria análise temporal múltipla"""
         print("🕐 Criando análise temporal completa...")
         
         # Criar subplots
-        fig = make_subplots(
+        fig = subplots.make_subplots(
             rows=2, cols=2,
             subplot_titles=('Distribuição por Hora do Dia', 
                           'Distribuição por Dia da Semana',
@@ -260,7 +718,7 @@ class VisualizadorFocosPlotly:
         )
         
         # Por hora
-        por_hora = self.df['hora'].value_counts().sort_index()
+        por_hora = self.cubo.por_hora()
         fig.add_trace(
             go.Bar(x=por_hora.index, y=por_hora.values, 
                    marker_color='lightblue', name='Por Hora'),
@@ -268,9 +726,7 @@ class VisualizadorFocosPlotly:
         )
         
         # Por dia da semana
-        dias_ordem = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 
-                     'Friday', 'Saturday', 'Sunday']
-        por_dia = self.df['dia_semana'].value_counts().reindex(dias_ordem)
+        por_dia = self.cubo.por_dia_semana()
         dias_pt = ['Seg', 'Ter', 'Qua', 'Qui', 'Sex', 'Sáb', 'Dom']
         fig.add_trace(
             go.Bar(x=dias_pt, y=por_dia.values, 
@@ -281,7 +737,7 @@ class VisualizadorFocosPlotly:
         # Por mês
         meses_nomes = {1:'Jan', 2:'Fev', 3:'Mar', 4:'Abr', 5:'Mai', 6:'Jun',
                       7:'Jul', 8:'Ago', 9:'Set', 10:'Out', 11:'Nov', 12:'Dez'}
-        por_mes = self.df['mes'].value_counts().sort_index()
+        por_mes = self.cubo.por_mes()
         fig.add_trace(
             go.Bar(x=[meses_nomes[m] for m in por_mes.index], 
                    y=por_mes.values, marker_color='coral', name='Por Mês'),
@@ -289,8 +745,7 @@ class VisualizadorFocosPlotly:
         )
         
         # Heatmap hora vs dia
-        pivot_table = pd.crosstab(self.df['hora'], self.df['dia_semana'])
-        pivot_table = pivot_table.reindex(columns=dias_ordem, fill_value=0)
+        pivot_table = self.cubo.hora_por_dia_semana()
         
         fig.add_trace(
             go.Heatmap(
@@ -322,12 +777,14 @@ class VisualizadorFocosPlotly:
         
         return fig
     
+    @instrumentado(medir=_medir_figura)
+    @figura_memoizada()
     def criar_analise_bioma(self):
         """Cria análise por bioma"""
         print("🌳 Criando análise por bioma...")
         
         # Criar subplot com pizza e barras
-        fig = make_subplots(
+        fig = subplots.make_subplots(
             rows=1, cols=2,
             subplot_titles=('Distribuição por Bioma', 
                           'Evolução Temporal por Bioma'),
@@ -335,7 +792,7 @@ class VisualizadorFocosPlotly:
         )
         
         # Pizza
-        bioma_counts = self.df['bioma'].value_counts()
+        bioma_counts = self.cubo.por_bioma()
         fig.add_trace(
             go.Pie(
                 labels=bioma_counts.index,
@@ -346,15 +803,13 @@ class VisualizadorFocosPlotly:
             row=1, col=1
         )
         
-        # Série temporal por bioma
-        for bioma in self.df['bioma'].unique():
-            df_bioma = self.df[self.df['bioma'] == bioma]
-            focos_dia = df_bioma.groupby('data').size()
-            
+        # Série temporal por bioma (dias sem focos do bioma com zero)
+        datas = self.serie.eixo()
+        for linha, bioma in enumerate(self.serie.grupos, start=1):
             fig.add_trace(
                 go.Scatter(
-                    x=focos_dia.index,
-                    y=focos_dia.values,
+                    x=datas,
+                    y=self.serie.contagens[linha],
                     mode='lines',
                     name=bioma,
                     line=dict(width=2)
@@ -370,74 +825,74 @@ class VisualizadorFocosPlotly:
         
         return fig
     
-    def criar_dashboard_completo(self):
-        """Cria dashboard unificado com apenas as visualizações essenciais"""
-        print("🎯 Criando dashboard completo...")
-        
-        # Estatísticas
-        total_focos = len(self.df)
-        municipios_afetados = self.df['municipio'].nunique()
-        periodo_dias = (self.df['data_pas'].max() - self.df['data_pas'].min()).days
-        media_diaria = total_focos / max(periodo_dias, 1)
-        
-        # Criar figura com subplots otimizados
-        fig = make_subplots(
-            rows=3, cols=2,
-            subplot_titles=(
-                '📈 Evolução Temporal dos Focos',
-                '🏆 Top 10 Municípios Mais Afetados',
-                '🌿 Biomas Afetados por Mês',
-                '🗺️ Mapa Interativo de Focos'
-            ),
-            specs=[
-                [{'type': 'scatter'}, {'type': 'bar'}],
-                [{'type': 'bar', 'colspan': 2}, None],
-                [{'type': 'scattermapbox', 'colspan': 2}, None]
-            ],
-            row_heights=[0.25, 0.25, 0.5],
-            vertical_spacing=0.08,
-            horizontal_spacing=0.12
+    @instrumentado(medir=_medir_figura)
+    @figura_memoizada('distancia_evento_km', 'horas_evento')
+    def criar_eventos_fogo(self):
+        """Cria gráfico dos eventos de fogo (focos próximos no espaço e no tempo)"""
+        print("🔥 Agrupando focos em eventos de fogo...")
+        
+        resumo = self.eventos.resumo()
+        fig = go.Figure(self._painel_eventos())
+        fig.update_layout(
+            title=(f'🔥 Eventos de Fogo: {resumo["eventos"]} eventos '
+                   f'(focos a até {self.distancia_evento_km:g} km e {self.horas_evento:g} h)'),
+            xaxis_title='Início do Evento',
+            yaxis_title='Duração (horas)',
+            height=500,
+            showlegend=False
         )
         
-        # 1. EVOLUÇÃO TEMPORAL (mais detalhada)
-        focos_dia = self.df.groupby('data').size().reset_index(name='focos')
+        return fig
+    
+    @figura_memoizada('janela_media')
+    def _painel_evolucao_temporal(self):
+        """Traces da evolução temporal (focos diários e média móvel)"""
+        paineis = []
+        
+        # 1. EVOLUÇÃO TEMPORAL (mais detalhada, com zero nos dias sem focos)
+        datas = self.serie.eixo()
         
         # Linha principal
-        fig.add_trace(
+        paineis.append(
             go.Scatter(
-                x=focos_dia['data'], 
-                y=focos_dia['focos'],
+                x=datas, 
+                y=self.serie.total,
                 mode='lines+markers',
                 name='Focos Diários',
                 line=dict(color='#FF6B6B', width=2),
                 marker=dict(size=6, color='#FF6B6B'),
                 hovertemplate='<b>Data:</b> %{x}<br><b>Focos:</b> %{y}<extra></extra>'
-            ),
-            row=1, col=1
+            )
         )
         
         # Média móvel
-        fig.add_trace(
+        paineis.append(
             go.Scatter(
-                x=focos_dia['data'],
-                y=focos_dia['focos'].rolling(window=7, center=True).mean(),
+                x=datas,
+                y=self.serie.media_movel(self.janela_media)[0],
                 mode='lines',
-                name='Média 7 dias',
+                name=f'Média {self.janela_media} dias',
                 line=dict(color='#4ECDC4', width=3, dash='dot'),
                 hovertemplate='<b>Média:</b> %{y:.1f}<extra></extra>'
-            ),
-            row=1, col=1
+            )
         )
         
+        return paineis
+    
+    @figura_memoizada()
+    def _painel_top_municipios(self):
+        """Trace de barras dos 10 municípios mais afetados"""
+        paineis = []
+        
         # 2. TOP 10 MUNICÍPIOS (ordenado do mais para o menos afetado)
-        top_10 = self.df['municipio'].value_counts().head(10)
+        top_10 = self.cubo.maiores('municipio', 10)
         # Inverter ordem para mostrar o mais afetado em cima
-        top_10_ordered = top_10.sort_values(ascending=True)
+        top_10_ordered = top_10.iloc[::-1]
         
         # Criar gradiente de cores
         colors = px.colors.sequential.Reds[3:] * 2  # Usar tons de vermelho
         
-        fig.add_trace(
+        paineis.append(
             go.Bar(
                 x=top_10_ordered.values,
                 y=top_10_ordered.index,
@@ -451,46 +906,60 @@ class VisualizadorFocosPlotly:
                 text=[f'{val} focos' for val in top_10_ordered.values],
                 textposition='outside',
                 hovertemplate='<b>%{y}</b><br>Focos: %{x}<extra></extra>'
-            ),
-            row=1, col=2
+            )
         )
         
-        # 3. BIOMAS AFETADOS POR MÊS (gráfico de barras agrupadas)
-        # Criar tabela pivô
-        biomas_mes = self.df.groupby(['mes', 'bioma']).size().reset_index(name='focos')
+        return paineis
+    
+    @figura_memoizada()
+    def _painel_biomas_mes(self):
+        """Traces de barras dos biomas afetados por mês"""
+        paineis = []
         
-        meses_nomes = {1:'Jan', 2:'Fev', 3:'Mar', 4:'Abr', 5:'Mai', 6:'Jun',
-                      7:'Jul', 8:'Ago', 9:'Set', 10:'Out', 11:'Nov', 12:'Dez'}
-        biomas_mes['mes_nome'] = biomas_mes['mes'].map(meses_nomes)
+        # 3. BIOMAS AFETADOS POR MÊS (gráfico de barras agrupadas)
+        # Os 12 meses de cada bioma, já com zero nos meses sem focos
+        biomas_mes = self.serie.por_mes_do_ano()
         
         # Criar uma barra para cada bioma
-        biomas_unicos = self.df['bioma'].unique()
         cores_biomas = ['#2E7D32', '#1B5E20', '#4CAF50', '#81C784']  # Tons de verde
         
-        for i, bioma in enumerate(biomas_unicos):
-            dados_bioma = biomas_mes[biomas_mes['bioma'] == bioma]
-            
-            # Garantir que todos os meses estejam presentes
-            meses_completos = pd.DataFrame({'mes': range(1, 13)})
-            meses_completos['mes_nome'] = meses_completos['mes'].map(meses_nomes)
-            dados_bioma = meses_completos.merge(
-                dados_bioma, on='mes', how='left', suffixes=('', '_y')
-            ).fillna(0)
-            
-            fig.add_trace(
+        for i, bioma in enumerate(self.serie.grupos):
+            paineis.append(
                 go.Bar(
-                    x=dados_bioma['mes_nome_x'] if 'mes_nome_x' in dados_bioma.columns else dados_bioma['mes_nome'],
-                    y=dados_bioma['focos'] if 'focos' in dados_bioma.columns else 0,
+                    x=temporalDados.MESES,
+                    y=biomas_mes[i + 1],
                     name=bioma,
                     marker_color=cores_biomas[i % len(cores_biomas)],
                     hovertemplate=f'<b>{bioma}</b><br>Mês: %{{x}}<br>Focos: %{{y}}<extra></extra>'
-                ),
-                row=2, col=1
+                )
             )
         
+        return paineis
+    
+    @figura_memoizada('limite_pontos_mapa')
+    def _painel_mapa(self):
+        """Trace do mapa de focos (pontos ou células agregadas)"""
+        paineis = []
+        
         # 4. MAPA INTERATIVO (versão original, mais limpa)
-        fig.add_trace(
-            go.Scattermapbox(
+        if self.mapa_agregado():
+            # Células agregadas: tamanho do marcador pelo número de focos
+            pontos = self.pontos_mapa()
+            mapa = go.Scattermapbox(
+                lat=pontos['lat'],
+                lon=pontos['lon'],
+                mode='markers',
+                marker=dict(
+                    size=espacialDados.tamanho_marcador(pontos['focos']),
+                    color='red',
+                    opacity=0.6
+                ),
+                text=pontos['focos'],
+                hovertemplate='<b>%{text} focos</b><br>Lat: %{lat:.4f}<br>Lon: %{lon:.4f}<extra></extra>',
+                name='Focos'
+            )
+        else:
+            mapa = go.Scattermapbox(
                 lat=self.df['lat'],
                 lon=self.df['lon'],
                 mode='markers',
@@ -502,10 +971,92 @@ class VisualizadorFocosPlotly:
                 text=self.df['municipio'],
                 hovertemplate='<b>%{text}</b><br>Lat: %{lat:.4f}<br>Lon: %{lon:.4f}<extra></extra>',
                 name='Focos'
+            )
+        paineis.append(mapa)
+        
+        return paineis
+    
+    @figura_memoizada('distancia_evento_km', 'horas_evento')
+    def _painel_eventos(self):
+        """Trace dos eventos de fogo: início x duração, tamanho pelo número de focos"""
+        paineis = []
+        
+        # 5. EVENTOS DE FOGO (focos agrupados no espaço e no tempo; isolados ficam de fora)
+        eventos = self.eventos.maiores(MAX_EVENTOS_PAINEL)
+        eventos = eventos[eventos['focos'] > 1].sort_values('inicio', kind='stable')
+        
+        paineis.append(
+            go.Scatter(
+                x=eventos['inicio'],
+                y=eventos['duracao_horas'],
+                mode='markers',
+                name='Eventos de Fogo',
+                marker=dict(
+                    size=espacialDados.tamanho_marcador(eventos['focos']),
+                    color=eventos['focos'],
+                    colorscale='YlOrRd',
+                    showscale=False,
+                    line=dict(color='darkred', width=1)
+                ),
+                customdata=eventos[['focos', 'extensao_km']].to_numpy(),
+                text=eventos['municipio'] if 'municipio' in eventos else None,
+                hovertemplate=('<b>%{text}</b><br>Início: %{x}<br>Duração: %{y:.1f} h<br>'
+                               'Focos: %{customdata[0]}<br>Extensão: %{customdata[1]:.1f} km<extra></extra>')
+            )
+        )
+        
+        return paineis
+    
+    @instrumentado(medir=_medir_figura)
+    @figura_memoizada('limite_pontos_mapa', 'janela_media', 'distancia_evento_km', 'horas_evento')
+    def criar_dashboard_completo(self):
+        """Cria dashboard unificado com apenas as visualizações essenciais"""
+        print("🎯 Criando dashboard completo...")
+        
+        # Estatísticas
+        total_focos = self.cubo.total
+        municipios_afetados = self.cubo.municipios_afetados()
+        periodo_dias = (self.cubo.data_max - self.cubo.data_min).days
+        media_diaria = total_focos / max(periodo_dias, 1)
+        
+        # Criar figura com subplots otimizados
+        fig = subplots.make_subplots(
+            rows=4, cols=2,
+            subplot_titles=(
+                '📈 Evolução Temporal dos Focos',
+                '🏆 Top 10 Municípios Mais Afetados',
+                '🌿 Biomas Afetados por Mês',
+                '🗺️ Mapa Interativo de Focos',
+                '🔥 Eventos de Fogo (início x duração)'
             ),
-            row=3, col=1
+            specs=[
+                [{'type': 'scatter'}, {'type': 'bar'}],
+                [{'type': 'bar', 'colspan': 2}, None],
+                [{'type': 'scattermapbox', 'colspan': 2}, None],
+                [{'type': 'scatter', 'colspan': 2}, None]
+            ],
+            row_heights=[0.2, 0.2, 0.4, 0.2],
+            vertical_spacing=0.06,
+            horizontal_spacing=0.12
         )
         
+        # Painéis independentes: construídos em paralelo ou lidos do cache
+        # cubo, serie e eventos são construídos sob trava: uma vez só, mesmo em threads
+        paineis = self.figuras.obter_varios([
+            '_painel_evolucao_temporal', '_painel_top_municipios',
+            '_painel_biomas_mes', '_painel_mapa', '_painel_eventos'
+        ])
+        posicoes = {
+            '_painel_evolucao_temporal': (1, 1),
+            '_painel_top_municipios': (1, 2),
+            '_painel_biomas_mes': (2, 1),
+            '_painel_mapa': (3, 1),
+            '_painel_eventos': (4, 1),
+        }
+        for nome, (linha, coluna) in posicoes.items():
+            for trace in paineis[nome]:
+                fig.add_trace(trace, row=linha, col=coluna)
+        
         # Configurar layout do mapa
         fig.update_layout(
             mapbox=dict(
@@ -513,7 +1064,7 @@ class VisualizadorFocosPlotly:
                 center=dict(lat=-27, lon=-50),
                 zoom=6
             ),
-            height=1000,
+            height=1250,
             showlegend=True,
             title={
                 'text': "DASHBOARD DE ANÁLISE DE FOCOS DE CALOR - SANTA CATARINA",
@@ -536,13 +1087,17 @@ class VisualizadorFocosPlotly:
         fig.update_xaxes(title_text="Mês", row=2, col=1, showgrid=False)
         fig.update_yaxes(title_text="Número de Focos", row=2, col=1, showgrid=True, gridcolor='#E0E0E0')
         
+        fig.update_xaxes(title_text="Início do Evento", row=4, col=1, showgrid=True, gridcolor='#E0E0E0')
+        fig.update_yaxes(title_text="Duração (horas)", row=4, col=1, showgrid=True, gridcolor='#E0E0E0')
+        
         # Adicionar anotação com estatísticas
         stats_text = f"""
         <b>📊 ESTATÍSTICAS GERAIS</b><br>
         Total de Focos: {total_focos}<br>
         Municípios Afetados: {municipios_afetados}<br>
         Período: {periodo_dias} dias<br>
-        Média Diária: {media_diaria:.1f} focos
+        Média Diária: {media_diaria:.1f} focos<br>
+        Eventos de Fogo: {len(self.eventos)}
         """
         
         fig.add_annotation(
@@ -559,7 +1114,8 @@ class VisualizadorFocosPlotly:
         
         return fig
     
-    def salvar_todas_visualizacoes(self, pasta='visualizacoes'):
+    @instrumentado(medir=_medir_html)
+    def salvar_todas_visualizacoes(self, pasta='visualizacoes', compressao=None):
         """Salva e abre diretamente o dashboard"""
         
         # Criar pasta se não existir
@@ -575,20 +1131,47 @@ class VisualizadorFocosPlotly:
         caminho = os.path.join(pasta, 'dashboard.html')
         caminho_index = os.path.join(pasta, 'index.html')
         
-        # Salvar em ambos os arquivos (dashboard.html e index.html)
-        dashboard.write_html(caminho)
-        dashboard.write_html(caminho_index)  # Salva também como index para abrir direto
+        # O carimbo antigo sai antes: um HTML gravado pela metade não fica "em dia"
+        caminho_carimbo = os.path.join(pasta, CARIMBO_DASHBOARD)
+        if os.path.exists(caminho_carimbo):
+            os.remove(caminho_carimbo)
+        
+        # Serializar uma vez; index.html vira um link para o dashboard.html
+        # e o plotly.js fica em um arquivo compartilhado na pasta
+        arquivos = exportacaoHtml.exportar_html(
+            dashboard, caminho, aliases=[caminho_index], compressao=compressao
+        )
+        
+        parametros = parametros_dashboard(self.limite_pontos_mapa, self.ordem, compressao,
+                                          self.janela_media, self.distancia_evento_km,
+                                          self.horas_evento)
+        with open(caminho_carimbo, 'w', encoding='utf-8') as arquivo:
+            json.dump(_carimbo(self.versao_dados, parametros), arquivo)
         
-        print(f"   ✅ Dashboard salvo!")
+        print(f"   ✅ Dashboard salvo! ({arquivos['bytes_html'] / 1024:.0f} KB)")
         print(f"\n🎉 Dashboard gerado com sucesso!")
         print(f"📂 Arquivo: {caminho}")
         
         return caminho_index  # Retorna o caminho do index para abrir
 
 
+def abrir_no_navegador(dashboard_path):
+    """Tenta abrir o dashboard no navegador padrão"""
+    print(f"🌐 Abrindo dashboard no navegador...")
+    import webbrowser
+    if Path(dashboard_path).exists():
+        try:
+            webbrowser.open(str(Path(dashboard_path).resolve()))
+            print("🚀 Dashboard aberto!")
+        except:
+            print(f"⚠️  Não foi possível abrir automaticamente.")
+            print(f"📂 Abra manualmente: {dashboard_path}")
+
+
 # Função principal
 def main():
     import argparse
+    import publicacaoDados
     
     parser = argparse.ArgumentParser(
         description='Visualizador de Focos de Calor com Plotly',
@@ -598,13 +1181,146 @@ def main():
         'arquivo', 
         nargs='?', 
         default=None,
-        help='Caminho para o arquivo CSV ordenado (ex: output/dados_ordenados.csv)'
+        help='CSV ordenado (ex: output/dados_ordenados.csv) ou conjunto: glob entre aspas, pasta ou manifesto'
+    )
+    parser.add_argument(
+        '--ufs',
+        default=None,
+        help='Com um conjunto: estados a carregar (ex: sc,pr)'
+    )
+    parser.add_argument(
+        '--anos',
+        default=None,
+        help='Com um conjunto: anos a carregar (ex: 2024 ou 2020-2024)'
+    )
+    parser.add_argument(
+        '--processos',
+        type=int,
+        default=None,
+        help='Processos de leitura do conjunto e de geração dos dashboards com --lote/--por '
+             '(padrão: até o número de CPUs)'
     )
     parser.add_argument(
         '--output', '-o',
         default='visualizacoes',
         help='Pasta de saída para os HTMLs (padrão: visualizacoes)'
     )
+    parser.add_argument(
+        '--sem-cache',
+        action='store_true',
+        help='Ignora o cache em disco e relê o CSV'
+    )
+    parser.add_argument(
+        '--pasta-cache',
+        default=None,
+        help='Pasta do cache (padrão: .cache_focos ao lado do CSV)'
+    )
+    parser.add_argument(
+        '--linhas-por-bloco',
+        type=int,
+        default=leituraDados.LINHAS_POR_BLOCO,
+        help=f'Linhas lidas por bloco do CSV (padrão: {leituraDados.LINHAS_POR_BLOCO})'
+    )
+    parser.add_argument(
+        '--motor',
+        choices=leituraDados.MOTORES,
+        default='auto',
+        help="Leitor do CSV; 'registros' passa pela tabela compacta e usa menos memória (padrão: auto)"
+    )
+    parser.add_argument(
+        '--ordenar',
+        action='append',
+        default=None,
+        help='Ordena os dados em memória pelo campo (nome ou número 1-9); repita para várias chaves'
+    )
+    parser.add_argument(
+        '--decrescente',
+        action='store_true',
+        help='Usado com --ordenar: ordem decrescente'
+    )
+    parser.add_argument(
+        '--anexar',
+        action='append',
+        default=None,
+        help='Lote novo (CSV do INPE) a intercalar no arquivo ordenado antes de gerar o dashboard'
+    )
+    parser.add_argument(
+        '--limite-pontos-mapa',
+        type=int,
+        default=espacialDados.LIMITE_PONTOS_MAPA,
+        help=f'Acima deste número de focos os mapas usam células agregadas (padrão: {espacialDados.LIMITE_PONTOS_MAPA})'
+    )
+    parser.add_argument(
+        '--janela',
+        type=int,
+        default=temporalDados.JANELA_PADRAO,
+        help=f'Dias da média móvel das séries temporais (padrão: {temporalDados.JANELA_PADRAO})'
+    )
+    parser.add_argument(
+        '--evento-km',
+        type=float,
+        default=eventosDados.DISTANCIA_PADRAO_KM,
+        help=f'Distância máxima entre focos do mesmo evento de fogo (padrão: {eventosDados.DISTANCIA_PADRAO_KM})'
+    )
+    parser.add_argument(
+        '--evento-horas',
+        type=float,
+        default=eventosDados.HORAS_PADRAO,
+        help=f'Intervalo máximo entre focos do mesmo evento de fogo (padrão: {eventosDados.HORAS_PADRAO})'
+    )
+    parser.add_argument(
+        '--compressao',
+        choices=exportacaoHtml.COMPRESSOES,
+        default=None,
+        help='Grava também o HTML pré-comprimido (.gz ou .br)'
+    )
+    parser.add_argument(
+        '--metricas',
+        default=None,
+        help='Grava tempo, CPU, memória, linhas e bytes de cada etapa (.json, ou .prom para Prometheus)'
+    )
+    parser.add_argument(
+        '--perfil',
+        choices=instrumentacaoDados.PERFIS,
+        default=None,
+        help='Roda cada etapa sob o perfilador escolhido (grava em --pasta-perfil)'
+    )
+    parser.add_argument(
+        '--pasta-perfil',
+        default='perfis',
+        help='Pasta dos perfis gerados com --perfil (padrão: perfis)'
+    )
+    parser.add_argument(
+        '--forcar',
+        action='store_true',
+        help='Gera o dashboard mesmo que o da pasta de saída já esteja em dia com os dados'
+    )
+    parser.add_argument(
+        '--sem-navegador',
+        action='store_true',
+        help='Não abre o dashboard no navegador ao final'
+    )
+    parser.add_argument(
+        '--lote',
+        default=None,
+        help="Gera um dashboard por filtro do arquivo (um por linha, ex.: 'bioma=Pampa; mes=3'; - lê da entrada)"
+    )
+    parser.add_argument(
+        '--por',
+        default=None,
+        help=f"Gera um dashboard por combinação de valores das dimensões (ex.: bioma,mes; use {', '.join(publicacaoDados.DIMENSOES)})"
+    )
+    parser.add_argument(
+        '--servir',
+        action='store_true',
+        help='Em vez de gerar o HTML, mantém os dados em memória e serve o dashboard por HTTP'
+    )
+    parser.add_argument(
+        '--porta',
+        type=int,
+        default=8050,
+        help='Porta do servidor usado com --servir (padrão: 8050)'
+    )
     
     args = parser.parse_args()
     
@@ -613,25 +1329,89 @@ def main():
     print("="*60)
     print(f"📍 Diretório de trabalho: {os.getcwd()}")
     
+    # Caminho leve: dashboard já gerado destes dados, sem importar pandas/plotly
+    ordem = (args.ordenar, args.decrescente) if args.ordenar else None
+    lote = args.lote or args.por
+    if not (args.forcar or args.servir or args.anexar or args.metricas or args.perfil or lote):
+        try:
+            versao = versao_fonte(args.arquivo, args.ufs, args.anos)
+        except (OSError, ValueError):
+            # Segue pelo caminho normal, que explica o erro (ou pergunta o caminho)
+            versao = None
+        parametros = parametros_dashboard(args.limite_pontos_mapa, ordem, args.compressao, args.janela,
+                                          args.evento_km, args.evento_horas)
+        dashboard_path = versao and dashboard_em_dia(args.output, versao, parametros)
+        if dashboard_path:
+            print(f"\n✅ Dashboard já está em dia com os dados (use --forcar para gerar de novo)")
+            print(f"📂 Arquivo: {dashboard_path}")
+            if not args.sem_navegador:
+                abrir_no_navegador(dashboard_path)
+            return
+    
+    instrumentacao = None
+    if args.metricas or args.perfil:
+        instrumentacao = instrumentacaoDados.Instrumentacao(
+            perfil=args.perfil, pasta_perfil=args.pasta_perfil
+        )
+    
     # Criar visualizador (ele vai procurar o arquivo automaticamente)
     try:
-        vis = VisualizadorFocosPlotly(args.arquivo)
+        vis = VisualizadorFocosPlotly(
+            args.arquivo,
+            usar_cache=not args.sem_cache,
+            pasta_cache=args.pasta_cache,
+            linhas_por_bloco=args.linhas_por_bloco,
+            motor=args.motor,
+            limite_pontos_mapa=args.limite_pontos_mapa,
+            ufs=args.ufs,
+            anos=args.anos,
+            processos=args.processos,
+            instrumentacao=instrumentacao,
+            janela_media=args.janela,
+            distancia_evento_km=args.evento_km,
+            horas_evento=args.evento_horas
+        )
+        
+        for lote in args.anexar or []:
+            vis.anexar_lote(lote)
+        
+        if args.ordenar:
+            vis.ordenar(args.ordenar, args.decrescente)
+        
+        if args.servir:
+            import servidorDados
+            servidorDados.servir(vis, porta=args.porta, abrir_navegador=True)
+            return
+        
+        if lote:
+            # Dados carregados uma vez; dashboards gerados em processos, sem navegador
+            especificacoes = []
+            if args.por:
+                especificacoes += publicacaoDados.particionar(vis, args.por)
+            if args.lote:
+                especificacoes += publicacaoDados.ler_filtros(args.lote)
+            publicacaoDados.publicar(vis, especificacoes, args.output, args.processos,
+                                     args.compressao, args.forcar)
+            if instrumentacao is not None:
+                if args.metricas:
+                    print(f"📏 Métricas salvas em: {instrumentacao.salvar(args.metricas)}")
+                instrumentacao.encerrar()
+            return
         
         # Salvar dashboard
-        dashboard_path = vis.salvar_todas_visualizacoes(args.output)
+        dashboard_path = vis.salvar_todas_visualizacoes(args.output, args.compressao)
         
-        print("\n✨ Dashboard gerado com sucesso!")
-        print(f"🌐 Abrindo dashboard no navegador...")
+        if instrumentacao is not None:
+            print("\n⏱️  Etapas:")
+            for linha in instrumentacao.resumo():
+                print(linha)
+            if args.metricas:
+                print(f"📏 Métricas salvas em: {instrumentacao.salvar(args.metricas)}")
+            instrumentacao.encerrar()
         
-        # Tentar abrir automaticamente no navegador
-        import webbrowser
-        if Path(dashboard_path).exists():
-            try:
-                webbrowser.open(str(Path(dashboard_path).resolve()))
-                print("🚀 Dashboard aberto!")
-            except:
-                print(f"⚠️  Não foi possível abrir automaticamente.")
-                print(f"📂 Abra manualmente: {dashboard_path}")
+        print("\n✨ Dashboard gerado com sucesso!")
+        if not args.sem_navegador:
+            abrir_no_navegador(dashboard_path)
     
     except Exception as e:
         print(f"\n❌ Erro durante a execução: {e}")